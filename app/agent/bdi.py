@@ -1,10 +1,12 @@
-from typing import List, Optional, Dict, Any, Union
+import itertools
+from collections import deque
+from typing import Deque, List, Optional, Dict, Any, Union
 from enum import Enum
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, field_serializer
 import datetime
-import json
 from app.schema import Message
 from app.logger import logger
+from app.utils import fast_json
 
 class Fact(BaseModel):
     content: str
@@ -12,10 +14,16 @@ class Fact(BaseModel):
     timestamp: datetime.datetime = Field(default_factory=datetime.datetime.now)
 
 class BeliefSet(BaseModel):
-    facts: List[Fact] = Field(default_factory=list)
+    # A deque so pruning drops and prepends at the front in O(1) instead of rebuilding a list
+    facts: Deque[Fact] = Field(default_factory=deque)
     environment_snapshot: Dict[str, Any] = Field(default_factory=dict)
     max_facts: int = 50 # Limit number of facts to store
 
+    @field_serializer("facts")
+    def _serialize_facts(self, facts: Deque[Fact]) -> List[Fact]:
+        # Dumped as a list so saved session state stays plain JSON
+        return list(facts)
+
     async def update_from_observation(self, observation: str, llm: Optional[Any] = None):
         await self.add_fact(Fact(content=observation), llm)
 
@@ -37,23 +45,28 @@ class BeliefSet(BaseModel):
                 if num_to_summarize > len(self.facts) // 2:
                      num_to_summarize = len(self.facts) // 2
 
-                to_summarize = self.facts[:num_to_summarize]
-                kept_facts = self.facts[num_to_summarize:]
+                to_summarize = [self.facts.popleft() for _ in range(num_to_summarize)]
 
                 prompt = f"""
                 Summarize the following older facts into a single concise fact to save space.
                 Facts:
-                {json.dumps([f.content for f in to_summarize], default=str)}
+                {fast_json.dumps([f.content for f in to_summarize]).decode()}
                 """
                 try:
                     summary = await llm.ask([Message.user_message(prompt)], stream=False)
                     summary_fact = Fact(content=f"Summary of past events: {summary}", source="summary")
-                    self.facts = [summary_fact] + kept_facts
+                    self.facts.appendleft(summary_fact)
                 except Exception as e:
                     logger.error(f"Fact summarization failed: {e}")
-                    self.facts = self.facts[-self.max_facts:] # Fallback
+                    self.facts.extendleft(reversed(to_summarize))
+                    self._trim_facts() # Fallback
             else:
-                self.facts = self.facts[-self.max_facts:]
+                self._trim_facts()
+
+    def _trim_facts(self):
+        """Drop the oldest facts beyond max_facts."""
+        for _ in range(len(self.facts) - self.max_facts):
+            self.facts.popleft()
 
     def sync_with_environment(self, snapshot: Dict[str, Any]):
         self.environment_snapshot.update(snapshot)
@@ -61,7 +74,7 @@ class BeliefSet(BaseModel):
     def get_summary(self) -> str:
         summary = "Current Beliefs:\n"
         # Show recent facts, but limit characters if needed
-        for fact in self.facts[-10:]: # Show last 10 facts
+        for fact in itertools.islice(self.facts, max(0, len(self.facts) - 10), None): # Show last 10 facts
             summary += f"- {fact.content[:200]}...\n" if len(fact.content) > 200 else f"- {fact.content}\n"
         if self.environment_snapshot:
             # Format environment snapshot nicely
@@ -152,10 +165,38 @@ class Plan(BaseModel):
     phases: List[PlanStep] = Field(default_factory=list)
     current_phase_id: Optional[int] = None
 
+    # Phase id -> position in `phases`, plus the list and length it was built from
+    _phase_index: Dict[int, int] = PrivateAttr(default_factory=dict)
+    _indexed_phases: Optional[List[PlanStep]] = PrivateAttr(default=None)
+    _indexed_len: int = PrivateAttr(default=0)
+
+    def _reindex(self):
+        self._phase_index = {}
+        for i, phase in enumerate(self.phases):
+            self._phase_index.setdefault(phase.id, i)
+        self._indexed_phases, self._indexed_len = self.phases, len(self.phases)
+
+    def phase_position(self, phase_id: Optional[int]) -> int:
+        """Position of the phase with this id in `phases`, or -1 if absent."""
+        # Rebuild if the phases list was replaced or resized since the last lookup
+        if self._indexed_phases is not self.phases or self._indexed_len != len(self.phases):
+            self._reindex()
+        i = self._phase_index.get(phase_id, -1)
+        if i >= 0 and self.phases[i].id != phase_id:
+            # A phase was swapped in place; fall back to a fresh index
+            self._reindex()
+            i = self._phase_index.get(phase_id, -1)
+        return i
+
+    def get_phase(self, phase_id: Optional[int]) -> Optional[PlanStep]:
+        i = self.phase_position(phase_id)
+        return self.phases[i] if i >= 0 else None
+
     def update(self, new_plan: "Plan"):
         self.goal = new_plan.goal
         self.phases = new_plan.phases
         self.current_phase_id = new_plan.current_phase_id
+        self._reindex()
 
     def advance(self):
         if self.current_phase_id is None:
@@ -164,15 +205,15 @@ class Plan(BaseModel):
                 self.phases[0].status = "in_progress"
             return
 
-        for i, phase in enumerate(self.phases):
-            if phase.id == self.current_phase_id:
-                phase.status = "completed"
-                if i + 1 < len(self.phases):
-                    self.current_phase_id = self.phases[i+1].id
-                    self.phases[i+1].status = "in_progress"
-                else:
-                    self.current_phase_id = None # Plan completed
-                return
+        i = self.phase_position(self.current_phase_id)
+        if i < 0:
+            return
+        self.phases[i].status = "completed"
+        if i + 1 < len(self.phases):
+            self.current_phase_id = self.phases[i+1].id
+            self.phases[i+1].status = "in_progress"
+        else:
+            self.current_phase_id = None # Plan completed
 
 class IntentionPool(BaseModel):
     current_plan: Optional[Plan] = None
@@ -180,6 +221,7 @@ class IntentionPool(BaseModel):
 
     def set_plan(self, plan: Plan):
         self.current_plan = plan
+        plan._reindex()
 
     async def generate_plan(self, goal: Goal, beliefs: BeliefSet, llm: Any) -> Optional[Plan]:
         """Generate a plan using the LLM based on the goal and beliefs."""
@@ -209,7 +251,7 @@ class IntentionPool(BaseModel):
             response = await llm.ask([Message.user_message(prompt)], stream=False)
             # Basic cleaning of markdown code blocks if present
             clean_response = response.replace("```json", "").replace("```", "").strip()
-            plan_data = json.loads(clean_response)
+            plan_data = fast_json.loads(clean_response)
 
             # Convert to Plan object
             plan = Plan(goal=plan_data["goal"], phases=[PlanStep(**p) for p in plan_data["phases"]])
@@ -238,10 +280,7 @@ class IntentionPool(BaseModel):
         # Get future phases
         current_phase_index = -1
         if self.current_plan.current_phase_id:
-             for i, p in enumerate(self.current_plan.phases):
-                 if p.id == self.current_plan.current_phase_id:
-                     current_phase_index = i
-                     break
+             current_phase_index = self.current_plan.phase_position(self.current_plan.current_phase_id)
 
         future_phases = self.current_plan.phases[current_phase_index+1:]
         if not future_phases:
@@ -256,7 +295,7 @@ class IntentionPool(BaseModel):
         Current Phase: {self.current_plan.phases[current_phase_index].title if current_phase_index >= 0 else "Not Started"}
 
         Future Phases to Refine:
-        {json.dumps([p.model_dump() for p in future_phases], indent=2)}
+        {fast_json.dumps([p.model_dump() for p in future_phases], indent=True).decode()}
 
         Latest Beliefs (Observations):
         {beliefs.get_summary()}
@@ -277,14 +316,14 @@ class IntentionPool(BaseModel):
                 end = clean_response.rfind("]") + 1
                 clean_response = clean_response[start:end]
 
-            refined_phases_data = json.loads(clean_response)
+            refined_phases_data = fast_json.loads(clean_response)
 
             # Update plan in place
             for new_p in refined_phases_data:
-                for existing_p in self.current_plan.phases:
-                    if existing_p.id == new_p.get("id"):
-                        existing_p.title = new_p.get("title", existing_p.title)
-                        existing_p.description = new_p.get("description", existing_p.description)
+                existing_p = self.current_plan.get_phase(new_p.get("id"))
+                if existing_p:
+                    existing_p.title = new_p.get("title", existing_p.title)
+                    existing_p.description = new_p.get("description", existing_p.description)
 
             logger.info("Plan refined successfully.")
 
@@ -1,4 +1,9 @@
-from typing import Dict, Optional
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+# Limit for users with no configured budget
+UNLIMITED = float('inf')
 
 class BudgetExceededError(Exception):
     pass
@@ -12,19 +17,46 @@ class BudgetManager:
 
     def check_budget(self, user_id: str, current_cost: float):
         """Raises BudgetExceededError if limit is reached."""
-        limit = self.limits.get(user_id, float('inf'))
+        # Accumulate usage; a local keeps this to one lookup per dict
+        used = self.usage.get(user_id, 0.0) + current_cost
+        self.usage[user_id] = used
 
-        # Accumulate usage
-        self.usage[user_id] = self.usage.get(user_id, 0.0) + current_cost
-
-        if self.usage[user_id] > limit:
-            raise BudgetExceededError(f"Budget exceeded for user {user_id}. Usage: {self.usage[user_id]}")
+        if used > self.limits.get(user_id, UNLIMITED):
+            raise BudgetExceededError(f"Budget exceeded for user {user_id}. Usage: {used}")
 
     def get_remaining(self, user_id: str) -> float:
         """Returns remaining budget."""
-        limit = self.limits.get(user_id, float('inf'))
+        limit = self.limits.get(user_id, UNLIMITED)
         used = self.usage.get(user_id, 0.0)
         return max(0.0, limit - used)
 
     def record_cost(self, user_id: str, cost: float):
         self.check_budget(user_id, cost)
+
+    def record_costs_bulk(self, user_ids: Sequence[str], costs: Sequence[float]):
+        """Record many costs at once, e.g. the results of a gathered batch of tool calls.
+
+        Costs are summed per user in one NumPy pass and every affected user is
+        checked once. Unlike repeated record_cost calls, all costs are recorded
+        before BudgetExceededError is raised, naming every user over budget.
+        """
+        if not user_ids:
+            return
+        # user_id -> position among the distinct users in this batch
+        positions: Dict[str, int] = {}
+        index = np.fromiter(
+            (positions.setdefault(user_id, len(positions)) for user_id in user_ids),
+            dtype=np.intp,
+            count=len(user_ids),
+        )
+        totals = np.bincount(index, weights=np.asarray(costs, dtype=np.float64), minlength=len(positions))
+
+        users = list(positions)
+        used = totals + np.fromiter((self.usage.get(u, 0.0) for u in users), dtype=np.float64, count=len(users))
+        limits = np.fromiter((self.limits.get(u, UNLIMITED) for u in users), dtype=np.float64, count=len(users))
+        self.usage.update(zip(users, used.tolist()))
+
+        over = np.flatnonzero(used > limits)
+        if over.size:
+            details = ", ".join(f"{users[i]} (usage: {used[i]})" for i in over)
+            raise BudgetExceededError(f"Budget exceeded for users {details}")
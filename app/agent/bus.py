@@ -1,7 +1,9 @@
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Awaitable
 from pydantic import BaseModel
 from enum import Enum
 import asyncio
+import itertools
+from collections import deque
 
 class AgentRole(Enum):
     ARCHITECT = "architect"
@@ -15,40 +17,52 @@ class AgentMessage(BaseModel):
     message_type: str = "text" # text, code, plan, etc.
     metadata: Dict[str, Any] = {}
 
+# Most recent messages kept for get_history; older ones are dropped
+HISTORY_MAX_MESSAGES = 10_000
+
 class MessageBus:
     """A simple in-memory message bus for agent communication."""
 
-    def __init__(self):
-        self._subscribers: Dict[str, List[Callable[[AgentMessage], None]]] = {}
-        self._history: List[AgentMessage] = []
+    def __init__(self, history_max: int = HISTORY_MAX_MESSAGES):
+        # Callbacks are split by kind once, at subscribe time, so publish never
+        # inspects them: sync ones are called inline, async ones awaited together
+        self._sync_subscribers: Dict[str, List[Callable[[AgentMessage], None]]] = {}
+        self._async_subscribers: Dict[str, List[Callable[[AgentMessage], Awaitable[None]]]] = {}
+        self._history: "deque[AgentMessage]" = deque(maxlen=history_max)
 
     def subscribe(self, agent_id: str, callback: Callable[[AgentMessage], None]):
         """Register a callback for messages addressed to agent_id."""
-        if agent_id not in self._subscribers:
-            self._subscribers[agent_id] = []
-        self._subscribers[agent_id].append(callback)
+        subscribers = self._async_subscribers if asyncio.iscoroutinefunction(callback) else self._sync_subscribers
+        subscribers.setdefault(agent_id, []).append(callback)
 
     async def publish(self, message: AgentMessage):
         """Send a message to the recipient."""
         self._history.append(message)
 
         # Deliver to specific recipient
-        if message.recipient in self._subscribers:
-            for callback in self._subscribers[message.recipient]:
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(message)
-                else:
-                    callback(message)
-
         # Broadcast (optional, if recipient is "all")
         if message.recipient == "all":
-            for agent_id, callbacks in self._subscribers.items():
-                if agent_id != message.sender:
-                    for callback in callbacks:
-                        if asyncio.iscoroutinefunction(callback):
-                            await callback(message)
-                        else:
-                            callback(message)
-
-    def get_history(self) -> List[AgentMessage]:
-        return self._history
+            recipients = [
+                agent_id
+                for agent_id in dict.fromkeys([*self._sync_subscribers, *self._async_subscribers])
+                if agent_id != message.sender
+            ]
+        else:
+            recipients = [message.recipient]
+
+        pending = []
+        for agent_id in recipients:
+            for callback in self._sync_subscribers.get(agent_id, ()):
+                callback(message)
+            pending.extend(callback(message) for callback in self._async_subscribers.get(agent_id, ()))
+        if pending:
+            await asyncio.gather(*pending)
+
+    def get_history(self, limit: Optional[int] = None) -> List[AgentMessage]:
+        """Return retained messages, oldest first; only the last ``limit`` if given."""
+        if limit is None:
+            return list(self._history)
+        # Walk back from the newest end so only ``limit`` items are visited
+        recent = list(itertools.islice(reversed(self._history), limit))
+        recent.reverse()
+        return recent
@@ -93,7 +93,7 @@ class AgentCore(ToolCallAgent):
 
         # Initialize Memories
         try:
-            self.semantic_memory = SemanticMemory()
+            self.semantic_memory = SemanticMemory.get_default()
             self.episodic_store = EpisodicStore()
 
             # Inject Semantic Memory into MemorySearchTool if available
@@ -1,12 +1,16 @@
 import json
 import os
 import re
-from typing import Dict, List, Any
+from collections import Counter, deque
+from typing import Deque, Dict, List, Any
 from app.exceptions import ToolError
 from app.logger import logger
 
 IMMUNITY_DB_PATH = "workspace/immunity_db.json"
 
+# A call repeated this many times in a row (after at least one earlier call) is treated as a loop
+LOOP_REPEATS = 3
+
 class DigitalImmunitySystem:
     """
     Implements Digital Immunity System (Chapter 50).
@@ -16,8 +20,10 @@ class DigitalImmunitySystem:
 
     def __init__(self, db_path: str = IMMUNITY_DB_PATH):
         self.db_path = db_path
-        self.failure_counts: Dict[str, int] = {}
-        self.call_history: List[str] = []
+        self.failure_counts: Counter = Counter()
+        # Hashes of the most recent call signatures; only the tail is ever
+        # inspected, so older calls are dropped instead of kept forever
+        self.call_history: Deque[int] = deque(maxlen=LOOP_REPEATS + 1)
 
         # Persistent Data
         self.blocked_tools: List[str] = []
@@ -100,13 +106,13 @@ class DigitalImmunitySystem:
                 logger.error(f"Immunity System: Invalid regex pattern in DB: {antibody}")
                 continue
 
-        call_signature = f"{tool_name}:{args_str}"
+        call_signature = hash((tool_name, args_str))
         self.call_history.append(call_signature)
 
         # Check repetitive loop (Chapter 50.4: Behavioral Anomaly)
-        if len(self.call_history) > 3:
-            recent = self.call_history[-3:]
-            if all(x == call_signature for x in recent):
+        if len(self.call_history) > LOOP_REPEATS:
+            # The deque holds LOOP_REPEATS + 1 entries, so skip the oldest one
+            if all(self.call_history[i] == call_signature for i in range(1, LOOP_REPEATS + 1)):
                  logger.warning(f"Immunity System detected repetitive loop for {tool_name}. Blocking temporarily.")
                  return False
 
@@ -114,7 +120,7 @@ class DigitalImmunitySystem:
 
     def record_failure(self, tool_name: str):
         """Record a tool failure and potentially block the tool."""
-        self.failure_counts[tool_name] = self.failure_counts.get(tool_name, 0) + 1
+        self.failure_counts[tool_name] += 1
         if self.failure_counts[tool_name] > 5:
             logger.error(f"Immunity System: Tool {tool_name} failed too many times. Blocking it.")
             if tool_name not in self.blocked_tools:
@@ -125,6 +131,11 @@ class DigitalImmunitySystem:
         """Reset failure count on success."""
         self.failure_counts[tool_name] = 0
 
+    def reset_run_state(self):
+        """Forget the call history and failure counts of the previous run; learned blocks are kept."""
+        self.call_history.clear()
+        self.failure_counts.clear()
+
     def get_status(self) -> Dict[str, Any]:
         return {
             "blocked_tools": self.blocked_tools,
@@ -1,5 +1,6 @@
+import asyncio
 import datetime
-from typing import Dict, List, Optional, Any
+from typing import ClassVar, Dict, List, Optional, Any
 from pydantic import Field, model_validator
 
 from app.agent.core import AgentCore
@@ -8,6 +9,7 @@ from app.agent.reasoning import ReasoningEngine
 from app.config import config
 from app.logger import logger
 from app.prompt.manus import NEXT_STEP_PROMPT, SYSTEM_PROMPT
+from app.schema import AgentState
 from app.tool import Terminate, ToolCollection
 from app.tool.ask_human import AskHuman
 from app.tool.browser_tool import BrowserTool
@@ -57,6 +59,13 @@ class Manus(AgentCore):
 
     special_tool_names: list[str] = Field(default_factory=lambda: [Terminate().name])
 
+    # Per-run state restored to its defaults by reset(); clients, tools and the
+    # sandbox are kept so a reused agent skips the expensive setup
+    _RUN_STATE_FIELDS: ClassVar[tuple] = (
+        "memory", "beliefs", "goals", "intentions", "working_memory",
+        "current_episode_actions", "tool_calls", "next_step_prompt", "session_id",
+    )
+
     @model_validator(mode="after")
     def initialize_manus_components(self) -> "Manus":
         """Initialize Manus-specific components including Sandbox."""
@@ -92,18 +101,7 @@ class Manus(AgentCore):
         instance = cls(**kwargs)
 
         # Start Sandbox if available
-        if instance.sandbox:
-            try:
-                # Docker start is synchronous in our implementation but fast enough?
-                # Ideally async.
-                instance.sandbox.start()
-            except Exception as e:
-                logger.warning(f"Failed to start Docker Sandbox: {e}")
-                instance.sandbox = None # Fallback to local
-                # Re-inject None to tools
-                if instance.available_tools:
-                    instance.available_tools.tool_map.get("python_execute").sandbox = None
-                    instance.available_tools.tool_map.get("shell").sandbox = None
+        await instance._start_sandbox()
 
         await instance.initialize_mcp_servers()
         instance._initialized = True
@@ -118,6 +116,43 @@ class Manus(AgentCore):
 
         return instance
 
+    async def reset(self) -> None:
+        """Make a finished agent ready to run a new, unrelated request."""
+        fields = type(self).model_fields
+        for name in self._RUN_STATE_FIELDS:
+            setattr(self, name, fields[name].get_default(call_default_factory=True))
+        self.state = AgentState.IDLE
+        self.current_step = 0
+
+        # Plans and the immunity loop/failure tracking belong to the finished run
+        planning_tool = self.available_tools.tool_map.get("planning")
+        if planning_tool:
+            planning_tool.clear()
+        self._immunity.reset_run_state()
+        # Shell sessions hold directories and variables of the old task, and
+        # their shells ran in a container that cleanup() removed
+        shell_tool = self.available_tools.tool_map.get("shell")
+        if shell_tool:
+            await shell_tool.reset()
+
+        # run() cleans up when it finishes, stopping the sandbox and MCP connections.
+        # think() restarts both on the next run, so an idle pooled agent holds no container
+        self._initialized = False
+
+    async def _start_sandbox(self) -> None:
+        """Start the sandbox container if there is one and it is not running."""
+        if not self.sandbox or self.sandbox.container:
+            return
+        try:
+            await asyncio.to_thread(self.sandbox.start)
+        except Exception as e:
+            logger.warning(f"Failed to start Docker Sandbox: {e}")
+            self.sandbox = None  # Fallback to local
+            for tool_name in ("python_execute", "shell"):
+                tool = self.available_tools.tool_map.get(tool_name)
+                if tool:
+                    tool.sandbox = None
+
     async def initialize_mcp_servers(self) -> None:
         """Initialize connections to configured MCP servers."""
         for server_id, server_config in config.mcp_config.servers.items():
@@ -171,8 +206,9 @@ class Manus(AgentCore):
         self.available_tools.add_tools(*self.mcp_clients.tools)
 
     async def think(self) -> bool:
-        """Override think to ensure MCP servers are initialized before AgentCore think loop."""
+        """Override think to ensure the sandbox and MCP servers are up before AgentCore think loop."""
         if not self._initialized:
+            await self._start_sandbox()
             await self.initialize_mcp_servers()
             self._initialized = True
 
@@ -1,4 +1,3 @@
-import json
 import os
 import uuid
 import random
@@ -6,6 +5,7 @@ from typing import Dict, Any, Optional
 from datetime import datetime
 from pydantic import BaseModel, Field
 from app.logger import logger
+from app.utils import fast_json
 
 class Feedback(BaseModel):
     session_id: str
@@ -69,6 +69,11 @@ class FeedbackCollector:
         self.reward_model = RewardModel()
         self.optimizer = RLHFOptimizer()
         self.pending_feedback = []
+        # Running totals for get_stats and the storage file size they cover;
+        # None until the file is first scanned
+        self._count = 0
+        self._rating_sum = 0
+        self._stats_size: Optional[int] = None
 
     def collect(self, session_id: str, task_id: str, user_input: str, agent_output: str, rating: int, comment: str = None):
         feedback = Feedback(
@@ -89,29 +94,44 @@ class FeedbackCollector:
         return feedback
 
     def _save(self, feedback: Feedback):
-        with open(self.storage_path, "a") as f:
-            f.write(feedback.model_dump_json() + "\n")
+        with open(self.storage_path, "ab") as f:
+            start = f.tell()
+            f.write(feedback.model_dump_json().encode() + b"\n")
+            # Extend the running totals only if they covered the file up to this line;
+            # otherwise get_stats sees the size mismatch and rescans
+            if start == self._stats_size:
+                self._count += 1
+                self._rating_sum += feedback.rating
+                self._stats_size = f.tell()
+
+    def _scan_stats(self):
+        count = 0
+        total_rating = 0
+        with open(self.storage_path, "rb") as f:
+            for line in f:
+                try:
+                    total_rating += fast_json.loads(line)["rating"]
+                except (ValueError, KeyError):
+                    continue
+                count += 1
+            self._count, self._rating_sum, self._stats_size = count, total_rating, f.tell()
 
     def get_stats(self):
-        # Simple stats for monitoring
-        count = 0
-        avg_rating = 0.0
-        if not os.path.exists(self.storage_path):
+        # Simple stats for monitoring, kept as running totals; the file is only
+        # re-read if something other than collect() changed it
+        try:
+            size = os.path.getsize(self.storage_path)
+        except OSError:
             return {"count": 0, "avg_rating": 0.0}
 
-        try:
-            total_rating = 0
-            with open(self.storage_path, "r") as f:
-                for line in f:
-                    data = json.loads(line)
-                    total_rating += data["rating"]
-                    count += 1
-            if count > 0:
-                avg_rating = total_rating / count
-        except Exception:
-            pass
-
-        return {"count": count, "avg_rating": avg_rating}
+        if size != self._stats_size:
+            try:
+                self._scan_stats()
+            except Exception:
+                return {"count": 0, "avg_rating": 0.0}
+
+        avg_rating = self._rating_sum / self._count if self._count else 0.0
+        return {"count": self._count, "avg_rating": avg_rating}
 
     def fine_tune(self):
         """
@@ -397,6 +397,8 @@ class ToolCallAgent(ReActAgent):
                     logger.error(
                         f"🚨 Error cleaning up tool '{tool_name}': {e}", exc_info=True
                     )
+        # Audit events are written in the background; make sure they reach disk
+        self._audit.flush()
         logger.info(f"✨ Cleanup complete for agent '{self.name}'.")
 
     async def run(self, request: Optional[str] = None) -> str:
@@ -1,11 +1,13 @@
-import json
 import threading
 import tomllib
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
+from app.utils import fast_json
+
 
 def get_project_root() -> Path:
     """Get the project root directory"""
@@ -16,6 +18,16 @@ PROJECT_ROOT = get_project_root()
 WORKSPACE_ROOT = PROJECT_ROOT / "workspace"
 
 
+@lru_cache(maxsize=4)
+def _load_toml(path: str, mtime_ns: int) -> dict:
+    """Parse a TOML file once per version; ``mtime_ns`` is part of the key so edits invalidate it.
+
+    Callers share the returned dict and must not mutate it.
+    """
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
 class LLMSettings(BaseModel):
     model: str = Field(..., description="Model name")
     base_url: str = Field(..., description="API base URL")
@@ -151,26 +163,33 @@ class MCPSettings(BaseModel):
         config_path = PROJECT_ROOT / "config" / "mcp.json"
 
         try:
-            config_file = config_path if config_path.exists() else None
-            if not config_file:
+            try:
+                mtime_ns = config_path.stat().st_mtime_ns
+            except FileNotFoundError:
                 return {}
-
-            with config_file.open() as f:
-                data = json.load(f)
-                servers = {}
-
-                for server_id, server_config in data.get("mcpServers", {}).items():
-                    servers[server_id] = MCPServerConfig(
-                        type=server_config["type"],
-                        url=server_config.get("url"),
-                        command=server_config.get("command"),
-                        args=server_config.get("args", []),
-                    )
-                return servers
+            # Copy so callers can add or drop servers without touching the cache
+            return dict(_load_mcp_servers(str(config_path), mtime_ns))
         except Exception as e:
             raise ValueError(f"Failed to load MCP server config: {e}")
 
 
+@lru_cache(maxsize=1)
+def _load_mcp_servers(path: str, mtime_ns: int) -> Dict[str, MCPServerConfig]:
+    """Parse mcp.json once per version; ``mtime_ns`` is part of the key so edits invalidate it."""
+    with open(path, "rb") as f:
+        data = fast_json.loads(f.read())
+    servers = {}
+
+    for server_id, server_config in data.get("mcpServers", {}).items():
+        servers[server_id] = MCPServerConfig(
+            type=server_config["type"],
+            url=server_config.get("url"),
+            command=server_config.get("command"),
+            args=server_config.get("args", []),
+        )
+    return servers
+
+
 class AppConfig(BaseModel):
     llm: Dict[str, LLMSettings]
     sandbox: Optional[SandboxSettings] = Field(
@@ -227,8 +246,7 @@ class Config:
 
     def _load_config(self) -> dict:
         config_path = self._get_config_path()
-        with config_path.open("rb") as f:
-            return tomllib.load(f)
+        return _load_toml(str(config_path), config_path.stat().st_mtime_ns)
 
     def _load_initial_config(self):
         raw_config = self._load_config()
@@ -300,8 +318,7 @@ class Config:
         mcp_settings = None
         if mcp_config:
             # Load server configurations from JSON
-            mcp_config["servers"] = MCPSettings.load_server_config()
-            mcp_settings = MCPSettings(**mcp_config)
+            mcp_settings = MCPSettings(**{**mcp_config, "servers": MCPSettings.load_server_config()})
         else:
             mcp_settings = MCPSettings(servers=MCPSettings.load_server_config())
 
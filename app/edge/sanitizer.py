@@ -1,25 +1,38 @@
 from typing import Any, Dict
 from app.utils.sanitizer import Sanitizer as CoreSanitizer
 
+# Keys whose values are always redacted on the edge
+SENSITIVE_KEYS = ("password", "token", "key") # Removed 'email' as CoreSanitizer handles it
+
+
+def _redact_keys(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Redact sensitive keys in place; ``data`` is a fresh copy from CoreSanitizer."""
+    for k, v in data.items():
+        lowered = k.lower()
+        if any(s in lowered for s in SENSITIVE_KEYS):
+            data[k] = "[REDACTED]"
+        elif isinstance(v, dict):
+            _redact_keys(v)
+    return data
+
+
 class Sanitizer:
     """
     Simulates PII sanitization for Edge devices.
     (Chapter 51.4: Anonimização e Pseudonimização no Edge)
+
+    A thin layer over the core Sanitizer, which owns the single compiled PII regex.
     """
 
     @staticmethod
     def sanitize(data: Dict[str, Any]) -> Dict[str, Any]:
         """Remove sensitive keys or redact values."""
-        # Use CoreSanitizer for regex-based redaction
+        # Use CoreSanitizer for regex-based redaction, once over the whole payload
         sanitized = CoreSanitizer.sanitize(data)
 
-        # Additional recursive key-based redaction for Edge specific needs
+        # Additional recursive key-based redaction for Edge specific needs;
+        # nested dicts were already scanned above, so only keys are checked here
         if isinstance(sanitized, dict):
-            sensitive_keys = ["password", "token", "key"] # Removed 'email' as CoreSanitizer handles it
-            for k in list(sanitized.keys()):
-                if any(s in k.lower() for s in sensitive_keys):
-                    sanitized[k] = "[REDACTED]"
-                elif isinstance(sanitized[k], dict):
-                    sanitized[k] = Sanitizer.sanitize(sanitized[k])
+            _redact_keys(sanitized)
 
         return sanitized
@@ -1,6 +1,7 @@
 import uuid
 import os
-from typing import List, Dict, Optional, Any
+import threading
+from typing import ClassVar, List, Dict, Optional, Any
 import chromadb
 from chromadb.config import Settings
 from sentence_transformers import SentenceTransformer
@@ -12,6 +13,9 @@ class SemanticMemory:
     """
     Manages long-term semantic memory using a vector database (ChromaDB) and embeddings.
     """
+    _default: ClassVar[Optional["SemanticMemory"]] = None
+    _default_lock: ClassVar[threading.Lock] = threading.Lock()
+
     def __init__(self, collection_name: str = "manus_memory", persist_directory: str = "workspace/db"):
         self.persist_directory = persist_directory
         self.collection_name = collection_name
@@ -34,6 +38,15 @@ class SemanticMemory:
             logger.error(f"Failed to initialize Semantic Memory: {e}")
             raise
 
+    @classmethod
+    def get_default(cls) -> "SemanticMemory":
+        """Return the process-wide SemanticMemory with default settings, creating it once."""
+        if cls._default is None:
+            with cls._default_lock:
+                if cls._default is None:
+                    cls._default = cls()
+        return cls._default
+
     def _generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for a given text."""
         return self.embedding_model.encode(text).tolist()
@@ -45,48 +58,68 @@ class SemanticMemory:
         """
         if not text:
             return ""
+        return self.index_documents([text], [metadata], source=source)
+
+    def index_documents(
+        self,
+        texts: List[str],
+        metadatas: Optional[List[Optional[Dict[str, Any]]]] = None,
+        source: str = "unknown",
+        batch_size: int = 64,
+    ) -> str:
+        """
+        Index several documents at once: every chunk is embedded in a single
+        encode call and written with a single upsert.
+        ``metadatas``, if given, is parallel to ``texts``.
+        """
+        if metadatas is None:
+            metadatas = [None] * len(texts)
 
         # Simple chunking (can be improved)
         chunk_size = 1000
-        chunks = [text[i:i+chunk_size] for i in range(0, len(text), chunk_size)]
 
         ids = []
-        embeddings = []
-        metadatas = []
+        chunk_metadatas = []
         documents = []
 
-        for i, chunk in enumerate(chunks):
-            chunk_id = str(uuid.uuid4())
-            embedding = self._generate_embedding(chunk)
+        for text, metadata in zip(texts, metadatas):
+            for i in range(0, len(text), chunk_size):
+                meta = metadata.copy() if metadata else {}
+                meta.update({
+                    "source": source,
+                    "chunk_index": i // chunk_size,
+                    "timestamp": str(uuid.uuid1().time) # accurate enough for sorting
+                })
+
+                ids.append(str(uuid.uuid4()))
+                chunk_metadatas.append(meta)
+                documents.append(text[i:i + chunk_size])
 
-            meta = metadata.copy() if metadata else {}
-            meta.update({
-                "source": source,
-                "chunk_index": i,
-                "timestamp": str(uuid.uuid1().time) # accurate enough for sorting
-            })
+        if not documents:
+            return ""
 
-            ids.append(chunk_id)
-            embeddings.append(embedding)
-            metadatas.append(meta)
-            documents.append(chunk)
+        # encode() sorts its inputs by length before forming batches and restores
+        # the original order afterwards, so chunks of similar length are padded
+        # together without any reordering here
+        embeddings = self.embedding_model.encode(documents, batch_size=batch_size).tolist()
 
         try:
             self.collection.upsert(
                 ids=ids,
                 embeddings=embeddings,
-                metadatas=metadatas,
+                metadatas=chunk_metadatas,
                 documents=documents
             )
-            logger.info(f"Indexed {len(chunks)} chunks from source '{source}'")
-            return f"Indexed {len(chunks)} chunks."
+            logger.info(f"Indexed {len(documents)} chunks from source '{source}'")
+            return f"Indexed {len(documents)} chunks."
         except Exception as e:
             logger.error(f"Failed to index document: {e}")
             return f"Error indexing document: {e}"
 
-    def search(self, query: str, n_results: int = 5) -> List[Dict[str, Any]]:
+    def search(self, query: str, n_results: int = 5, max_content_chars: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Search for relevant documents based on semantic similarity.
+        If max_content_chars is set, each result's content is truncated to that length.
         """
         try:
             query_embedding = self._generate_embedding(query)
@@ -98,10 +131,13 @@ class SemanticMemory:
             # Format results
             formatted_results = []
             if results['ids']:
+                documents = results['documents'][0]
+                if max_content_chars is not None:
+                    documents = [doc[:max_content_chars] for doc in documents]
                 for i in range(len(results['ids'][0])):
                     formatted_results.append({
                         "id": results['ids'][0][i],
-                        "content": results['documents'][0][i],
+                        "content": documents[i],
                         "metadata": results['metadatas'][0][i],
                         "distance": results['distances'][0][i] if results['distances'] else None
                     })
@@ -1,15 +1,52 @@
 import docker
+import socket
 import tarfile
 import io
 import time
 import os
+import secrets
+import shlex
 import shutil
+import struct
 from typing import Dict, Optional, Tuple, Any
 from uuid import UUID
 
+from docker.utils.socket import STDERR, STDOUT
 from app.logger import logger
 from app.sandbox.monitor import ResourceMonitor
 
+
+def _read_frame(sock: socket.socket, deadline: Optional[float]) -> Optional[Tuple[int, bytes]]:
+    """Read one multiplexed (stream, data) frame from an exec socket, or None at EOF."""
+    header = _recv_exactly(sock, 8, deadline)
+    if header is None:
+        return None
+    stream, size = struct.unpack(">BxxxL", header)
+    data = _recv_exactly(sock, size, deadline)
+    if data is None:
+        return None
+    return stream, data
+
+
+def _recv_exactly(sock: socket.socket, n: int, deadline: Optional[float]) -> Optional[bytes]:
+    # docker's own frame reader polls without a timeout, so frames are read here
+    buf = bytearray()
+    while len(buf) < n:
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("Command timed out")
+            sock.settimeout(remaining)
+        try:
+            chunk = sock.recv(n - len(buf))
+        except socket.timeout:
+            raise TimeoutError("Command timed out")
+        if not chunk:
+            return None
+        buf += chunk
+    return bytes(buf)
+
+
 class DockerSandbox:
     """
     A secure, isolated execution environment based on Docker containers.
@@ -109,6 +146,67 @@ class DockerSandbox:
         except Exception as e:
             return -1, str(e)
 
+    def exec_stdin(self, cmd: str, data: str, workdir: Optional[str] = None, timeout: Optional[int] = None) -> Tuple[int, str]:
+        """
+        Execute a command inside the container, streaming ``data`` to its stdin.
+        Avoids staging the input as a file in the container first. If the command
+        outlives ``timeout`` it is killed, with everything it started.
+        Returns: (exit_code, output)
+        """
+        if not self.container:
+            raise RuntimeError("Sandbox not started")
+
+        try:
+            api = self.client.api
+            # As in SandboxShell, setsid makes the command a process group leader;
+            # its PID is written to stderr first so a timeout can kill the group
+            exec_id = api.exec_create(
+                self.container.id,
+                ["setsid", "sh", "-c", 'echo $$ >&2; exec "$@"', "sh", *shlex.split(cmd)],
+                stdin=True,
+                workdir=workdir or self.working_dir,
+            )["Id"]
+            sock = api.exec_start(exec_id, socket=True)
+            raw_sock = getattr(sock, "_sock", sock)
+            deadline = None if timeout is None else time.monotonic() + timeout
+            stdout, stderr = bytearray(), bytearray()
+            try:
+                raw_sock.settimeout(timeout)
+                raw_sock.sendall(data.encode('utf-8'))
+                # Half-close so the process sees EOF on stdin
+                raw_sock.shutdown(socket.SHUT_WR)
+                while (frame := _read_frame(raw_sock, deadline)) is not None:
+                    stream, chunk = frame
+                    if stream == STDOUT:
+                        stdout += chunk
+                    elif stream == STDERR:
+                        stderr += chunk
+            except TimeoutError:
+                pid, newline, _ = stderr.partition(b"\n")
+                if newline:
+                    self.exec_run(f"sh -c 'kill -KILL -{int(pid)}'")
+                return -1, f"Timeout after {timeout}s"
+            finally:
+                sock.close()
+            exit_code = api.exec_inspect(exec_id)["ExitCode"]
+            stderr = stderr.partition(b"\n")[2]
+
+            output = ""
+            if stdout:
+                output += stdout.decode('utf-8', errors='replace')
+            if stderr:
+                output += f"\nSTDERR: {stderr.decode('utf-8', errors='replace')}"
+
+            return exit_code, output
+        except Exception as e:
+            return -1, str(e)
+
+    def open_shell(self, workdir: Optional[str] = None) -> "SandboxShell":
+        """Start a long-lived bash process in the container for running many commands."""
+        if not self.container:
+            raise RuntimeError("Sandbox not started")
+        return SandboxShell(self, workdir or self.working_dir)
+
     def read_file(self, filepath: str) -> str:
         """Read a file from the container."""
         if not self.container:
@@ -167,3 +265,98 @@ class DockerSandbox:
                 self.container.remove(force=True)
             except:
                 pass
+
+
+class SandboxShell:
+    """
+    A bash process inside the sandbox container that is fed commands over stdin.
+    Reusing one process saves a docker exec round trip per command and keeps
+    shell state such as exported variables between commands.
+
+    Each command is followed by a random marker printed to stdout (with the exit
+    code) and to stderr; output is read up to both markers.
+    """
+
+    def __init__(self, sandbox: DockerSandbox, workdir: str):
+        self._sandbox = sandbox
+        self._api = sandbox.client.api
+        # setsid makes bash a process group leader so close() can kill the whole group
+        self._exec_id = self._api.exec_create(
+            sandbox.container.id,
+            ["setsid", "bash", "--noprofile", "--norc"],
+            stdin=True,
+            workdir=workdir,
+        )["Id"]
+        self._sock = self._api.exec_start(self._exec_id, socket=True)
+        self._raw_sock = getattr(self._sock, "_sock", self._sock)
+        self.alive = True
+        self.pid: Optional[int] = None
+        try:
+            _, pid = self.run("echo $$", timeout=30)
+            self.pid = int(pid.strip())
+        except Exception:
+            self.close()
+            raise
+
+    def run(self, command: str, workdir: Optional[str] = None, timeout: Optional[float] = None) -> Tuple[int, str]:
+        """
+        Run a command in the shell and wait for it to finish.
+        Returns: (exit_code, output). Raises TimeoutError if it outlives ``timeout``;
+        the shell is then unusable and should be closed.
+        """
+        if not self.alive:
+            raise RuntimeError("Shell is closed")
+
+        marker = f"__SHELL_DONE_{secrets.token_hex(8)}__"
+        # eval keeps a malformed command from swallowing the marker lines, and
+        # stdin is redirected so the command cannot read them either
+        script = f"eval {shlex.quote(command)} < /dev/null"
+        if workdir:
+            script = f"cd -- {shlex.quote(workdir)} && {script}"
+        script += f"\nprintf '\\n%s%d\\n' {marker} \"$?\"; printf '\\n%s\\n' {marker} >&2\n"
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self._raw_sock.sendall(script.encode("utf-8"))
+
+        end = ("\n" + marker).encode()
+        stdout, stderr = bytearray(), bytearray()
+        exit_code = None
+        stderr_done = False
+        while exit_code is None or not stderr_done:
+            frame = _read_frame(self._raw_sock, deadline)
+            if frame is None:
+                # The shell exited, e.g. the command was `exit`
+                self.alive = False
+                exit_code = self._api.exec_inspect(self._exec_id)["ExitCode"]
+                break
+            stream, data = frame
+            if stream == STDOUT:
+                stdout += data
+                if exit_code is None:
+                    idx = stdout.find(end, max(0, len(stdout) - len(data) - len(end) - 12))
+                    if idx != -1 and stdout.endswith(b"\n"):
+                        exit_code = int(stdout[idx + len(end):-1])
+                        del stdout[idx:]
+            elif stream == STDERR and not stderr_done:
+                stderr += data
+                idx = stderr.find(end + b"\n", max(0, len(stderr) - len(data) - len(end) - 1))
+                if idx != -1:
+                    stderr_done = True
+                    del stderr[idx:]
+
+        output = ""
+        if stdout:
+            output += stdout.decode('utf-8', errors='replace')
+        if stderr:
+            output += f"\nSTDERR: {stderr.decode('utf-8', errors='replace')}"
+        return exit_code, output
+
+    def close(self):
+        """Kill the shell and anything it started, and drop the connection."""
+        if self.alive and self.pid is not None:
+            self._sandbox.exec_run(f"sh -c 'kill -KILL -{self.pid}'")
+        self.alive = False
+        try:
+            self._sock.close()
+        except Exception:
+            pass
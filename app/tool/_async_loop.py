@@ -0,0 +1,50 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Optional
+
+
+class AsyncLoopThread:
+    """A single asyncio event loop running forever on a daemon thread.
+
+    Tools whose connections are bound to one event loop (e.g. MCP stdio/SSE
+    sessions) submit their coroutines here, so sync and async callers from
+    any thread share the same loop instead of creating one per call.
+    """
+
+    _instance: Optional["AsyncLoopThread"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run, name="async-loop-thread", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    @classmethod
+    def get(cls) -> "AsyncLoopThread":
+        """Return the process-wide loop thread, starting it on first use."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def submit(self, coro: Awaitable[Any]) -> Future:
+        """Schedule a coroutine on the shared loop."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    async def run(self, coro: Awaitable[Any]) -> Any:
+        """Await a coroutine on the shared loop from any other event loop."""
+        if asyncio.get_running_loop() is self.loop:
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def run_sync(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """Block the calling (non-loop) thread until the coroutine finishes."""
+        return self.submit(coro).result(timeout)
@@ -1,5 +1,4 @@
 import asyncio
-import os
 from typing import Optional
 
 from app.exceptions import ToolError
@@ -34,7 +33,7 @@ class _BashSession:
 
         self._process = await asyncio.create_subprocess_shell(
             self.command,
-            preexec_fn=os.setsid,
+            start_new_session=True,
             shell=True,
             bufsize=0,
             stdin=asyncio.subprocess.PIPE,
@@ -1,16 +1,51 @@
 import asyncio
 import os
-from typing import Optional
+import threading
+from collections import OrderedDict
+from typing import AsyncIterator, Iterator, Optional, Tuple
 
-from pdfminer.high_level import extract_text as extract_pdf_text
 import html2text
 from pydantic import Field
 
+from app.exceptions import ToolError
 from app.llm import LLM
 from app.logger import logger
 from app.tool.base import BaseTool, ToolResult
 
 
+# Size of the text chunks yielded by stream_text for HTML and plain text
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Recently extracted documents keyed by (path, mtime_ns, size), bounded by total text size
+CACHE_MAX_CHARS = 64 * 1024 * 1024
+_CACHE: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_cache_size = 0
+_cache_lock = threading.Lock()
+
+
+def _cache_get(key: Tuple[str, int, int]) -> Optional[str]:
+    with _cache_lock:
+        text = _CACHE.get(key)
+        if text is not None:
+            _CACHE.move_to_end(key)
+        return text
+
+
+def _cache_put(key: Tuple[str, int, int], text: str) -> None:
+    global _cache_size
+    if len(text) > CACHE_MAX_CHARS:
+        return
+    with _cache_lock:
+        old = _CACHE.pop(key, None)
+        if old is not None:
+            _cache_size -= len(old)
+        _CACHE[key] = text
+        _cache_size += len(text)
+        while _cache_size > CACHE_MAX_CHARS:
+            _, evicted = _CACHE.popitem(last=False)
+            _cache_size -= len(evicted)
+
+
 class DocumentProcessor(BaseTool):
     name: str = "document_processor"
     description: str = """
@@ -58,32 +93,75 @@ class DocumentProcessor(BaseTool):
             logger.exception(f"DocumentProcessor error: {e}")
             return ToolResult(error=str(e))
 
-    def _extract_text_sync(self, path: str, ext: str) -> ToolResult:
-        try:
-            if ext == ".pdf":
-                text = extract_pdf_text(path)
-                return ToolResult(output=text)
-            elif ext in [".html", ".htm"]:
-                with open(path, "r") as f:
-                    html = f.read()
-                h = html2text.HTML2Text()
-                h.ignore_links = False
-                return ToolResult(output=h.handle(html))
-            elif ext in [".txt", ".md"]:
-                 with open(path, "r") as f:
-                    return ToolResult(output=f.read())
-            else:
-                return ToolResult(error=f"Unsupported file type for extraction: {ext}")
-        except Exception as e:
-            return ToolResult(error=f"Extraction failed: {str(e)}")
+    def _iter_text_sync(self, path: str, ext: str) -> Iterator[str]:
+        if ext == ".pdf":
+            from pdfminer.high_level import extract_pages
+            from pdfminer.layout import LTTextContainer
+
+            for page_layout in extract_pages(path):
+                yield "".join(
+                    element.get_text()
+                    for element in page_layout
+                    if isinstance(element, LTTextContainer)
+                ) + "\f"
+        elif ext in [".html", ".htm"]:
+            with open(path, "r") as f:
+                html = f.read()
+            h = html2text.HTML2Text()
+            h.ignore_links = False
+            text = h.handle(html)
+            for i in range(0, len(text), STREAM_CHUNK_SIZE):
+                yield text[i : i + STREAM_CHUNK_SIZE]
+        elif ext in [".txt", ".md"]:
+            with open(path, "r") as f:
+                chunk = []
+                size = 0
+                for line in f:
+                    chunk.append(line)
+                    size += len(line)
+                    if size >= STREAM_CHUNK_SIZE:
+                        yield "".join(chunk)
+                        chunk = []
+                        size = 0
+                if chunk:
+                    yield "".join(chunk)
+        else:
+            raise ToolError(f"Unsupported file type for extraction: {ext}")
+
+    async def stream_text(self, path: str) -> AsyncIterator[str]:
+        """Yield the text of a document incrementally.
+
+        PDFs are yielded per page, HTML and plain text in chunks of roughly
+        STREAM_CHUNK_SIZE characters. Parsing runs in the default executor.
+        """
+        ext = os.path.splitext(path)[1].lower()
+        chunks = self._iter_text_sync(path, ext)
+        loop = asyncio.get_event_loop()
+        while True:
+            chunk = await loop.run_in_executor(None, next, chunks, None)
+            if chunk is None:
+                return
+            yield chunk
 
     async def _extract_text(self, path: str) -> ToolResult:
         ext = os.path.splitext(path)[1].lower()
         if ext in [".png", ".jpg", ".jpeg", ".webp"]:
             return await self._ocr_image(path)
 
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self._extract_text_sync, path, ext)
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        cached = _cache_get(key)
+        if cached is not None:
+            return ToolResult(output=cached)
+
+        try:
+            text = "".join([c async for c in self.stream_text(path)])
+            _cache_put(key, text)
+            return ToolResult(output=text)
+        except ToolError as e:
+            return ToolResult(error=e.message)
+        except Exception as e:
+            return ToolResult(error=f"Extraction failed: {str(e)}")
 
     async def _convert_to_markdown(self, path: str) -> ToolResult:
         # For now, just alias extract_text as we return text which is markdown-compatible usually
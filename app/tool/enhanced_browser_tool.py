@@ -1,7 +1,17 @@
 from typing import List, Optional
+
+import html2text
 from pydantic import BaseModel
+
+from app.exceptions import ToolError
 from app.tool.browser_use_tool import BrowserUseTool as OriginalBrowserUseTool
 
+
+# Shared converter for the no-focus fast path; configured once at import time
+_html_converter = html2text.HTML2Text()
+_html_converter.ignore_links = False
+
+
 class PageContent(BaseModel):
     url: str
     content: str
@@ -14,7 +24,11 @@ class EnhancedBrowserUseTool(OriginalBrowserUseTool):
     focus: Optional[str] = None
 
     async def navigate(self, url: str, intent: Optional[str] = None, focus: Optional[str] = None) -> PageContent:
-        """Enhanced navigation with intent and focus extraction."""
+        """Enhanced navigation with intent and focus extraction.
+
+        Without a ``focus`` the raw page text is returned directly, skipping
+        the LLM-backed ``extract_content`` round-trip.
+        """
         self.intent = intent
         self.focus = focus
 
@@ -22,8 +36,15 @@ class EnhancedBrowserUseTool(OriginalBrowserUseTool):
         if result.error:
             raise ToolError(result.error)
 
+        if not self.focus:
+            return PageContent(
+                url=url,
+                content=_html_converter.handle(await self._get_page_html()),
+                relevant_links=[]
+            )
+
         # Get content
-        page_content_result = await self.execute(action="extract_content", goal=self.focus or "Summarize the page")
+        page_content_result = await self.execute(action="extract_content", goal=self.focus)
         if page_content_result.error:
              raise ToolError(page_content_result.error)
 
@@ -32,3 +53,10 @@ class EnhancedBrowserUseTool(OriginalBrowserUseTool):
             content=page_content_result.output,
             relevant_links=[] # Simplified for now
         )
+
+    async def _get_page_html(self) -> str:
+        """Return the HTML of the current page."""
+        async with self.lock:
+            context = await self._ensure_browser_initialized()
+            page = await context.get_current_page()
+            return await page.content()
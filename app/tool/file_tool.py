@@ -1,4 +1,6 @@
 import asyncio
+import codecs
+import itertools
 import os
 import tempfile
 import shutil
@@ -10,6 +12,11 @@ from app.tool.base import BaseTool, ToolResult
 
 PathLike = Union[str, Path]
 
+# Payloads above this size bypass the text wrapper and go straight to os.write
+LARGE_WRITE_THRESHOLD = 1 << 20
+# Number of characters encoded per os.write call on the large-payload path
+WRITE_CHUNK_SIZE = 1 << 20
+
 class EditOperation(BaseModel):
     find: str
     replace: str
@@ -55,6 +62,10 @@ class FileTool(BaseTool):
                 "type": "integer",
                 "description": "End line for reading (1-based, inclusive).",
             },
+            "durable": {
+                "type": "boolean",
+                "description": "Write atomically with fsync (default). Set to false for fast scratch writes.",
+            },
         },
         "required": ["action", "path"],
     }
@@ -68,7 +79,7 @@ class FileTool(BaseTool):
              raise ToolError(f"Access denied: {path} is outside the sandbox.")
         return full_path
 
-    async def execute(self, action: str, path: str, content: Optional[str] = None, edits: Optional[List[dict]] = None, start_line: Optional[int] = None, end_line: Optional[int] = None, **kwargs) -> ToolResult:
+    async def execute(self, action: str, path: str, content: Optional[str] = None, edits: Optional[List[dict]] = None, start_line: Optional[int] = None, end_line: Optional[int] = None, durable: bool = True, **kwargs) -> ToolResult:
         try:
             if action == "read":
                 text = await self.read(path, start_line, end_line)
@@ -76,7 +87,7 @@ class FileTool(BaseTool):
             elif action == "write":
                 if content is None:
                     return ToolResult(error="Content required for write action")
-                await self.write(path, content)
+                await self.write(path, content, durable=durable)
                 return ToolResult(output=f"Successfully wrote to {path}")
             elif action == "append":
                 if content is None:
@@ -102,16 +113,12 @@ class FileTool(BaseTool):
         """Read content from a file, optionally restricted to a line range."""
         full_path = self._validate_path(path)
         try:
-            content = full_path.read_text(encoding="utf-8")
             if start_line is None and end_line is None:
-                return content
-
-            lines = content.splitlines()
-            total_lines = len(lines)
+                return full_path.read_text(encoding="utf-8")
 
             # Default indices
             start_idx = 0
-            end_idx = total_lines
+            end_idx = None
 
             if start_line is not None:
                 if start_line < 1:
@@ -121,13 +128,15 @@ class FileTool(BaseTool):
             if end_line is not None:
                  end_idx = end_line
 
-            # Slice lines
-            selected_lines = lines[start_idx:end_idx]
+            # Only materialize the requested window of lines
+            with full_path.open('r', encoding="utf-8") as f:
+                selected_lines = list(itertools.islice(f, start_idx, end_idx))
 
             # Add line numbers for context if range is used
             result = []
             for i, line in enumerate(selected_lines):
                 current_line_num = start_idx + i + 1
+                line = line.rstrip("\n")
                 result.append(f"{current_line_num:4d} | {line}")
 
             return "\n".join(result)
@@ -137,28 +146,62 @@ class FileTool(BaseTool):
         except Exception as e:
             raise ToolError(f"Failed to read {path}: {str(e)}")
 
-    async def write(self, path: PathLike, content: str) -> None:
-        """Write content to a file atomically."""
+    async def write(self, path: PathLike, content: str, durable: bool = True) -> None:
+        """Write content to a file atomically.
+
+        With ``durable=False`` the file is written in place without the
+        temp-file, fsync and rename steps.
+        """
         full_path = self._validate_path(path)
 
         # Ensure directory exists
         full_path.parent.mkdir(parents=True, exist_ok=True)
 
+        if not durable:
+            try:
+                with full_path.open('w', encoding="utf-8") as f:
+                    f.write(content)
+            except Exception as e:
+                raise ToolError(f"Failed to write to {path}: {str(e)}")
+            return
+
         # Atomic write implementation
         tmp_fd, tmp_path = tempfile.mkstemp(dir=self.base_dir, text=True)
         try:
-            with os.fdopen(tmp_fd, 'w', encoding="utf-8") as tmp:
-                tmp.write(content)
-                tmp.flush()
-                os.fsync(tmp.fileno())  # Ensure data is on disk
+            if len(content) > LARGE_WRITE_THRESHOLD:
+                try:
+                    self._write_encoded(tmp_fd, content)
+                    os.fsync(tmp_fd)  # Ensure data is on disk
+                finally:
+                    os.close(tmp_fd)
+            else:
+                with os.fdopen(tmp_fd, 'w', encoding="utf-8") as tmp:
+                    tmp.write(content)
+                    tmp.flush()
+                    os.fsync(tmp.fileno())  # Ensure data is on disk
 
             # Atomic rename
             os.replace(tmp_path, full_path)
         except Exception as e:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+            Path(tmp_path).unlink(missing_ok=True)
             raise ToolError(f"Failed to write to {path}: {str(e)}")
 
+    @classmethod
+    def _write_encoded(cls, fd: int, content: str) -> None:
+        """Encode ``content`` as UTF-8 in bounded chunks and write each one to ``fd``."""
+        encoder = codecs.getincrementalencoder("utf-8")()
+        for i in range(0, len(content), WRITE_CHUNK_SIZE):
+            cls._write_fd(fd, encoder.encode(content[i : i + WRITE_CHUNK_SIZE]))
+        cls._write_fd(fd, encoder.encode("", final=True))
+
+    @staticmethod
+    def _write_fd(fd: int, data: bytes) -> None:
+        """Write all of ``data`` to a raw file descriptor, retrying short writes."""
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+
     async def append(self, path: PathLike, content: str) -> None:
         """Append content to a file."""
         full_path = self._validate_path(path)
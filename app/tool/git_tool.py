@@ -14,7 +14,7 @@ class GitTool(BaseTool):
         "properties": {
             "action": {
                 "type": "string",
-                "enum": ["clone", "add", "commit", "push", "checkout", "pr_create"],
+                "enum": ["clone", "add", "commit", "push", "commit_push", "checkout", "pr_create"],
                 "description": "Git action to perform.",
             },
             "repo_url": {
@@ -69,6 +69,25 @@ class GitTool(BaseTool):
                 if branch:
                     args.extend(["origin", branch])
                 return await self._run_cmd(args)
+            elif action == "commit_push":
+                # add + commit + push in one tool call; each step is still its own git process
+                if not message:
+                    return ToolResult(error="Message required for commit")
+                if not self._validate_conventional_commit(message):
+                    return ToolResult(error="Commit message must follow Conventional Commits (e.g., 'feat: description')")
+                push = ["git", "push"]
+                if branch:
+                    push.extend(["origin", branch])
+                steps = (
+                    ("add", ["git", "add", "."]),
+                    ("commit", ["git", "commit", "-m", message]),
+                    ("push", push),
+                )
+                for step, args in steps:
+                    res = await self._run_cmd(args)
+                    if res.error:
+                        return ToolResult(error=f"git {step} failed: {res.error}")
+                return res
             elif action == "checkout":
                 if not branch:
                     return ToolResult(error="Branch required for checkout")
@@ -46,6 +46,25 @@ class MCPClients(ToolCollection):
     def __init__(self):
         super().__init__()  # Initialize with empty tools list
         self.name = "mcp"  # Keep name for backward compatibility
+        # Per-instance connection state; the class-level dicts would be shared
+        self.sessions = {}
+        self.exit_stacks = {}
+        # Tools indexed by both registered name and original server-side name
+        self._alias_map: Dict[str, MCPClientTool] = {}
+
+    def _rebuild_alias_map(self) -> None:
+        """Re-index tool_map by name and original_name."""
+        alias_map = {}
+        for name, tool in self.tool_map.items():
+            original_name = getattr(tool, "original_name", "")
+            if original_name:
+                alias_map.setdefault(original_name, tool)
+        alias_map.update(self.tool_map)
+        self._alias_map = alias_map
+
+    def resolve_tool(self, name: str) -> Optional[BaseTool]:
+        """Look up a tool by its registered name or its original name."""
+        return self._alias_map.get(name)
 
     async def connect_sse(self, server_url: str, server_id: str = "") -> None:
         """Connect to an MCP server using SSE transport."""
@@ -121,6 +140,7 @@ class MCPClients(ToolCollection):
 
         # Update tools tuple
         self.tools = tuple(self.tool_map.values())
+        self._rebuild_alias_map()
         logger.info(
             f"Connected to server {server_id} with tools: {[tool.name for tool in response.tools]}"
         )
@@ -182,6 +202,7 @@ class MCPClients(ToolCollection):
                         if v.server_id != server_id
                     }
                     self.tools = tuple(self.tool_map.values())
+                    self._rebuild_alias_map()
                     logger.info(f"Disconnected from MCP server {server_id}")
                 except Exception as e:
                     logger.error(f"Error disconnecting from server {server_id}: {e}")
@@ -191,4 +212,5 @@ class MCPClients(ToolCollection):
                 await self.disconnect(sid)
             self.tool_map = {}
             self.tools = tuple()
+            self._alias_map = {}
             logger.info("Disconnected from all MCP servers")
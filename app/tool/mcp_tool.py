@@ -1,12 +1,14 @@
 import asyncio
 import json
-from typing import Optional, Dict, Any
+from typing import Any, Callable, ClassVar, Dict, List, Optional
 
 from pydantic import PrivateAttr
 
 from app.logger import logger
+from app.tool._async_loop import AsyncLoopThread
 from app.tool.base import BaseTool, ToolResult
 from app.tool.mcp import MCPClients
+from app.utils import fast_json
 
 
 class MCPTool(BaseTool):
@@ -20,7 +22,7 @@ class MCPTool(BaseTool):
         "properties": {
             "action": {
                 "type": "string",
-                "enum": ["connect_server", "list_tools", "call_tool"],
+                "enum": ["connect_server", "list_tools", "call_tool", "batch_execute"],
                 "description": "Action to perform.",
             },
             "server_name": {
@@ -39,11 +41,88 @@ class MCPTool(BaseTool):
                 "type": "string",
                 "description": "JSON string of arguments for the tool.",
             },
+            "operations": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "tool_name": {"type": "string"},
+                        "args": {"type": "object"},
+                    },
+                    "required": ["tool_name"],
+                },
+                "description": "Tool calls to run together for batch_execute.",
+            },
+            "max_concurrent": {
+                "type": "integer",
+                "description": "Maximum number of batch_execute calls in flight at once (default 4).",
+            },
+            "stop_on_error": {
+                "type": "boolean",
+                "description": "Cancel the remaining batch_execute calls after the first failure.",
+            },
         },
         "required": ["action"],
     }
 
-    _mcp_clients: MCPClients = PrivateAttr(default_factory=MCPClients)
+    # One live client per server, kept open across calls until cleanup()
+    _sessions: Dict[str, MCPClients] = PrivateAttr(default_factory=dict)
+    # MCP sessions are bound to the loop that opened them, so all session I/O
+    # runs on one shared loop thread regardless of the caller's loop
+    _loop: AsyncLoopThread = PrivateAttr(default_factory=AsyncLoopThread.get)
+    # Per-server locks serializing connects, used only on the shared loop
+    _connect_locks: Dict[str, asyncio.Lock] = PrivateAttr(default_factory=dict)
+
+    async def _connect(self, server_name: str, server_url: str) -> bool:
+        """Connect to a server unless a live connection already exists.
+
+        Returns True if a new connection was opened.
+        """
+        return await self._loop.run(self._open_connection(server_name, server_url))
+
+    async def _open_connection(self, server_name: str, server_url: str) -> bool:
+        # Runs on the shared loop, where the per-server locks live; without them
+        # two concurrent connects would both open a connection and leak one
+        lock = self._connect_locks.setdefault(server_name, asyncio.Lock())
+        async with lock:
+            clients = self._sessions.get(server_name)
+            if clients is not None and server_name in clients.sessions:
+                return False
+
+            clients = MCPClients()
+            try:
+                # Simple heuristic: starts with http -> SSE, else Stdio command
+                if server_url.startswith("http"):
+                    await clients.connect_sse(server_url, server_name)
+                else:
+                    parts = server_url.split()
+                    command = parts[0]
+                    cmd_args = parts[1:]
+                    await clients.connect_stdio(command, cmd_args, server_name)
+            except BaseException:
+                # Don't leave a half-open stdio process or SSE stream behind
+                await clients.disconnect(server_name)
+                exit_stack = clients.exit_stacks.pop(server_name, None)
+                if exit_stack is not None:
+                    try:
+                        await exit_stack.aclose()
+                    except Exception as e:
+                        logger.warning(f"Error closing failed connection to {server_name}: {e}")
+                raise
+
+            self._sessions[server_name] = clients
+            return True
+
+    def _resolve_tool(self, tool_name: str):
+        """Find a connected tool by its registered name or original name."""
+        for clients in self._sessions.values():
+            tool = clients.resolve_tool(tool_name)
+            if tool:
+                return tool
+        return None
+
+    def _available_tools(self) -> List[str]:
+        return [name for clients in self._sessions.values() for name in clients.tool_map]
 
     async def execute(
         self,
@@ -52,58 +131,137 @@ class MCPTool(BaseTool):
         server_url: Optional[str] = None,
         tool_name: Optional[str] = None,
         args: Optional[str] = None,
+        operations: Optional[List[dict]] = None,
+        max_concurrent: int = 4,
+        stop_on_error: bool = False,
         **kwargs,
     ) -> ToolResult:
+        handler = self._ACTIONS.get(action)
+        if handler is None:
+            return ToolResult(error=f"Unknown action: {action}")
         try:
-            if action == "connect_server":
-                if not server_name or not server_url:
-                    return ToolResult(error="Server name and URL required for connect_server")
+            return await handler(
+                self,
+                server_name=server_name,
+                server_url=server_url,
+                tool_name=tool_name,
+                args=args,
+                operations=operations,
+                max_concurrent=max_concurrent,
+                stop_on_error=stop_on_error,
+            )
+        except Exception as e:
+            logger.exception(f"MCPTool error: {e}")
+            return ToolResult(error=str(e))
 
-                # Simple heuristic: starts with http -> SSE, else Stdio command
-                if server_url.startswith("http"):
-                    await self._mcp_clients.connect_sse(server_url, server_name)
-                else:
-                    parts = server_url.split()
-                    command = parts[0]
-                    cmd_args = parts[1:]
-                    await self._mcp_clients.connect_stdio(command, cmd_args, server_name)
-
-                return ToolResult(output=f"Connected to MCP server '{server_name}'")
-
-            elif action == "list_tools":
-                result = await self._mcp_clients.list_tools()
-                # Format output nicely
-                tools_list = [f"{t.name}: {t.description}" for t in result.tools]
-                return ToolResult(output="\n".join(tools_list))
-
-            elif action == "call_tool":
-                if not tool_name:
-                    return ToolResult(error="Tool name required for call_tool")
-
-                # Locate the tool wrapper
-                target_tool = None
-                # Check direct match or match by original name
-                for name, tool in self._mcp_clients.tool_map.items():
-                    if name == tool_name or getattr(tool, "original_name", "") == tool_name:
-                        target_tool = tool
-                        break
-
-                if not target_tool:
-                    return ToolResult(error=f"Tool '{tool_name}' not found. Available tools: {list(self._mcp_clients.tool_map.keys())}")
-
-                # Parse arguments
-                tool_args = {}
-                if args:
-                    try:
-                        tool_args = json.loads(args)
-                    except json.JSONDecodeError:
-                        return ToolResult(error="Invalid JSON in 'args'")
+    async def _connect_server(self, server_name: Optional[str], server_url: Optional[str], **kwargs) -> ToolResult:
+        if not server_name or not server_url:
+            return ToolResult(error="Server name and URL required for connect_server")
+
+        if not await self._connect(server_name, server_url):
+            return ToolResult(output=f"Already connected to MCP server '{server_name}'")
+
+        return ToolResult(output=f"Connected to MCP server '{server_name}'")
 
-                return await target_tool.execute(**tool_args)
+    async def _list_tools(self, **kwargs) -> ToolResult:
+        # Format output nicely
+        tools_list = []
+        for clients in self._sessions.values():
+            result = await self._loop.run(clients.list_tools())
+            tools_list.extend(f"{t.name}: {t.description}" for t in result.tools)
+        return ToolResult(output="\n".join(tools_list))
+
+    async def _call_tool(self, tool_name: Optional[str], args: Optional[str], **kwargs) -> ToolResult:
+        if not tool_name:
+            return ToolResult(error="Tool name required for call_tool")
+
+        # Locate the tool wrapper
+        target_tool = self._resolve_tool(tool_name)
+        if not target_tool:
+            return ToolResult(error=f"Tool '{tool_name}' not found. Available tools: {self._available_tools()}")
+
+        # Parse arguments
+        tool_args = {}
+        if args:
+            try:
+                tool_args = fast_json.loads(args)
+            except fast_json.JSONDecodeError:
+                return ToolResult(error="Invalid JSON in 'args'")
+
+        return await self._loop.run(target_tool.execute(**tool_args))
+
+    async def _batch_execute(
+        self, operations: Optional[List[dict]], max_concurrent: int, stop_on_error: bool, **kwargs
+    ) -> ToolResult:
+        """Run several tool calls concurrently and collect them into one result."""
+        if not operations:
+            return ToolResult(error="Operations required for batch_execute")
 
+        calls = []
+        for op in operations:
+            name = op.get("tool_name")
+            target_tool = self._resolve_tool(name) if name else None
+            if not target_tool:
+                return ToolResult(error=f"Tool '{name}' not found. Available tools: {self._available_tools()}")
+            op_args = op.get("args") or {}
+            if isinstance(op_args, str):
+                try:
+                    op_args = fast_json.loads(op_args)
+                except fast_json.JSONDecodeError:
+                    return ToolResult(error=f"Invalid JSON in 'args' for '{name}'")
+            calls.append((name, target_tool, op_args))
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrent))
+
+        async def run_call(target_tool, op_args) -> ToolResult:
+            async with semaphore:
+                return await self._loop.run(target_tool.execute(**op_args))
+
+        tasks = [asyncio.create_task(run_call(tool, op_args)) for _, tool, op_args in calls]
+        if stop_on_error:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    result = await next_done
+                except Exception:
+                    result = None
+                if result is None or result.error:
+                    for task in tasks:
+                        task.cancel()
+                    break
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        results = []
+        for (name, _, _), task in zip(calls, tasks):
+            if task.cancelled():
+                results.append({"tool_name": name, "error": "Cancelled"})
+            elif task.exception() is not None:
+                results.append({"tool_name": name, "error": str(task.exception())})
             else:
-                return ToolResult(error=f"Unknown action: {action}")
+                result = task.result()
+                results.append({"tool_name": name, "output": result.output, "error": result.error})
 
-        except Exception as e:
-            logger.exception(f"MCPTool error: {e}")
-            return ToolResult(error=str(e))
+        output = json.dumps(results, indent=2, ensure_ascii=False, default=str)
+        if any(r.get("error") for r in results):
+            return ToolResult(output=output, error="One or more batch operations failed")
+        return ToolResult(output=output)
+
+    def execute_sync(self, **kwargs) -> ToolResult:
+        """Run ``execute`` from synchronous code on the shared loop thread."""
+        return self._loop.run_sync(self.execute(**kwargs))
+
+    async def cleanup(self):
+        """Close every open MCP server connection."""
+        for server_name, clients in list(self._sessions.items()):
+            try:
+                await self._loop.run(clients.disconnect())
+            except Exception as e:
+                logger.error(f"Error disconnecting MCP server '{server_name}': {e}")
+        self._sessions.clear()
+
+    # Action name -> handler, built once with the class
+    _ACTIONS: ClassVar[Dict[str, Callable]] = {
+        "connect_server": _connect_server,
+        "list_tools": _list_tools,
+        "call_tool": _call_tool,
+        "batch_execute": _batch_execute,
+    }
@@ -1,5 +1,7 @@
+import hashlib
 import os
-from typing import Optional
+import threading
+from typing import Callable, ClassVar, Dict, Optional
 
 from pydantic import Field
 
@@ -8,6 +10,41 @@ from app.logger import logger
 from app.tool.base import BaseTool, ToolResult
 
 
+# Simple Markdown to HTML Slide conversion (Reveal.js style simplified)
+_SLIDES_HEADER = b"""
+        <html>
+        <head>
+            <title>Presentation</title>
+            <style>
+                body { font-family: sans-serif; display: flex; flex-direction: column; align-items: center; }
+                .slide { border: 1px solid #ccc; padding: 20px; margin: 20px; width: 800px; height: 600px; overflow: auto; page-break-after: always; }
+            </style>
+        </head>
+        <body>
+        """
+_SLIDES_FOOTER = b"</body></html>"
+_SLIDE_OPEN = b'<div class="slide">'
+_SLIDE_CLOSE = b"</div>"
+
+# Allowed values for the enum parameters, each checked by the handler that reads it
+_STYLES = frozenset({"PHOTOREALISTIC", "CARTOON", "SKETCH"})
+_SLIDE_MODES = frozenset({"HTML", "PDF"})
+_VOICE_PROFILES = frozenset({"MALE", "FEMALE", "NEUTRAL"})
+
+# Shared Markdown parser, built on first use; instances are not thread-safe
+_markdown = None
+_markdown_lock = threading.Lock()
+
+
+def _get_markdown():
+    global _markdown
+    if _markdown is None:
+        import markdown
+
+        _markdown = markdown.Markdown()
+    return _markdown
+
+
 class MediaGenerationTool(BaseTool):
     name: str = "media_generation_tool"
     description: str = """
@@ -68,30 +105,43 @@ class MediaGenerationTool(BaseTool):
         voice_profile: str = "NEUTRAL",
         **kwargs,
     ) -> ToolResult:
+        handler = self._ACTIONS.get(action)
+        if handler is None:
+            return ToolResult(error=f"Unknown action: {action}")
         try:
-            if action == "generate_image":
-                if not prompt:
-                    return ToolResult(error="Prompt required for generate_image")
-                return await self._generate_image(prompt, style)
-            elif action == "generate_slides":
-                if not content_path:
-                    return ToolResult(error="Content path required for generate_slides")
-                return await self._generate_slides(content_path, mode)
-            elif action == "generate_audio":
-                if not text:
-                    return ToolResult(error="Text required for generate_audio")
-                return await self._generate_audio(text, voice_profile)
-            else:
-                return ToolResult(error=f"Unknown action: {action}")
+            return await handler(
+                self,
+                prompt=prompt,
+                content_path=content_path,
+                text=text,
+                style=style,
+                mode=mode,
+                voice_profile=voice_profile,
+            )
         except Exception as e:
             logger.exception(f"MediaGenerationTool error: {e}")
             return ToolResult(error=str(e))
 
-    async def _generate_image(self, prompt: str, style: str) -> ToolResult:
+    @staticmethod
+    def _media_path(kind: str, ext: str, *inputs: str) -> str:
+        """Path for a generated asset, named by a stable hash of its inputs.
+
+        Unlike the builtin ``hash``, blake2b is not salted per process, so an
+        identical request maps to the same file across runs.
+        """
+        digest = hashlib.blake2b("\0".join(inputs).encode("utf-8"), digest_size=16).hexdigest()
+        return os.path.join(os.getcwd(), "generated_media", f"generated_{kind}_{digest}.{ext}")
+
+    async def _generate_image(self, prompt: Optional[str], style: str, **kwargs) -> ToolResult:
+        if not prompt:
+            return ToolResult(error="Prompt required for generate_image")
+        if style not in _STYLES:
+            return ToolResult(error=f"Invalid style: {style}")
         # Mock implementation as we don't have DALL-E keys configured in this environment explicitly
         # In a real implementation, we would call OpenAI Image API
-        filename = f"generated_image_{hash(prompt)}.png"
-        path = os.path.join(os.getcwd(), "generated_media", filename)
+        path = self._media_path("image", "png", prompt, style)
+        if os.path.exists(path):
+            return ToolResult(output=f"Image cached at {path}")
         os.makedirs(os.path.dirname(path), exist_ok=True)
 
         # Create a placeholder image
@@ -105,57 +155,60 @@ class MediaGenerationTool(BaseTool):
 
         return ToolResult(output=f"Image generated at {path}")
 
-    async def _generate_slides(self, content_path: str, mode: str) -> ToolResult:
+    async def _generate_slides(self, content_path: Optional[str], mode: str, **kwargs) -> ToolResult:
+        if not content_path:
+            return ToolResult(error="Content path required for generate_slides")
+        if mode not in _SLIDE_MODES:
+            return ToolResult(error=f"Invalid mode: {mode}")
         if not os.path.exists(content_path):
             return ToolResult(error=f"File not found: {content_path}")
 
         with open(content_path, "r") as f:
             content = f.read()
 
-        # Simple Markdown to HTML Slide conversion (Reveal.js style simplified)
-        slides_html = f"""
-        <html>
-        <head>
-            <title>Presentation</title>
-            <style>
-                body {{ font-family: sans-serif; display: flex; flex-direction: column; align-items: center; }}
-                .slide {{ border: 1px solid #ccc; padding: 20px; margin: 20px; width: 800px; height: 600px; overflow: auto; page-break-after: always; }}
-            </style>
-        </head>
-        <body>
-        """
-
-        # Split by "---" for slides
-        slides = content.split("---")
-        import markdown
-
-        for slide in slides:
-            html_content = markdown.markdown(slide)
-            slides_html += f'<div class="slide">{html_content}</div>'
-
-        slides_html += "</body></html>"
-
-        output_path = content_path.replace(".md", f".{mode.lower()}").replace(".txt", f".{mode.lower()}")
-        if output_path == content_path:
-            output_path += f".{mode.lower()}"
+        root, ext = os.path.splitext(content_path)
+        if ext not in (".md", ".txt"):
+            root = content_path
+        output_path = f"{root}.{mode.lower()}"
 
         if mode == "PDF":
              # Mock PDF conversion
              with open(output_path, "w") as f:
                  f.write(f"PDF content for {content_path}")
         else:
-            with open(output_path, "w") as f:
-                f.write(slides_html)
+            # Write each slide as it is converted instead of building the whole document in memory
+            with open(output_path, "wb", buffering=1 << 20) as f, _markdown_lock:
+                md = _get_markdown()
+                f.write(_SLIDES_HEADER)
+                # Split by "---" for slides
+                for slide in content.split("---"):
+                    md.reset()
+                    f.write(_SLIDE_OPEN)
+                    f.write(md.convert(slide).encode("utf-8"))
+                    f.write(_SLIDE_CLOSE)
+                f.write(_SLIDES_FOOTER)
 
         return ToolResult(output=f"Slides generated at {output_path} (Mode: {mode})")
 
-    async def _generate_audio(self, text: str, voice_profile: str) -> ToolResult:
+    async def _generate_audio(self, text: Optional[str], voice_profile: str, **kwargs) -> ToolResult:
+        if not text:
+            return ToolResult(error="Text required for generate_audio")
+        if voice_profile not in _VOICE_PROFILES:
+            return ToolResult(error=f"Invalid voice_profile: {voice_profile}")
         # Mock implementation
-        filename = f"generated_audio_{hash(text)}.mp3"
-        path = os.path.join(os.getcwd(), "generated_media", filename)
+        path = self._media_path("audio", "mp3", text, voice_profile)
+        if os.path.exists(path):
+            return ToolResult(output=f"Audio cached at {path}")
         os.makedirs(os.path.dirname(path), exist_ok=True)
 
         with open(path, "w") as f:
             f.write(f"Audio placeholder content using profile {voice_profile}")
 
         return ToolResult(output=f"Audio generated at {path}")
+
+    # Action name -> handler, built once with the class
+    _ACTIONS: ClassVar[Dict[str, Callable]] = {
+        "generate_image": _generate_image,
+        "generate_slides": _generate_slides,
+        "generate_audio": _generate_audio,
+    }
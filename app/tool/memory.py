@@ -1,6 +1,7 @@
 from typing import Any, List, Optional
 from pydantic import Field
 
+from app.logger import logger
 from app.tool.base import BaseTool
 from app.memory.semantic import SemanticMemory
 
@@ -36,21 +37,22 @@ class MemorySearchTool(BaseTool):
     @property
     def memory(self) -> SemanticMemory:
         if self._memory is None:
-            # Fallback to creating a new one if not injected (e.g. unit tests)
-            # But this warns about inefficiency
-            self._memory = SemanticMemory()
+            # Fallback to the shared default if not injected (e.g. unit tests)
+            logger.warning("MemorySearchTool has no injected memory; using the shared default SemanticMemory")
+            self._memory = SemanticMemory.get_default()
         return self._memory
 
     async def execute(self, query: str, n_results: int = 5) -> Any:
-        results = self.memory.search(query, n_results)
+        results = self.memory.search(query, n_results, max_content_chars=200)
         if not results:
             return "No relevant information found in memory."
 
-        formatted_output = "Found relevant memories:\n"
+        parts = ["Found relevant memories:\n"]
         for res in results:
-            formatted_output += f"- {res['content'][:200]}... (Relevance: {res['distance']})\n"
+            parts.append(f"- {res['content']}... (Relevance: {res['distance']})\n")
             # Include source if available
-            if res.get('metadata') and 'source' in res['metadata']:
-                 formatted_output += f"  Source: {res['metadata']['source']}\n"
+            metadata = res.get('metadata')
+            if metadata and 'source' in metadata:
+                 parts.append(f"  Source: {metadata['source']}\n")
 
-        return formatted_output
+        return "".join(parts)
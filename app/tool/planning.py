@@ -84,6 +84,11 @@ class PlanningTool(BaseTool):
             self.plans[plan_id] = plan_data
             self._current_plan_id = plan_id
 
+    def clear(self):
+        """Drop all plans and the active plan, e.g. before an unrelated task."""
+        self.plans = {}
+        self._current_plan_id = None
+
     async def execute(
         self,
         *,
@@ -192,23 +197,18 @@ class PlanningTool(BaseTool):
             # This logic is tricky if steps are reordered or changed slightly.
             # Simplified approach: If steps are provided, reset statuses for new steps.
 
-            old_steps = plan["steps"]
             old_statuses = plan["step_statuses"]
             old_notes = plan["step_notes"]
 
+            # Index old steps once (first occurrence wins, as list.index did) to preserve status
+            old_index = {}
+            for i, step in enumerate(plan["steps"]):
+                old_index.setdefault(step, i)
+
             # Create new step statuses and notes
-            new_statuses = []
-            new_notes = []
-
-            for i, step in enumerate(steps):
-                # Try to find exact match in old steps to preserve status
-                try:
-                    old_idx = old_steps.index(step)
-                    new_statuses.append(old_statuses[old_idx])
-                    new_notes.append(old_notes[old_idx])
-                except ValueError:
-                    new_statuses.append("not_started")
-                    new_notes.append("")
+            matches = [old_index.get(step) for step in steps]
+            new_statuses = ["not_started" if i is None else old_statuses[i] for i in matches]
+            new_notes = ["" if i is None else old_notes[i] for i in matches]
 
             plan["steps"] = steps
             plan["step_statuses"] = new_statuses
@@ -1,7 +1,13 @@
+import asyncio
 import multiprocessing
+import os
 import sys
+import threading
 import io
 import contextlib
+import hashlib
+import types
+from collections import OrderedDict
 from typing import Dict, Optional, Any
 from pydantic import Field, PrivateAttr
 
@@ -10,6 +16,23 @@ from app.sandbox.docker import DockerSandbox
 from app.logger import logger
 
 
+# Compiled snippets keyed by a hash of their source, so re-issued code skips parse+compile
+CODE_CACHE_SIZE = 256
+_CODE_CACHE: "OrderedDict[bytes, types.CodeType]" = OrderedDict()
+
+
+def _compile_cached(code: str) -> types.CodeType:
+    key = hashlib.blake2b(code.encode("utf-8"), digest_size=16).digest()
+    co = _CODE_CACHE.get(key)
+    if co is not None:
+        _CODE_CACHE.move_to_end(key)
+        return co
+    co = _CODE_CACHE[key] = compile(code, "<script>", "exec")
+    if len(_CODE_CACHE) > CODE_CACHE_SIZE:
+        _CODE_CACHE.popitem(last=False)
+    return co
+
+
 class PythonExecute(BaseTool):
     """
     A tool for executing Python code.
@@ -17,7 +40,10 @@ class PythonExecute(BaseTool):
     """
 
     name: str = "python_execute"
-    description: str = "Executes Python code. Use print() to output results."
+    description: str = (
+        "Executes Python code. Use print() to output results. Each call starts with "
+        "fresh globals, but imported modules stay loaded between calls."
+    )
     parameters: dict = {
         "type": "object",
         "properties": {
@@ -37,6 +63,11 @@ class PythonExecute(BaseTool):
     # Use PrivateAttr or excluded Field to hold the sandbox reference
     sandbox: Optional[Any] = Field(default=None, exclude=True)
 
+    # Persistent local worker process and its end of the pipe
+    _worker: Optional[Any] = PrivateAttr(default=None)
+    _worker_conn: Optional[Any] = PrivateAttr(default=None)
+    _worker_lock: Any = PrivateAttr(default_factory=threading.Lock)
+
     async def execute(self, code: str, timeout: int = 30, **kwargs) -> Dict[str, Any]:
         """Execute code in sandbox or locally."""
         if self.sandbox:
@@ -47,13 +78,12 @@ class PythonExecute(BaseTool):
     async def _execute_in_sandbox(self, code: str, timeout: int) -> Dict[str, Any]:
         """Execute code using Docker Sandbox."""
         try:
-            # Write code to file and run file
-            filename = "script.py"
-            # Assuming sandbox has write_file and exec_run
-            self.sandbox.write_file(filename, code)
-
-            exit_code, output = self.sandbox.exec_run(
-                f"python3 {filename}",
+            # Pipe the code to the interpreter's stdin; no script file is staged in the container.
+            # The docker calls block, so they run off the event loop
+            exit_code, output = await asyncio.to_thread(
+                self.sandbox.exec_stdin,
+                "python3 -",
+                code,
                 timeout=timeout
             )
 
@@ -73,35 +103,78 @@ class PythonExecute(BaseTool):
         """Execute code locally (Unsafe fallback)."""
         logger.warning("Executing Python code LOCALLY. Ensure environment is secure.")
 
-        # Use multiprocessing to isolate memory space at least a bit and handle timeout
-        with multiprocessing.Manager() as manager:
-            result = manager.dict({"observation": "", "success": False})
-
-            # Safe globals?
-            safe_globals = {"__builtins__": __builtins__}
-            if hasattr(__builtins__, '__dict__'):
-                 safe_globals = {"__builtins__": __builtins__.__dict__.copy()}
-
-            p = multiprocessing.Process(target=self._run_code_local, args=(code, result, safe_globals))
-            p.start()
-            p.join(timeout)
-
-            if p.is_alive():
-                p.terminate()
-                p.join()
-                return {"observation": f"Timeout after {timeout}s", "success": False}
-
-            return dict(result)
+        # A long-lived worker process runs the code, isolating memory from the agent and handling timeout
+        with self._worker_lock:
+            conn = self._ensure_worker()
+            try:
+                conn.send(code)
+                # Poll rather than block so a runaway snippet can be killed
+                if not conn.poll(timeout):
+                    self._stop_worker()
+                    return {"observation": f"Timeout after {timeout}s", "success": False}
+                return conn.recv()
+            except (EOFError, OSError):
+                self._stop_worker()
+                return {"observation": "Process exited without returning a result", "success": False}
+
+    def _ensure_worker(self):
+        """Start the worker process on first use or after it was killed."""
+        if self._worker is None or not self._worker.is_alive():
+            self._stop_worker()
+            # fork avoids re-importing the interpreter state in the child on Linux
+            ctx = multiprocessing.get_context("fork" if sys.platform.startswith("linux") else None)
+            parent_conn, child_conn = ctx.Pipe()
+            self._worker = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+            self._worker.start()
+            child_conn.close()
+            self._worker_conn = parent_conn
+        return self._worker_conn
+
+    def _stop_worker(self):
+        if self._worker is not None:
+            if self._worker.is_alive():
+                self._worker.kill()
+            self._worker.join()
+            self._worker = None
+        if self._worker_conn is not None:
+            self._worker_conn.close()
+            self._worker_conn = None
+
+    async def cleanup(self):
+        """Stop the local worker process."""
+        with self._worker_lock:
+            self._stop_worker()
 
     @staticmethod
-    def _run_code_local(code: str, result_dict: Dict, globals_dict: Dict):
+    def _run_code_local(code: str, globals_dict: Dict) -> Dict[str, Any]:
         """Helper for local execution."""
         output_buffer = io.StringIO()
         try:
             with contextlib.redirect_stdout(output_buffer), contextlib.redirect_stderr(output_buffer):
-                exec(code, globals_dict)
-            result_dict["observation"] = output_buffer.getvalue()
-            result_dict["success"] = True
+                exec(_compile_cached(code), globals_dict)
+            return {"observation": output_buffer.getvalue(), "success": True}
         except Exception as e:
-            result_dict["observation"] = f"{output_buffer.getvalue()}\nError: {e}"
-            result_dict["success"] = False
+            return {"observation": f"{output_buffer.getvalue()}\nError: {e}", "success": False}
+
+
+def _worker_main(conn) -> None:
+    """Worker loop: run each received snippet in fresh globals and send back the result."""
+    import builtins
+
+    # Snapshot taken once per worker, so builtins are never pickled per call. Each
+    # snippet still gets its own copy, so one cannot rebind a builtin for the next.
+    # exec() needs a real dict here: a MappingProxyType breaks the import machinery.
+    safe_builtins = dict(builtins.__dict__)
+    cwd = os.getcwd()
+    while True:
+        try:
+            code = conn.recv()
+        except EOFError:
+            break
+        result = PythonExecute._run_code_local(code, {"__builtins__": dict(safe_builtins)})
+        # A snippet's os.chdir() must not carry over into the next one
+        try:
+            os.chdir(cwd)
+        except OSError:
+            pass
+        conn.send(result)
@@ -1,12 +1,40 @@
 import json
 import os
-import uuid
-from typing import Optional
+import secrets
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, ClassVar, Dict, Optional, Tuple
 
 from pydantic import PrivateAttr
 
+try:
+    from croniter import croniter
+except ImportError:
+    croniter = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None
+
 from app.logger import logger
 from app.tool.base import BaseTool, ToolResult
+from app.utils import fast_json
+
+
+# Fold the change log into the snapshot once it grows past this size
+LOG_COMPACT_BYTES = 1 << 20
+
+
+def next_cron_fire(cron: str, after: Optional[float] = None) -> float:
+    """Epoch time of the next match of ``cron`` after ``after`` (default: now).
+
+    Raises ValueError for an invalid expression. Requires croniter.
+    """
+    base = datetime.fromtimestamp(time.time() if after is None else after)
+    return croniter(cron, base).get_next(float)
 
 
 class ScheduleTool(BaseTool):
@@ -43,13 +71,16 @@ class ScheduleTool(BaseTool):
             },
             "task_id": {
                 "type": "string",
-                "description": "UUID of the task to cancel.",
+                "description": "ID of the task to cancel.",
             },
         },
         "required": ["action"],
     }
 
     _schedule_file: str = PrivateAttr(default=os.path.expanduser("~/.manus_schedule.json"))
+    # Last loaded/saved tasks and the (mtime_ns, size) of the snapshot and log they came from
+    _tasks_cache: Optional[dict] = PrivateAttr(default=None)
+    _tasks_stamp: Optional[tuple] = PrivateAttr(default=None)
 
     async def execute(
         self,
@@ -62,76 +93,216 @@ class ScheduleTool(BaseTool):
         task_id: Optional[str] = None,
         **kwargs,
     ) -> ToolResult:
+        handler = self._ACTIONS.get(action)
+        if handler is None:
+            return ToolResult(error=f"Unknown action: {action}")
         try:
-            if action == "schedule_cron":
-                if not name or not cron_expression or not prompt:
-                    return ToolResult(error="Name, cron_expression, and prompt required")
-                return self._schedule_cron(name, cron_expression, prompt, repeat)
-            elif action == "schedule_interval":
-                if not name or not interval_seconds or not prompt:
-                    return ToolResult(error="Name, interval_seconds, and prompt required")
-                return self._schedule_interval(name, interval_seconds, prompt, repeat)
-            elif action == "cancel_task":
-                if not task_id:
-                    return ToolResult(error="Task ID required")
-                return self._cancel_task(task_id)
-            elif action == "list_tasks":
-                return self._list_tasks()
-            else:
-                return ToolResult(error=f"Unknown action: {action}")
+            return handler(
+                self,
+                name=name,
+                cron_expression=cron_expression,
+                interval_seconds=interval_seconds,
+                prompt=prompt,
+                repeat=repeat,
+                task_id=task_id,
+            )
         except Exception as e:
             logger.exception(f"ScheduleTool error: {e}")
             return ToolResult(error=str(e))
 
+    @property
+    def _log_file(self) -> str:
+        """Append-only change log that sits next to the snapshot file."""
+        return os.path.splitext(self._schedule_file)[0] + ".log"
+
+    @contextmanager
+    def _locked(self):
+        """Hold the lock, across processes, that guards the snapshot and log."""
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.splitext(self._schedule_file)[0] + ".lock", "ab") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _stat_stamp(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _file_stamp(self) -> Tuple[Optional[Tuple[int, int]], Optional[Tuple[int, int]]]:
+        return (self._stat_stamp(self._schedule_file), self._stat_stamp(self._log_file))
+
     def _load_tasks(self) -> dict:
-        if os.path.exists(self._schedule_file):
+        stamp = self._file_stamp()
+        if self._tasks_cache is not None and stamp == self._tasks_stamp:
+            return self._tasks_cache
+
+        tasks = {}
+        if stamp[0] is not None:
             try:
-                with open(self._schedule_file, "r") as f:
-                    return json.load(f)
+                with open(self._schedule_file, "rb") as f:
+                    tasks = fast_json.loads(f.read())
             except:
                 return {}
-        return {}
+        if stamp[1] is not None:
+            self._replay_log(tasks)
+        self._tasks_cache, self._tasks_stamp = tasks, stamp
+        return tasks
+
+    def _replay_log(self, tasks: dict) -> None:
+        """Apply the change log on top of the snapshot, skipping torn lines."""
+        with open(self._log_file, "rb") as f:
+            for line in f:
+                try:
+                    entry = fast_json.loads(line)
+                except fast_json.JSONDecodeError:
+                    continue
+                if entry.get("op") == "add":
+                    tasks[entry["id"]] = entry["task"]
+                elif entry.get("op") == "del":
+                    tasks.pop(entry["id"], None)
+                elif entry.get("op") == "patch" and entry["id"] in tasks:
+                    tasks[entry["id"]].update(entry["fields"])
+
+    def _append_log(self, tasks: dict, op: str, task_id: str) -> None:
+        """Record a single add/del without rewriting the snapshot."""
+        entry = {"op": op, "id": task_id}
+        if op == "add":
+            entry["task"] = tasks[task_id]
+        self._write_log(tasks, fast_json.dumps(entry) + b"\n")
+
+    def _patch_tasks(self, tasks: dict, patches: Dict[str, dict]) -> None:
+        """Record field updates for several tasks, already applied to ``tasks``, in one append."""
+        if patches:
+            self._write_log(tasks, b"".join(
+                fast_json.dumps({"op": "patch", "id": task_id, "fields": fields}) + b"\n"
+                for task_id, fields in patches.items()
+            ))
+
+    def _write_log(self, tasks: dict, data: bytes) -> None:
+        try:
+            with self._locked():
+                # Under the lock nobody else appends, so if the files still match the
+                # stamp ``tasks`` was loaded at, ``tasks`` is exactly what they now hold
+                unchanged = self._file_stamp() == self._tasks_stamp
+                with open(self._log_file, "ab") as f:
+                    f.write(data)
+                    f.flush()
+                stamp = self._file_stamp()
+        except Exception:
+            # Callers apply the change to the cached tasks before writing it;
+            # drop them so the next load shows what actually reached disk
+            self._tasks_cache = None
+            raise
+
+        if unchanged:
+            self._tasks_cache, self._tasks_stamp = tasks, stamp
+        else:
+            # Another process wrote since our load; reload rather than hide its change
+            self._tasks_cache = None
+
+        if stamp[1] is not None and stamp[1][1] > LOG_COMPACT_BYTES:
+            self.compact()
+
+    def compact(self) -> None:
+        """Fold the change log into the snapshot, if there is one."""
+        # Load under the lock so entries other processes appended are folded in, not dropped
+        with self._locked():
+            if os.path.exists(self._log_file):
+                self._save_tasks(self._load_tasks())
 
     def _save_tasks(self, tasks: dict):
-        with open(self._schedule_file, "w") as f:
-            json.dump(tasks, f, indent=2)
+        """Write a full snapshot and drop the change log it supersedes."""
+        # Write to a temp file and rename so readers never see a partial file
+        directory = os.path.dirname(self._schedule_file) or "."
+        tmp_fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".manus_schedule.")
+        try:
+            with os.fdopen(tmp_fd, "wb") as f:
+                f.write(fast_json.dumps(tasks, indent=True))
+            os.replace(tmp_path, self._schedule_file)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self._tasks_cache = None
+            raise
+        try:
+            os.remove(self._log_file)
+        except FileNotFoundError:
+            pass
+        self._tasks_cache, self._tasks_stamp = tasks, self._file_stamp()
 
-    def _schedule_cron(self, name: str, cron: str, prompt: str, repeat: bool) -> ToolResult:
-        tasks = self._load_tasks()
-        task_id = str(uuid.uuid4())
-        tasks[task_id] = {
+    def _schedule_cron(
+        self, name: Optional[str], cron_expression: Optional[str], prompt: Optional[str], repeat: bool, **kwargs
+    ) -> ToolResult:
+        if not name or not cron_expression or not prompt:
+            return ToolResult(error="Name, cron_expression, and prompt required")
+        task = {
             "type": "cron",
             "name": name,
-            "cron": cron,
+            "cron": cron_expression,
             "prompt": prompt,
             "repeat": repeat,
             "status": "active"
         }
-        self._save_tasks(tasks)
+        # Parse once here so bad expressions are rejected up front and the
+        # scheduler can compare next_fire without re-parsing on every tick
+        if croniter is not None:
+            try:
+                task["next_fire"] = next_cron_fire(cron_expression)
+            except ValueError as e:
+                return ToolResult(error=f"Invalid cron expression '{cron_expression}': {e}")
+        else:
+            logger.warning("croniter not installed. Cron expression not validated.")
+
+        tasks = self._load_tasks()
+        task_id = secrets.token_urlsafe(12)
+        tasks[task_id] = task
+        self._append_log(tasks, "add", task_id)
         return ToolResult(output=f"Scheduled Cron Task {task_id}")
 
-    def _schedule_interval(self, name: str, interval: int, prompt: str, repeat: bool) -> ToolResult:
+    def _schedule_interval(
+        self, name: Optional[str], interval_seconds: Optional[int], prompt: Optional[str], repeat: bool, **kwargs
+    ) -> ToolResult:
+        if not name or not interval_seconds or not prompt:
+            return ToolResult(error="Name, interval_seconds, and prompt required")
         tasks = self._load_tasks()
-        task_id = str(uuid.uuid4())
+        task_id = secrets.token_urlsafe(12)
         tasks[task_id] = {
             "type": "interval",
             "name": name,
-            "interval": interval,
+            "interval": interval_seconds,
             "prompt": prompt,
             "repeat": repeat,
             "status": "active"
         }
-        self._save_tasks(tasks)
+        self._append_log(tasks, "add", task_id)
         return ToolResult(output=f"Scheduled Interval Task {task_id}")
 
-    def _cancel_task(self, task_id: str) -> ToolResult:
+    def _cancel_task(self, task_id: Optional[str], **kwargs) -> ToolResult:
+        if not task_id:
+            return ToolResult(error="Task ID required")
         tasks = self._load_tasks()
         if task_id in tasks:
             del tasks[task_id]
-            self._save_tasks(tasks)
+            self._append_log(tasks, "del", task_id)
             return ToolResult(output=f"Cancelled Task {task_id}")
         return ToolResult(error=f"Task {task_id} not found")
 
-    def _list_tasks(self) -> ToolResult:
+    def _list_tasks(self, **kwargs) -> ToolResult:
         tasks = self._load_tasks()
         return ToolResult(output=json.dumps(tasks, indent=2))
+
+    # Action name -> handler, built once with the class
+    _ACTIONS: ClassVar[Dict[str, Callable]] = {
+        "schedule_cron": _schedule_cron,
+        "schedule_interval": _schedule_interval,
+        "cancel_task": _cancel_task,
+        "list_tasks": _list_tasks,
+    }
@@ -1,14 +1,104 @@
 import asyncio
+import functools
+import hashlib
 import os
-from typing import List, Optional
+import re
+import tempfile
+import time
+from collections import Counter, deque
+from typing import Deque, List, Optional, Set
 
-import requests
+import aiofiles
+import aiohttp
 from pydantic import BaseModel, Field, PrivateAttr
 
 from app.llm import LLM
 from app.logger import logger
 from app.tool.base import BaseTool, ToolResult
 from app.tool.web_search import WebSearch
+from app.utils import fast_json
+from app.utils.distributed import cache
+
+
+# How long expanded query variants stay cached
+EXPAND_CACHE_TTL = 3600
+# Expansions are also persisted here so a restart starts warm; writes are debounced
+EXPAND_CACHE_FILE = os.path.expanduser("~/.cache/hydra-gamma/expand.json")
+EXPAND_SAVE_INTERVAL = 30
+# Large chunks keep per-chunk loop and write overhead small next to the transfer itself
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=10)
+# Maximum number of WebSearch calls in flight for one search action
+SEARCH_CONCURRENCY = 8
+# Background expansion of recent queries: how many per search, and how many at once
+PREFETCH_TOP_K = 4
+PREFETCH_CONCURRENCY = 2
+# Anything outside this set is dropped from downloaded file names
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._-]")
+
+
+class _SharedHTTPSession:
+    """One pooled aiohttp session per event loop, shared by every SearchTool.
+
+    Sessions are bound to the loop that created them, so a call from a new
+    loop gets a fresh session and the old one is closed. Each tool instance holds one reference and the
+    session is closed when the last holder releases it.
+    """
+
+    def __init__(self):
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.holders = 0
+
+    @staticmethod
+    def _make_connector() -> aiohttp.TCPConnector:
+        try:
+            # c-ares DNS when aiodns is installed, else aiohttp's threaded resolver
+            resolver = aiohttp.AsyncResolver()
+        except RuntimeError:
+            resolver = None
+        return aiohttp.TCPConnector(
+            limit=200, limit_per_host=16, ttl_dns_cache=300, keepalive_timeout=30, resolver=resolver
+        )
+
+    async def get(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self.session is None or self.session.closed or self.loop is not loop:
+            if self.session is not None:
+                await self._close_stale()
+            self.session = aiohttp.ClientSession(connector=self._make_connector())
+            self.loop = loop
+        return self.session
+
+    async def release(self) -> None:
+        self.holders = max(0, self.holders - 1)
+        if self.holders == 0 and self.session is not None:
+            if self.loop is asyncio.get_running_loop():
+                await self.session.close()
+            else:
+                await self._close_stale()
+            self.session = self.loop = None
+
+    async def _close_stale(self) -> None:
+        """Close a session that belongs to another event loop."""
+        session, loop = self.session, self.loop
+        if session.closed:
+            return
+        if loop.is_closed():
+            # Its connections went with the loop; this only marks the session closed
+            await session.close()
+        else:
+            # Close it on its own loop, now if that loop runs on another thread,
+            # otherwise the next time it runs
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+
+_shared_http = _SharedHTTPSession()
+
+
+@functools.lru_cache(maxsize=2048)
+def _parse_variants(response: str) -> tuple:
+    """Split an LLM expansion response into one query variant per non-blank line."""
+    return tuple(line.strip() for line in response.split("\n") if line.strip())
 
 
 class SearchResult(BaseModel):
@@ -55,7 +145,23 @@ class SearchTool(BaseTool):
     }
 
     _web_search: WebSearch = PrivateAttr(default_factory=WebSearch)
+    # Query-expansion cache hits/misses, for observability
+    _stats: Counter = PrivateAttr(default_factory=Counter)
+    # Whether this instance holds a reference to the shared download session
+    _holds_http: bool = PrivateAttr(default=False)
+    # Recently searched queries, used to warm the expansion cache in the background
+    _recent_queries: Deque[str] = PrivateAttr(default_factory=lambda: deque(maxlen=128))
+    _prefetch_tasks: Set[asyncio.Task] = PrivateAttr(default_factory=set)
+    _prefetch_sem: Optional[asyncio.Semaphore] = PrivateAttr(default=None)
+    # On-disk copy of expansions: key -> {"variants": [...], "expires": epoch seconds}
+    _expand_cache_file: str = PrivateAttr(default=EXPAND_CACHE_FILE)
+    _expand_entries: Optional[dict] = PrivateAttr(default=None)
+    _expand_load: Optional[asyncio.Future] = PrivateAttr(default=None)
+    _save_task: Optional[asyncio.Task] = PrivateAttr(default=None)
+    _last_save: float = PrivateAttr(default=0.0)
     llm: Optional[LLM] = Field(default_factory=LLM)
+    # Expand recently searched queries in the background; each expansion is an LLM call
+    prefetch_expansions: bool = False
 
     async def execute(
         self,
@@ -87,60 +193,195 @@ class SearchTool(BaseTool):
 
     async def _search(self, queries: List[str], type: str) -> ToolResult:
         results: List[SearchResult] = []
-        # We use the existing WebSearch tool for each query
-        # Parallel execution would be better
-        tasks = []
-        for q in queries:
-            tasks.append(self._web_search.execute(query=q, num_results=3)) # Limit results per query
+        seen = set()
+        # We use the existing WebSearch tool for each query, with a cap on
+        # how many run at once so long query lists don't flood the backend
+        semaphore = asyncio.Semaphore(SEARCH_CONCURRENCY)
+
+        async def bounded_search(q: str):
+            async with semaphore:
+                return await self._web_search.execute(query=q, num_results=3) # Limit results per query
 
-        search_responses = await asyncio.gather(*tasks)
+        search_responses = await asyncio.gather(
+            *(bounded_search(q) for q in queries), return_exceptions=True
+        )
 
         for response in search_responses:
+            if isinstance(response, Exception):
+                logger.warning(f"Search query failed: {response}")
+                continue
             if response.error:
                 continue
             for item in response.results:
-                results.append(SearchResult(
+                # Deduplicate by URL before building the model
+                if item.url in seen:
+                    continue
+                seen.add(item.url)
+                # Fields come from WebSearch's own validated results; skip revalidation
+                results.append(SearchResult.model_construct(
                     title=item.title,
                     snippet=item.description,
                     url=item.url
                 ))
 
-        # Deduplicate by URL
-        unique_results = {r.url: r for r in results}.values()
+        self._recent_queries.extend(queries)
+        self._schedule_prefetch()
 
-        return ToolResult(output=str([r.model_dump() for r in unique_results]))
+        return ToolResult(output=fast_json.dumps([r.model_dump() for r in results]).decode("utf-8"))
 
-    def _download_sync(self, url: str, path: str):
-        try:
-            response = requests.get(url, stream=True, timeout=10)
-            if response.status_code == 200:
-                with open(path, "wb") as f:
-                    for chunk in response.iter_content(1024):
-                        f.write(chunk)
-                return True, None
-            return False, response.status_code
-        except Exception as e:
-            return False, str(e)
+    def _schedule_prefetch(self) -> None:
+        """Expand the most recent not-yet-cached queries in the background, if enabled."""
+        if self.llm is None or not self.prefetch_expansions:
+            return
+        # The on-disk expansions may not be loaded yet; _prefetch loads them
+        # off the loop and re-checks the cache before each call
+        candidates = []
+        for q in reversed(self._recent_queries):
+            if q not in candidates and cache.get(self._expand_cache_key(q)) is None:
+                candidates.append(q)
+                if len(candidates) >= PREFETCH_TOP_K:
+                    break
+        if not candidates:
+            return
+        task = asyncio.create_task(self._prefetch(candidates))
+        # Keep a reference so the task isn't garbage collected mid-flight
+        self._prefetch_tasks.add(task)
+        task.add_done_callback(self._prefetch_tasks.discard)
+
+    async def _prefetch(self, queries: List[str]) -> None:
+        await self._ensure_expand_cache()
+        if self._prefetch_sem is None:
+            self._prefetch_sem = asyncio.Semaphore(PREFETCH_CONCURRENCY)
+
+        async def expand(q: str):
+            # Low priority: only a couple at a time so live requests aren't starved
+            async with self._prefetch_sem:
+                if cache.get(self._expand_cache_key(q)) is None:
+                    self._stats["expand_prefetched"] += 1
+                    await self._expand_query(q)
+
+        await asyncio.gather(*(expand(q) for q in queries), return_exceptions=True)
+
+    async def _get_http_session(self) -> aiohttp.ClientSession:
+        """Get the process-wide aiohttp session used for downloads."""
+        if not self._holds_http:
+            self._holds_http = True
+            _shared_http.holders += 1
+        return await _shared_http.get()
 
     async def _download_image(self, url: str) -> ToolResult:
         try:
-            filename = url.split("/")[-1] or "image.jpg"
             # Sanitize filename
-            filename = "".join(c for c in filename if c.isalnum() or c in "._-")
+            filename = _UNSAFE_FILENAME_CHARS.sub("", url.split("/")[-1]) or "image.jpg"
             path = os.path.join(os.getcwd(), "downloads", filename)
             os.makedirs(os.path.dirname(path), exist_ok=True)
 
-            loop = asyncio.get_event_loop()
-            success, error_code = await loop.run_in_executor(None, self._download_sync, url, path)
+            session = await self._get_http_session()
+            async with session.get(url, timeout=DOWNLOAD_TIMEOUT) as response:
+                if response.status != 200:
+                    return ToolResult(error=f"Failed to download image: {response.status}")
+                async with aiofiles.open(path, "wb") as f:
+                    async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                        await f.write(chunk)
 
-            if success:
-                return ToolResult(output=f"Image saved to {path}")
-            else:
-                return ToolResult(error=f"Failed to download image: {error_code}")
+            return ToolResult(output=f"Image saved to {path}")
         except Exception as e:
             return ToolResult(error=f"Download failed: {str(e)}")
 
+    async def cleanup(self):
+        """Cancel background prefetches, flush the expansion cache and release the download session."""
+        for task in list(self._prefetch_tasks):
+            task.cancel()
+        self._prefetch_tasks.clear()
+        # Flush a debounced save now rather than dropping it
+        if self._save_task is not None and not self._save_task.done():
+            self._save_task.cancel()
+            await self._save_expand_cache(delay=False)
+        if self._holds_http:
+            self._holds_http = False
+            await _shared_http.release()
+
+    async def __aenter__(self) -> "SearchTool":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.cleanup()
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _expand_cache_key(query: str) -> str:
+        # Case and whitespace differences should not miss the cache
+        normalized = " ".join(query.lower().split())
+        return "search_tool:expand:" + hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    async def _ensure_expand_cache(self) -> None:
+        """Seed the shared cache from the on-disk expansions, once per instance.
+
+        The file is read in a worker thread; the cache itself is only touched on the loop.
+        """
+        if self._expand_entries is not None:
+            return
+        if self._expand_load is None:
+            self._expand_load = asyncio.ensure_future(asyncio.to_thread(self._read_expand_cache))
+        # Shielded so a cancelled caller does not abort the read other callers wait on
+        entries = await asyncio.shield(self._expand_load)
+        if self._expand_entries is not None:
+            return
+        self._expand_entries = {}
+        now = time.time()
+        for key, entry in entries.items():
+            remaining = entry.get("expires", 0) - now
+            if remaining > 0:
+                self._expand_entries[key] = entry
+                if cache.get(key) is None:
+                    cache.set(key, entry["variants"], ttl=int(remaining))
+
+    def _read_expand_cache(self) -> dict:
+        try:
+            with open(self._expand_cache_file, "rb") as f:
+                return fast_json.loads(f.read())
+        except (OSError, fast_json.JSONDecodeError):
+            return {}
+
+    def _write_expand_cache(self, entries: dict) -> None:
+        # Write to a temp file and rename so readers never see a partial file
+        directory = os.path.dirname(self._expand_cache_file) or "."
+        os.makedirs(directory, exist_ok=True)
+        tmp_fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".expand.")
+        try:
+            with os.fdopen(tmp_fd, "wb") as f:
+                f.write(fast_json.dumps(entries))
+            os.replace(tmp_path, self._expand_cache_file)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _schedule_expand_save(self) -> None:
+        # A pending save picks up every entry added before it runs
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.create_task(self._save_expand_cache())
+
+    async def _save_expand_cache(self, delay: bool = True) -> None:
+        if delay:
+            await asyncio.sleep(max(0.0, self._last_save + EXPAND_SAVE_INTERVAL - time.monotonic()))
+        self._last_save = time.monotonic()
+        now = time.time()
+        entries = {k: e for k, e in self._expand_entries.items() if e["expires"] > now}
+        try:
+            await asyncio.to_thread(self._write_expand_cache, entries)
+        except OSError as e:
+            logger.warning(f"Failed to persist query expansion cache: {e}")
+
     async def _expand_query(self, query: str) -> ToolResult:
+        await self._ensure_expand_cache()
+        key = self._expand_cache_key(query)
+        variants = cache.get(key)
+        if variants is not None:
+            self._stats["expand_hits"] += 1
+            return ToolResult(output=fast_json.dumps(variants).decode("utf-8"))
+        self._stats["expand_misses"] += 1
+
         prompt = f"""
         Generate 3 search query variants for the following topic to cover different angles (e.g., technical, general, news).
         Topic: "{query}"
@@ -148,7 +389,10 @@ class SearchTool(BaseTool):
         """
         try:
             response = await self.llm.ask([{"role": "user", "content": prompt}])
-            variants = [line.strip() for line in response.split("\n") if line.strip()]
-            return ToolResult(output=str(variants))
+            variants = list(_parse_variants(response))
+            cache.set(key, variants, ttl=EXPAND_CACHE_TTL)
+            self._expand_entries[key] = {"variants": variants, "expires": time.time() + EXPAND_CACHE_TTL}
+            self._schedule_expand_save()
+            return ToolResult(output=fast_json.dumps(variants).decode("utf-8"))
         except Exception as e:
             return ToolResult(error=f"Query expansion failed: {str(e)}")
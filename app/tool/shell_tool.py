@@ -1,18 +1,90 @@
 import asyncio
+import functools
 import os
+import re
+import shlex
+import stat
 import uuid
 import signal
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any
-from pydantic import BaseModel, Field, PrivateAttr
+from pydantic import Field, PrivateAttr
 
 from app.tool.base import BaseTool, ToolResult
 from app.sandbox.docker import DockerSandbox
 
-class ShellSession(BaseModel):
+# Local output is read in chunks and capped per stream: the first
+# OUTPUT_HEAD_BYTES and the last OUTPUT_TAIL_BYTES are kept, the middle dropped
+OUTPUT_CHUNK_SIZE = 64 * 1024
+OUTPUT_HEAD_BYTES = 1 << 20
+OUTPUT_TAIL_BYTES = 15 << 20
+# Grace period between SIGTERM and SIGKILL for a timed out command
+KILL_GRACE_SECONDS = 2
+# Number of validated cd targets remembered per session
+RECENT_DIRS_SIZE = 16
+# Sessions kept at once; the least recently used idle one is dropped past this
+MAX_SESSIONS = 64
+
+# docker-py calls block, so sandbox commands run on this pool; sessions proceed
+# in parallel without stalling the event loop, and Docker sees at most 8 at once
+_DOCKER_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="shell-docker")
+
+
+async def _run_blocking(func, *args, **kwargs):
+    return await asyncio.get_running_loop().run_in_executor(
+        _DOCKER_POOL, functools.partial(func, *args, **kwargs)
+    )
+
+
+async def _read_bounded(stream: asyncio.StreamReader) -> bytes:
+    """Read a stream to EOF, keeping only its head and tail."""
+    head = bytearray()
+    tail: deque = deque()
+    tail_bytes = 0
+    dropped = 0
+    while chunk := await stream.read(OUTPUT_CHUNK_SIZE):
+        if len(head) < OUTPUT_HEAD_BYTES:
+            take = OUTPUT_HEAD_BYTES - len(head)
+            head += chunk[:take]
+            chunk = chunk[take:]
+            if not chunk:
+                continue
+        tail.append(chunk)
+        tail_bytes += len(chunk)
+        while tail_bytes - len(tail[0]) >= OUTPUT_TAIL_BYTES:
+            dropped += len(tail[0])
+            tail_bytes -= len(tail.popleft())
+    if dropped:
+        head += f"\n... [{dropped} bytes truncated] ...\n".encode()
+    return bytes(head) + b"".join(tail)
+
+
+@functools.lru_cache(maxsize=8)
+def _blacklist_pattern(entries: tuple) -> "re.Pattern[str]":
+    """Compile blacklist entries into one anchored regex over the command prefix.
+
+    Multi-word entries such as "rm -rf /" match with any whitespace between
+    words, and each entry must end at whitespace or the end of the command.
+    """
+    alternatives = "|".join(r"\s+".join(map(re.escape, entry.split())) for entry in entries)
+    return re.compile(rf"\s*({alternatives})(?=\s|$)")
+
+
+@dataclass(slots=True)
+class ShellSession:
+    """Per-session shell state. Internal only, so a plain slotted dataclass rather than a model."""
     id: str
     current_dir: str
-    env_vars: Dict[str, str] = Field(default_factory=dict)
-    history: List[str] = Field(default_factory=list)
+    env_vars: Dict[str, str] = field(default_factory=dict)
+    history: List[str] = field(default_factory=list)
+    # Recently validated cd targets, most recent last
+    recent_dirs: "OrderedDict[str, None]" = field(default_factory=OrderedDict, repr=False)
+    # Long-lived bash process in the sandbox, opened on first command
+    shell: Optional[Any] = field(default=None, repr=False)
+    # Serializes commands on the shell now that they run off the event loop
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
     # Background processes tracking omitted for Docker simplicity for now
     # Ideally we'd map PID to container exec ID, but Docker exec IDs aren't PIDs.
 
@@ -56,6 +128,16 @@ class ShellTool(BaseTool):
 
     sandbox: Optional[Any] = Field(default=None, exclude=True)
 
+    # Working directory for new local sessions, looked up once; the tool never chdirs itself
+    _default_cwd: Optional[str] = PrivateAttr(default=None)
+
+    def _initial_dir(self) -> str:
+        if self.sandbox:
+            return "/workspace"
+        if self._default_cwd is None:
+            self._default_cwd = os.getcwd()
+        return self._default_cwd
+
     async def execute(
         self,
         action: str = "exec",
@@ -64,75 +146,91 @@ class ShellTool(BaseTool):
         timeout: int = 60,
         **kwargs
     ) -> ToolResult:
-        if not session_id:
+        implicit = not session_id
+        if implicit:
             session_id = await self.create_session()
 
         if session_id not in self.sessions:
-             self.sessions[session_id] = ShellSession(id=session_id, current_dir="/workspace" if self.sandbox else os.getcwd())
+            await self._add_session(session_id)
+        else:
+            self.sessions[session_id] = self.sessions.pop(session_id)
 
         session = self.sessions[session_id]
 
         if action == "exec":
             if not command:
                 return ToolResult(error="Command required for 'exec' action.")
-            return await self._exec(session, command, timeout)
+            try:
+                return await self._exec(session, command, timeout)
+            finally:
+                # A session made for one call keeps its state in case its ID is
+                # passed back, but not a sandbox shell nobody is likely to reuse
+                if implicit and session.shell is not None:
+                    await _run_blocking(self._close_shell, session)
         else:
              return ToolResult(error=f"Action {action} not fully supported in this version.")
 
     async def _exec(self, session: ShellSession, command: str, timeout: int) -> ToolResult:
         # Blacklist check
-        cmd_base = command.split()[0] if command else ""
-        if cmd_base in self.blacklist:
-            return ToolResult(error=f"Command '{cmd_base}' is blacklisted.")
+        match = _blacklist_pattern(tuple(self.blacklist)).match(command)
+        if match:
+            return ToolResult(error=f"Command '{match.group(1)}' is blacklisted.")
 
         session.history.append(command)
 
         # Handle 'cd' specially
         if command.startswith("cd "):
-            path = command.split(" ", 1)[1].strip()
-            # Resolve path (simplistic resolution)
-            if path.startswith("/"):
-                new_dir = path
-            else:
-                new_dir = os.path.join(session.current_dir, path)
-
-            # Verify directory exists?
-            # In Docker, we can run 'test -d'
-            if self.sandbox:
-                exit_code, _ = self.sandbox.exec_run(f"test -d {new_dir}")
-                if exit_code == 0:
-                    session.current_dir = new_dir
-                    return ToolResult(output=f"Changed directory to {new_dir}", system=f"Session ID: {session.id}")
-                else:
-                    return ToolResult(error=f"Directory not found: {path}")
+            path = command[3:].strip()
+            # Resolve path; normpath folds "." and ".." so equal paths share one cache entry
+            new_dir = os.path.normpath(os.path.join(session.current_dir, path))
+
+            # Directories validated recently in this session skip the check entirely
+            if new_dir in session.recent_dirs:
+                session.recent_dirs.move_to_end(new_dir)
+                is_dir = True
+            elif self.sandbox:
+                # In Docker, we can run 'test -d'
+                exit_code, _ = await _run_blocking(self.sandbox.exec_run, f"test -d {shlex.quote(new_dir)}")
+                is_dir = exit_code == 0
             else:
-                 # Local
-                 if os.path.exists(new_dir) and os.path.isdir(new_dir):
-                    session.current_dir = new_dir
-                    return ToolResult(output=f"Changed directory to {new_dir}", system=f"Session ID: {session.id}")
-                 else:
-                    return ToolResult(error=f"Directory not found: {path}")
+                # Local: one stat call answers both "exists" and "is a directory"
+                try:
+                    is_dir = stat.S_ISDIR(os.stat(new_dir).st_mode)
+                except OSError:
+                    is_dir = False
+
+            if not is_dir:
+                return ToolResult(error=f"Directory not found: {path}")
+
+            session.recent_dirs[new_dir] = None
+            if len(session.recent_dirs) > RECENT_DIRS_SIZE:
+                session.recent_dirs.popitem(last=False)
+            session.current_dir = new_dir
+            return ToolResult(output=f"Changed directory to {new_dir}", system=f"Session ID: {session.id}")
 
         # Execute
         if self.sandbox:
-            # Docker Execution
-            # We chain env vars setting if needed?
-            # Docker exec_run accepts environment dict.
-            # But updating env vars (export X=Y) is tricky in one-off exec.
-            # We can capture exports by running command and printing env?
-            # For now, simplistic execution.
-
-            try:
-                exit_code, output = self.sandbox.exec_run(
-                    command,
-                    workdir=session.current_dir,
-                    timeout=timeout
-                )
-                if exit_code != 0:
-                    return ToolResult(error=f"Command failed with code {exit_code}:\n{output}", system=f"Session ID: {session.id}")
-                return ToolResult(output=output, system=f"Session ID: {session.id}")
-            except Exception as e:
-                return ToolResult(error=f"Docker execution error: {str(e)}")
+            # Docker Execution: commands go to the session's persistent shell, so
+            # each one skips a docker exec round trip and exported variables persist
+            async with session.lock:
+                try:
+                    if session.shell is None or not session.shell.alive:
+                        session.shell = await _run_blocking(self.sandbox.open_shell, session.current_dir)
+                    exit_code, output = await _run_blocking(
+                        session.shell.run,
+                        command,
+                        workdir=session.current_dir,
+                        timeout=timeout
+                    )
+                except TimeoutError:
+                    await _run_blocking(self._close_shell, session)
+                    return ToolResult(error="Command timed out.")
+                except Exception as e:
+                    await _run_blocking(self._close_shell, session)
+                    return ToolResult(error=f"Docker execution error: {str(e)}")
+            if exit_code != 0:
+                return ToolResult(error=f"Command failed with code {exit_code}:\n{output}", system=f"Session ID: {session.id}")
+            return ToolResult(output=output, system=f"Session ID: {session.id}")
 
         else:
             # Local Execution (Legacy fallback)
@@ -142,24 +240,81 @@ class ShellTool(BaseTool):
                     cwd=session.current_dir,
                     stdout=asyncio.subprocess.PIPE,
                     stderr=asyncio.subprocess.PIPE,
-                    preexec_fn=os.setsid
+                    start_new_session=True
                 )
+                # Drain both pipes as output arrives instead of buffering it all with communicate()
+                readers = [
+                    asyncio.create_task(_read_bounded(process.stdout)),
+                    asyncio.create_task(_read_bounded(process.stderr)),
+                ]
                 try:
-                    stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
-                    output = stdout.decode().strip()
-                    error = stderr.decode().strip()
+                    # asyncio.timeout cancels the gather in place, without wait_for's extra task
+                    async with asyncio.timeout(timeout):
+                        stdout, stderr, _ = await asyncio.gather(*readers, process.wait())
+                    # Strip as bytes and skip decoding empty streams; binary output is replaced, not fatal
+                    stdout, stderr = stdout.strip(), stderr.strip()
+                    output = stdout.decode("utf-8", "replace") if stdout else ""
+                    error = stderr.decode("utf-8", "replace") if stderr else ""
                     full_output = output + (f"\nSTDERR:\n{error}" if error else "")
 
                     if process.returncode != 0:
                         return ToolResult(error=f"Command failed:\n{full_output}", system=f"Session ID: {session.id}")
                     return ToolResult(output=full_output, system=f"Session ID: {session.id}")
-                except asyncio.TimeoutError:
-                    os.killpg(os.getpgid(process.pid), signal.SIGTERM)
+                except TimeoutError:
+                    await self._kill_process_group(process)
                     return ToolResult(error="Command timed out.")
+                finally:
+                    for reader in readers:
+                        reader.cancel()
             except Exception as e:
                 return ToolResult(error=f"Local execution error: {str(e)}")
 
+    @staticmethod
+    async def _kill_process_group(process: asyncio.subprocess.Process) -> None:
+        """SIGTERM the command's process group, then SIGKILL it if it lingers."""
+        try:
+            pgid = os.getpgid(process.pid)
+            os.killpg(pgid, signal.SIGTERM)
+            try:
+                await asyncio.wait_for(process.wait(), timeout=KILL_GRACE_SECONDS)
+            except asyncio.TimeoutError:
+                os.killpg(pgid, signal.SIGKILL)
+                await process.wait()
+        except ProcessLookupError:
+            pass
+
+    @staticmethod
+    def _close_shell(session: ShellSession) -> None:
+        if session.shell is not None:
+            try:
+                session.shell.close()
+            except Exception:
+                pass
+            session.shell = None
+
+    async def cleanup(self):
+        """Close every session's sandbox shell."""
+        await asyncio.gather(*(
+            _run_blocking(self._close_shell, session)
+            for session in self.sessions.values()
+            if session.shell is not None
+        ))
+
+    async def reset(self) -> None:
+        """Close every session's sandbox shell and forget all session state."""
+        await self.cleanup()
+        self.sessions.clear()
+
     async def create_session(self) -> str:
         session_id = str(uuid.uuid4())
-        self.sessions[session_id] = ShellSession(id=session_id, current_dir="/workspace" if self.sandbox else os.getcwd())
+        await self._add_session(session_id)
         return session_id
+
+    async def _add_session(self, session_id: str) -> None:
+        """Register a new session, dropping the least recently used idle ones past MAX_SESSIONS."""
+        self.sessions[session_id] = ShellSession(id=session_id, current_dir=self._initial_dir())
+        idle = [s for s in self.sessions.values() if not s.lock.locked() and s.id != session_id]
+        for session in idle[: max(0, len(self.sessions) - MAX_SESSIONS)]:
+            del self.sessions[session.id]
+            if session.shell is not None:
+                await _run_blocking(self._close_shell, session)
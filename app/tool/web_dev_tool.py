@@ -1,12 +1,70 @@
 import asyncio
 import os
 import shutil
-from typing import Optional
+import uuid
+from typing import Dict, Optional, Set, Tuple
 
 from app.logger import logger
 from app.tool.base import BaseTool, ToolResult
 
 
+_SERVER_JS = """
+const express = require('express');
+const app = express();
+const port = 3000;
+app.get('/', (req, res) => res.send('Hello World!'));
+app.listen(port, () => console.log(`App listening on port ${port}!`));
+"""
+
+# Scaffold -> (shell commands run in order in the project dir, template files to write)
+_SCAFFOLDS: Dict[str, Tuple[Tuple[str, ...], Dict[str, str]]] = {
+    # React + TS
+    "web-static": (("npm create vite@latest . -- --template react-ts", "npm install"), {}),
+    # Custom setup
+    "web-db-user": (("npm init -y && npm install express sqlite3",), {"server.js": _SERVER_JS}),
+    # PWA via Vite
+    "mobile-app": (("npm create vite@latest . -- --template react-ts", "npm install"), {}),
+}
+
+# Background deletions of failed project trees, kept referenced until they finish
+_trash_tasks: Set[asyncio.Task] = set()
+
+
+def _discard_tree(path: str) -> None:
+    """Move ``path`` out of the way and delete it on a worker thread.
+
+    The rename is atomic, so the path is free again immediately, while the
+    slow walk over node_modules happens off the event loop.
+    """
+    trash = f"{path}.trash.{uuid.uuid4().hex}"
+    os.rename(path, trash)
+    task = asyncio.create_task(asyncio.to_thread(shutil.rmtree, trash, ignore_errors=True))
+    _trash_tasks.add(task)
+    task.add_done_callback(_trash_tasks.discard)
+
+
+def _write_files(directory: str, files: Dict[str, str]) -> None:
+    for name, content in files.items():
+        with open(os.path.join(directory, name), "w") as f:
+            f.write(content)
+
+
+async def _run_commands(commands: Tuple[str, ...], cwd: str) -> None:
+    """Run each command to completion before starting the next.
+
+    A non-zero exit does not stop the sequence, matching how the scaffolds
+    were always run: later steps may still produce a usable project.
+    """
+    for cmd in commands:
+        process = await asyncio.create_subprocess_shell(
+            cmd,
+            cwd=cwd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        await process.communicate()
+
+
 class WebDevTool(BaseTool):
     name: str = "web_dev_tool"
     description: str = "Web development tool for initializing projects and exposing services."
@@ -66,61 +124,22 @@ class WebDevTool(BaseTool):
 
         os.makedirs(full_path)
 
-        cmd = ""
         # Using npm create vite (which requires user interaction) is tricky.
         # We use template flags.
-
-        if scaffold == "web-static":
-            # React + TS
-            cmd = "npm create vite@latest . -- --template react-ts"
-        elif scaffold == "web-db-user":
-             # Custom setup
-             cmd = "npm init -y && npm install express sqlite3"
-             # Create server.js
-             server_js = """
-const express = require('express');
-const app = express();
-const port = 3000;
-app.get('/', (req, res) => res.send('Hello World!'));
-app.listen(port, () => console.log(`App listening on port ${port}!`));
-"""
-             with open(os.path.join(full_path, "server.js"), "w") as f:
-                 f.write(server_js)
-
-        elif scaffold == "mobile-app":
-             # PWA via Vite
-             cmd = "npm create vite@latest . -- --template react-ts"
+        commands, files = _SCAFFOLDS.get(scaffold, ((), {}))
 
         try:
-            if cmd:
-                process = await asyncio.create_subprocess_shell(
-                    cmd,
-                    cwd=full_path,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                stdout, stderr = await process.communicate()
-
-                if process.returncode != 0:
-                     # If web-db-user command fails (e.g. creating server.js succeeded but npm init failed?)
-                     # Actually the server.js creation is synchronous before cmd for web-db-user.
-                     pass
-
-                if scaffold in ["web-static", "mobile-app"]:
-                     # npm install
-                     process_install = await asyncio.create_subprocess_shell(
-                        "npm install",
-                        cwd=full_path,
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE
-                    )
-                     await process_install.communicate()
-
+            # Template files don't depend on npm, so they are written while the
+            # commands run; the commands themselves stay in order (create before install)
+            await asyncio.gather(
+                asyncio.to_thread(_write_files, full_path, files),
+                _run_commands(commands, full_path),
+            )
             return ToolResult(output=f"Project initialized at {full_path} with scaffold {scaffold}")
         except Exception as e:
             # Cleanup
             if os.path.exists(full_path):
-                shutil.rmtree(full_path)
+                _discard_tree(full_path)
             return ToolResult(error=f"Init failed: {str(e)}")
 
     async def _expose(self, port: int) -> ToolResult:
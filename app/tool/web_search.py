@@ -1,4 +1,5 @@
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 
 import requests
@@ -19,6 +20,11 @@ from app.tool.search import (
 from app.tool.search.base import SearchItem
 
 
+# Blocking search-engine and page-fetch calls run on their own pool so they
+# don't queue behind (or starve) other users of the loop's default executor
+_SEARCH_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="web-search")
+
+
 class SearchResult(BaseModel):
     """Represents a single search result returned by a search engine."""
 
@@ -124,8 +130,8 @@ class WebContentFetcher:
 
         try:
             # Use asyncio to run requests in a thread pool
-            response = await asyncio.get_event_loop().run_in_executor(
-                None, lambda: requests.get(url, headers=headers, timeout=timeout)
+            response = await asyncio.get_running_loop().run_in_executor(
+                _SEARCH_POOL, lambda: requests.get(url, headers=headers, timeout=timeout)
             )
 
             if response.status_code != 200:
@@ -395,8 +401,8 @@ class WebSearch(BaseTool):
         search_params: Dict[str, Any],
     ) -> List[SearchItem]:
         """Execute search with the given engine and parameters."""
-        return await asyncio.get_event_loop().run_in_executor(
-            None,
+        return await asyncio.get_running_loop().run_in_executor(
+            _SEARCH_POOL,
             lambda: list(
                 engine.perform_search(
                     query,
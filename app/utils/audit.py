@@ -1,24 +1,77 @@
-import json
+import atexit
+import os
+import queue
+import secrets
+import threading
 import time
-import uuid
-from datetime import datetime
+import weakref
 from typing import Any, Dict, Optional
 from pathlib import Path
 
+from app.utils import fast_json
+
+
+# Writer batching: entries are written together once this many are queued or
+# the window has passed since the first one, whichever comes first
+BATCH_SIZE = 64
+BATCH_WINDOW_SECONDS = 0.01
+WRITE_BUFFER_BYTES = 1 << 20
+# The file is flushed after every batch but only fsynced this often
+FSYNC_INTERVAL_SECONDS = 1.0
+# The writer thread exits and closes the file after this long without events
+WRITER_IDLE_SECONDS = 5.0
+FLUSH_TIMEOUT_SECONDS = 5.0
+
+# Queued by close() to make the writer thread write what it has and exit
+_CLOSE = object()
+
+# Live loggers, flushed at interpreter exit
+_loggers: "weakref.WeakSet[AuditLogger]" = weakref.WeakSet()
+
+
+def _flush_all() -> None:
+    for audit_logger in list(_loggers):
+        audit_logger.flush()
+
+
+atexit.register(_flush_all)
+
+
 class AuditLogger:
     """
     Implements structured audit logging for agent actions.
     Chapter 35: Audit Log and Observability
+
+    Events are queued and written in batches by a background thread through a
+    persistent file handle. Call flush() to wait until queued events are on disk.
     """
 
     def __init__(self, log_path: str = "audit.log"):
         self.log_path = Path(log_path)
         self._ensure_log_file()
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._fh = None
+        self._last_fsync = 0.0
+        # (epoch second, its "YYYY-MM-DDTHH:MM:SS" form), kept as one tuple so threads never see a torn pair
+        self._ts_cache = (-1, "")
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        _loggers.add(self)
 
     def _ensure_log_file(self):
         if not self.log_path.exists():
             self.log_path.touch()
 
+    def _timestamp(self) -> str:
+        """UTC ISO-8601 timestamp with microseconds; the seconds part is formatted once per second."""
+        us = time.time_ns() // 1000
+        sec, frac = divmod(us, 1_000_000)
+        cached_sec, prefix = self._ts_cache
+        if sec != cached_sec:
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+            self._ts_cache = (sec, prefix)
+        return f"{prefix}.{frac:06d}Z"
+
     def log_event(
         self,
         event_type: str,
@@ -36,28 +89,130 @@ class AuditLogger:
         Logs an event to the audit log in JSON format.
         """
         entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": self._timestamp(),
             "event_type": event_type,
-            "task_id": task_id or str(uuid.uuid4()), # Default if not provided
-            "trace_id": trace_id or str(uuid.uuid4()), # Unique trace ID for request/session
-            "user_id": user_id,
-            "tool_name": tool_name,
-            "tool_args": tool_args,
-            "result_status": result_status,
-            "duration_ms": duration_ms,
-            "token_usage": token_usage,
-            "payload": payload
+            # Random 128-bit hex defaults, only generated when the caller passed none;
+            # token_hex skips building a UUID object on every event
+            "task_id": task_id or secrets.token_hex(16), # Default if not provided
+            "trace_id": trace_id or secrets.token_hex(16), # Unique trace ID for request/session
         }
+        # Only set the optional fields that are present, keeping the log clean
+        # without building a second filtered dict
+        if user_id is not None:
+            entry["user_id"] = user_id
+        if tool_name is not None:
+            entry["tool_name"] = tool_name
+        if tool_args is not None:
+            entry["tool_args"] = tool_args
+        if result_status is not None:
+            entry["result_status"] = result_status
+        if duration_ms is not None:
+            entry["duration_ms"] = duration_ms
+        if token_usage is not None:
+            entry["token_usage"] = token_usage
+        if payload is not None:
+            entry["payload"] = payload
 
-        # Filter out None values to keep log clean (optional, but good for size)
-        entry = {k: v for k, v in entry.items() if v is not None}
+        try:
+            line = fast_json.dumps(entry) + b"\n"
+        except Exception as e:
+            print(f"FAILED TO WRITE AUDIT LOG: {e}")
+            return
+        self._enqueue(line)
+
+    def flush(self):
+        """Block until every event queued so far has been written and fsynced."""
+        # The writer only exits once the queue is empty, so without one there is
+        # nothing to wait for; starting one from the atexit hook would also fail
+        if self._writer is None:
+            return
+        done = threading.Event()
+        self._enqueue(done)
+        done.wait(FLUSH_TIMEOUT_SECONDS)
+
+    def close(self):
+        """Write out queued events, close the file and stop the writer thread.
+
+        The logger stays usable: a later event reopens the file.
+        """
+        writer = self._writer
+        if writer is None:
+            return
+        self._queue.put(_CLOSE)
+        writer.join(FLUSH_TIMEOUT_SECONDS)
 
+    def _enqueue(self, item):
+        self._queue.put(item)
+        if self._writer is None:
+            with self._writer_lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._drain, name="audit-writer", daemon=True)
+                    self._writer.start()
+
+    def _drain(self):
+        """Writer loop: collect queued lines into batches and write each with one call."""
+        while True:
+            try:
+                item = self._queue.get(timeout=WRITER_IDLE_SECONDS)
+            except queue.Empty:
+                item = _CLOSE
+
+            batch, waiters = [], []
+            closing = False
+            deadline = time.monotonic() + BATCH_WINDOW_SECONDS
+            while True:
+                if item is _CLOSE:
+                    closing = True
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break
+                batch.append(item)
+                remaining = deadline - time.monotonic()
+                if len(batch) >= BATCH_SIZE or remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if batch or waiters or (closing and self._fh is not None):
+                self._write(batch, sync=bool(waiters) or closing)
+            for waiter in waiters:
+                waiter.set()
+
+            if closing:
+                # Exit only if nothing arrived meanwhile; _enqueue starts a new
+                # writer once it sees _writer cleared under the same lock
+                with self._writer_lock:
+                    if self._queue.empty():
+                        self._close_file()
+                        self._writer = None
+                        return
+
+    def _write(self, batch, sync: bool = False):
         try:
-            with open(self.log_path, "a") as f:
-                f.write(json.dumps(entry) + "\n")
+            if self._fh is None:
+                self._fh = open(self.log_path, "ab", buffering=WRITE_BUFFER_BYTES)
+            if batch:
+                self._fh.writelines(batch)
+                self._fh.flush()
+            now = time.monotonic()
+            if sync or now - self._last_fsync >= FSYNC_INTERVAL_SECONDS:
+                os.fsync(self._fh.fileno())
+                self._last_fsync = now
         except Exception as e:
             # Fallback to stderr if file write fails
             print(f"FAILED TO WRITE AUDIT LOG: {e}")
+            self._close_file()
+
+    def _close_file(self):
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            except Exception:
+                pass
+            self._fh = None
 
     def log_tool_call(self, task_id, user_id, tool_name, tool_args, trace_id=None):
         self.log_event("tool_call", task_id=task_id, trace_id=trace_id, user_id=user_id, tool_name=tool_name, tool_args=tool_args)
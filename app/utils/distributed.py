@@ -1,6 +1,27 @@
-from typing import Any, Optional, Dict
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Optional, Tuple
 import hashlib
 import json
+import time
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+
+# Entries kept per cache before the least recently used one is evicted
+CACHE_MAX_ENTRIES = 100_000
+
+
+@lru_cache(maxsize=4096)
+def semantic_key(query: str) -> str:
+    """Cache key for a query: a 128-bit XXH3 digest (BLAKE2b without xxhash), memoized so a get-then-set hashes once."""
+    if xxhash is not None:
+        return xxhash.xxh3_128_hexdigest(query.encode())
+    return hashlib.blake2b(query.encode(), digest_size=16).hexdigest()
+
 
 class Cache:
     """
@@ -8,24 +29,33 @@ class Cache:
     Ref: Chapter 13.4 of the Technical Bible.
     """
 
-    _store: Dict[str, Any] = {}
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        # key -> (monotonic expiry time, value), least recently used first
+        self._store: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
 
     def get(self, key: str) -> Optional[Any]:
-        return self._store.get(key)
+        item = self._store.get(key)
+        if item is None:
+            return None
+        if item[0] <= time.monotonic():
+            del self._store[key]
+            return None
+        self._store.move_to_end(key)
+        return item[1]
 
     def set(self, key: str, value: Any, ttl: int = 3600):
-        # TTL ignored for this mock implementation
-        self._store[key] = value
+        self._store[key] = (time.monotonic() + ttl, value)
+        self._store.move_to_end(key)
+        if len(self._store) > self.max_entries:
+            self._store.popitem(last=False)
 
     def semantic_get(self, query: str) -> Optional[str]:
         """Mock semantic search."""
-        # Simple hash for now
-        key = hashlib.md5(query.encode()).hexdigest()
-        return self.get(key)
+        return self.get(semantic_key(query))
 
     def semantic_set(self, query: str, response: str):
-        key = hashlib.md5(query.encode()).hexdigest()
-        self.set(key, response)
+        self.set(semantic_key(query), response)
 
 class Consensus:
     """
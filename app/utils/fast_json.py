@@ -0,0 +1,27 @@
+"""JSON helpers backed by orjson when available, falling back to the stdlib."""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.JSONDecodeError and json.JSONDecodeError both subclass ValueError
+JSONDecodeError = ValueError
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON document from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize ``obj`` to UTF-8 JSON bytes, optionally indented by two spaces."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(
+        obj, indent=2 if indent else None, ensure_ascii=False
+    ).encode("utf-8")
@@ -2,54 +2,105 @@ import re
 import hashlib
 from typing import Dict, Any, List
 
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# Regex patterns for common PII, tried in this order at each position
+PII_PATTERNS = {
+    "email": r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
+    "phone": r"(\+\d{1,3}[-.]?)?\(?\d{3}\)?[-.]?\d{3}[-.]?\d{4}",
+    "cpf": r"\d{3}\.\d{3}\.\d{3}-\d{2}", # Brazilian ID format example
+    "credit_card": r"\b(?:\d{4}[- ]?){3}\d{4}\b",
+    "api_key": r"(sk-[a-zA-Z0-9]{32,})|(ghp_[a-zA-Z0-9]{36})", # OpenAI, GitHub
+}
+
+
+def _build_pii_regex(patterns: Dict[str, str]) -> "re.Pattern":
+    """Combine the patterns into one alternation with a named group per label.
+
+    Compiled with RE2 when google-re2 is installed: it matches in linear time
+    without backtracking, which keeps large payloads cheap. Falls back to re.
+    """
+    expression = "|".join(f"(?P<{label}>{pattern})" for label, pattern in patterns.items())
+    if re2 is not None:
+        try:
+            return re2.compile(expression)
+        except re2.error:
+            pass
+    return re.compile(expression)
+
+
+# Compiled once at import: a single scan per string instead of one re.sub per pattern
+_PII_REGEX = _build_pii_regex(PII_PATTERNS)
+_REPLACEMENTS = {label: f"[REDACTED_{label.upper()}]" for label in PII_PATTERNS}
+
+
+# Cheap indicators checked before the full scan: emails need "@", API keys
+# have fixed prefixes, and phone, CPF and card numbers all hold ten or more digits
+_TEN_DIGITS = re.compile(r"(?:\D*\d){10}").match
+
+
+def _may_contain_pii(text: str) -> bool:
+    # Unrolled rather than any() over a tuple: this runs for every string leaf.
+    # match() is anchored and \D/\d are disjoint, so the digit check is a single linear pass
+    return "@" in text or "sk-" in text or "ghp_" in text or _TEN_DIGITS(text) is not None
+
+
+def _redact(match: "re.Match") -> str:
+    # Each pattern's own groups are nested inside its named group, so lastgroup is the label
+    return _REPLACEMENTS[match.lastgroup]
+
+
+def _sanitize_text(text: str) -> str:
+    if not text:
+        return ""
+    # Most payloads carry no PII at all; skip the regex scan for those
+    if not _may_contain_pii(text):
+        return text
+    return _PII_REGEX.sub(_redact, text)
+
+
+def _sanitize_dict(data: Dict[str, Any]) -> Dict[str, Any]:
+    # Hot loop over large payloads, so module-level functions rather than
+    # bound-method lookups on every node
+    new_data = {}
+    for k, v in data.items():
+        if isinstance(v, str):
+            new_data[k] = _sanitize_text(v)
+        elif isinstance(v, dict):
+            new_data[k] = _sanitize_dict(v)
+        elif isinstance(v, list):
+            new_data[k] = [_sanitize_text(i) if isinstance(i, str) else i for i in v]
+        else:
+            new_data[k] = v
+    return new_data
+
+
 class Sanitizer:
     """
     Handles PII redaction and data sanitization.
     Ref: Chapter 33 of the Technical Bible.
     """
 
-    # Regex patterns for common PII
-    PATTERNS = {
-        "email": r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
-        "phone": r"(\+\d{1,3}[-.]?)?\(?\d{3}\)?[-.]?\d{3}[-.]?\d{4}",
-        "cpf": r"\d{3}\.\d{3}\.\d{3}-\d{2}", # Brazilian ID format example
-        "credit_card": r"\b(?:\d{4}[- ]?){3}\d{4}\b",
-        "api_key": r"(sk-[a-zA-Z0-9]{32,})|(ghp_[a-zA-Z0-9]{36})", # OpenAI, GitHub
-    }
+    PATTERNS = PII_PATTERNS
 
     def sanitize_text(self, text: str) -> str:
         """Redact PII from text."""
-        if not text:
-            return ""
-
-        sanitized = text
-        for label, pattern in self.PATTERNS.items():
-            sanitized = re.sub(pattern, f"[REDACTED_{label.upper()}]", sanitized)
-
-        return sanitized
+        return _sanitize_text(text)
 
     def sanitize_dict(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Recursively sanitize dictionary values."""
-        new_data = {}
-        for k, v in data.items():
-            if isinstance(v, str):
-                new_data[k] = self.sanitize_text(v)
-            elif isinstance(v, dict):
-                new_data[k] = self.sanitize_dict(v)
-            elif isinstance(v, list):
-                new_data[k] = [self.sanitize_text(i) if isinstance(i, str) else i for i in v]
-            else:
-                new_data[k] = v
-        return new_data
+        return _sanitize_dict(data)
 
     @staticmethod
     def sanitize(data: Any) -> Any:
         """Static wrapper for convenience/compatibility."""
-        s = Sanitizer()
         if isinstance(data, dict):
-            return s.sanitize_dict(data)
+            return sanitizer.sanitize_dict(data)
         elif isinstance(data, str):
-            return s.sanitize_text(data)
+            return sanitizer.sanitize_text(data)
         return data
 
     @staticmethod
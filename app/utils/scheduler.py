@@ -1,16 +1,23 @@
 import asyncio
+import heapq
 import json
 import os
 import time
-from datetime import datetime
 from uuid import UUID
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 
 from app.logger import logger
-from app.tool.schedule_tool import ScheduleTool
+from app.tool.schedule_tool import ScheduleTool, croniter, next_cron_fire
 from app.agent.manus import Manus
 # We need a way to run the agent. Manus.run() is the entry point.
 
+# Longest the loop sleeps between checks, so tasks added by other processes are picked up
+POLL_INTERVAL_SECONDS = 10
+# Manus agents are pooled across task runs: this many are created up front and
+# the pool grows on demand up to the maximum number running at once
+POOL_MIN_AGENTS = 1
+POOL_MAX_AGENTS = 4
+
 class SchedulerService:
     """
     A simple scheduler service that checks for due tasks and executes them using the Manus agent.
@@ -21,91 +28,185 @@ class SchedulerService:
         self.schedule_file = schedule_file
         self.running = False
         self._tool = ScheduleTool() # To reuse loading logic
+        self._tool._schedule_file = schedule_file
+        # Min-heap of (due time, task_id) for active tasks, rebuilt whenever the
+        # task file changes so a tick only looks at tasks that are actually due
+        self._heap: List[Tuple[float, str]] = []
+        self._heap_stamp: Optional[tuple] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        # Idle agents ready for reuse, and how many exist in total
+        self._pool: "asyncio.Queue[Manus]" = asyncio.Queue()
+        self._pool_size = 0
+        # Agent runs still in progress
+        self._runs: set = set()
 
     async def start(self):
         """Start the scheduler loop."""
         self.running = True
+        self._stop_event = asyncio.Event()
         logger.info("Scheduler Service started.")
+        await self._warm_pool()
         while self.running:
             try:
                 await self.check_and_run_tasks()
             except Exception as e:
                 logger.error(f"Scheduler error: {e}")
-            await asyncio.sleep(10) # Check every 10 seconds
+            # Sleep until the next task is due, waking at once if stop() is called
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=self._sleep_interval())
+            except asyncio.TimeoutError:
+                pass
+        # Run updates are appended as patches; fold them into the snapshot on the way out
+        self._tool.compact()
+        await self._drain_pool()
 
     def stop(self):
         self.running = False
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    def _sleep_interval(self) -> float:
+        """Seconds until the next due task, capped at POLL_INTERVAL_SECONDS."""
+        if not self._heap:
+            return POLL_INTERVAL_SECONDS
+        return min(max(0.0, self._heap[0][0] - time.time()), POLL_INTERVAL_SECONDS)
+
+    @staticmethod
+    def _next_due(task: Dict[str, Any]) -> Optional[float]:
+        """Epoch time a task is next due, or None if it can never run."""
+        last_run = task.get("last_run")
+        if task["type"] == "interval":
+            return (last_run or 0) + task["interval"]
+        if task["type"] == "cron":
+            # next_fire is computed when the task is scheduled and after each run
+            if "next_fire" in task:
+                return task["next_fire"]
+            # Tasks saved before next_fire existed (or without croniter at schedule time)
+            if croniter is None:
+                logger.warning("croniter not installed. Cron tasks will not run.")
+                return None
+            if not last_run:
+                return 0.0
+            try:
+                return next_cron_fire(task["cron"], last_run)
+            except Exception as e:
+                logger.error(f"Error checking cron task {task.get('name')}: {e}")
+        return None
+
+    def _rebuild_heap(self, tasks: Dict[str, Any]) -> None:
+        self._heap = []
+        for task_id, task in tasks.items():
+            if task.get("status") != "active":
+                continue
+            due = self._next_due(task)
+            if due is not None:
+                self._heap.append((due, task_id))
+        heapq.heapify(self._heap)
+        self._heap_stamp = self._tool._tasks_stamp
 
     async def check_and_run_tasks(self):
         tasks = self._tool._load_tasks()
-        now = datetime.now()
+        if self._heap_stamp is None or self._tool._tasks_stamp != self._heap_stamp:
+            self._rebuild_heap(tasks)
+
+        # task_id -> fields changed by this tick, persisted as one log append
+        patches: Dict[str, Dict[str, Any]] = {}
+        now = time.time()
+        while self._heap and self._heap[0][0] <= now:
+            _, task_id = heapq.heappop(self._heap)
+            task = tasks.get(task_id)
+            if task is None or task.get("status") != "active":
+                continue
 
-        updated = False
-        for task_id, task in list(tasks.items()):
-            if task.get("status") != "active":
+            logger.info(f"Executing scheduled task: {task['name']}")
+
+            # Execute Task
+            # Runs in the background on a pooled agent so a slow task never blocks the tick
+            try:
+                # Inject Playbook if available (Chapter 30.4) - Not implemented yet
+                run = asyncio.create_task(self._run_agent_task(task["prompt"]))
+                self._runs.add(run)
+                run.add_done_callback(self._runs.discard)
+
+                # Update task state
+                fields = {"last_run": time.time()}
+                if task["type"] == "cron" and "next_fire" in task:
+                    fields["next_fire"] = next_cron_fire(task["cron"], fields["last_run"])
+                if not task.get("repeat", True):
+                    fields["status"] = "completed"
+                task.update(fields)
+                patches[task_id] = fields
+            except Exception as e:
+                logger.error(f"Failed to execute task {task['name']}: {e}")
+                # Retry on a later tick
+                heapq.heappush(self._heap, (now + POLL_INTERVAL_SECONDS, task_id))
                 continue
 
-            should_run = False
-            if task["type"] == "interval":
-                last_run = task.get("last_run", 0)
-                interval = task["interval"]
-                if time.time() - last_run >= interval:
-                    should_run = True
-
-            elif task["type"] == "cron":
-                # Basic cron check (simplified for now, ideally use a library like croniter)
-                # For this implementation, we will assume a simple check or use a library if available.
-                # Since we don't have croniter in requirements, we will implement a placeholder or simple interval fallback.
-                # In a real scenario, we would add croniter to requirements.
-                # Let's try to import croniter, if not, skip cron tasks with a warning.
-                try:
-                    from croniter import croniter
-                    cron = croniter(task["cron"], datetime.fromtimestamp(task.get("last_run", 0) or time.time()))
-                    # Check if next run time has passed
-                    # This logic is tricky without state.
-                    # Correct way: get next scheduled time from last_run. If it's in the past relative to now, run.
-
-                    last_run_dt = datetime.fromtimestamp(task.get("last_run", 0)) if task.get("last_run") else datetime.min
-                    iter = croniter(task["cron"], last_run_dt)
-                    next_run = iter.get_next(datetime)
-
-                    if next_run <= now:
-                        should_run = True
-                except ImportError:
-                    logger.warning("croniter not installed. Cron tasks will not run.")
-                except Exception as e:
-                    logger.error(f"Error checking cron task {task_id}: {e}")
-
-            if should_run:
-                logger.info(f"Executing scheduled task: {task['name']}")
-
-                # Execute Task
-                # We spawn a new agent instance
-                try:
-                    agent = await Manus.create()
-                    # Inject Playbook if available (Chapter 30.4) - Not implemented yet
-
-                    # Run the agent
-                    # We need to wrap this in a way that doesn't block the scheduler forever,
-                    # but for now we await it. Ideally, run in background task.
-                    asyncio.create_task(self._run_agent_task(agent, task["prompt"]))
-
-                    # Update task state
-                    task["last_run"] = time.time()
-                    if not task.get("repeat", True):
-                        task["status"] = "completed"
-                    updated = True
-                except Exception as e:
-                    logger.error(f"Failed to execute task {task['name']}: {e}")
-
-        if updated:
-            self._tool._save_tasks(tasks)
-
-    async def _run_agent_task(self, agent: Manus, prompt: str):
+            if task["status"] == "active":
+                due = self._next_due(task)
+                if due is not None:
+                    heapq.heappush(self._heap, (due, task_id))
+
+        if patches:
+            self._tool._patch_tasks(tasks, patches)
+            # Our own write changes the file stamp; the heap already reflects it
+            self._heap_stamp = self._tool._tasks_stamp
+
+    async def _warm_pool(self):
+        while self._pool_size < POOL_MIN_AGENTS:
+            try:
+                agent = await Manus.create()
+            except Exception as e:
+                logger.error(f"Failed to pre-create scheduler agent: {e}")
+                return
+            self._pool_size += 1
+            self._pool.put_nowait(agent)
+
+    async def _acquire_agent(self) -> Manus:
+        """Take an idle agent, creating one if the pool may still grow, else wait for one."""
+        if self._pool.empty() and self._pool_size < POOL_MAX_AGENTS:
+            self._pool_size += 1
+            try:
+                return await Manus.create()
+            except Exception:
+                self._pool_size -= 1
+                raise
+        return await self._pool.get()
+
+    async def _release_agent(self, agent: Manus):
+        try:
+            await agent.reset()
+        except Exception as e:
+            # Drop an agent that cannot be reset; a fresh one is created on demand
+            logger.error(f"Discarding scheduler agent that failed to reset: {e}")
+            self._pool_size -= 1
+            return
+        self._pool.put_nowait(agent)
+
+    async def _drain_pool(self):
+        """Wait for running tasks, then clean up the pooled agents."""
+        if self._runs:
+            await asyncio.gather(*self._runs, return_exceptions=True)
+        while not self._pool.empty():
+            agent = self._pool.get_nowait()
+            self._pool_size -= 1
+            try:
+                await agent.cleanup()
+            except Exception as e:
+                logger.error(f"Error cleaning up scheduler agent: {e}")
+
+    async def _run_agent_task(self, prompt: str):
+        try:
+            agent = await self._acquire_agent()
+        except Exception as e:
+            logger.error(f"Failed to create agent for scheduled task: {e}")
+            return
         try:
              await agent.run(prompt)
         except Exception as e:
              logger.error(f"Agent execution failed for scheduled task: {e}")
+        finally:
+            await self._release_agent(agent)
 
 if __name__ == "__main__":
     # Standalone runner
@@ -5,41 +5,32 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app.memory.semantic import SemanticMemory
+from app.utils import fast_json
 
-def seed():
+# Knowledge base articles, one JSON object per line with title, content and metadata
+SEED_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "kb_seed.jsonl")
+
+def load_articles(path: str = SEED_FILE):
+    """Yield articles from a JSONL file, one line at a time."""
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield fast_json.loads(line)
+
+def seed(path: str = SEED_FILE):
     print("Seeding memory...")
-    memory = SemanticMemory()
-
-    articles = [
-        {
-            "title": "Reset Password",
-            "content": "To reset your password, go to Settings > Account > Security and click 'Reset Password'. You will receive an email with a link.",
-            "metadata": {"category": "account", "id": "KB001"}
-        },
-        {
-            "title": "API Rate Limits",
-            "content": "The API rate limit is 100 requests per minute for free tier and 1000 for pro tier. Exceeding this will result in a 429 error.",
-            "metadata": {"category": "api", "id": "KB002"}
-        },
-        {
-            "title": "Billing Issues",
-            "content": "If you are charged incorrectly, please contact support@example.com with your invoice number. Refunds are processed within 5-7 business days.",
-            "metadata": {"category": "billing", "id": "KB003"}
-        },
-         {
-            "title": "Python SDK Installation",
-            "content": "To install the Python SDK, run `pip install myapp-sdk`. Requires Python 3.8 or higher.",
-            "metadata": {"category": "dev", "id": "KB004"}
-        }
-    ]
+    memory = SemanticMemory.get_default()
+
+    articles = list(load_articles(path))
 
     for article in articles:
         print(f"Indexing: {article['title']}")
-        memory.index_document(
-            text=f"Title: {article['title']}\nContent: {article['content']}",
-            metadata=article['metadata'],
-            source="knowledge_base"
-        )
+    # One embedding batch and one write for the whole set
+    memory.index_documents(
+        texts=[f"Title: {article['title']}\nContent: {article['content']}" for article in articles],
+        metadatas=[article['metadata'] for article in articles],
+        source="knowledge_base"
+    )
 
     print("Memory seeding complete.")
 
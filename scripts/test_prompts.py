@@ -2,7 +2,7 @@
 import asyncio
 import sys
 import os
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 # Mock modules for standalone execution
 sys.modules["browser_use"] = MagicMock()
@@ -23,6 +23,22 @@ except ImportError:
     from app.agent.toolcall import ToolCallAgent
     from app.llm import LLM
 
+class _FakeLLM(LLM):
+    """LLM stand-in exposing only the methods the agent calls.
+
+    Cheaper than MagicMock(spec=LLM), which introspects the whole class on
+    construction; subclassing keeps the agent's LLM type check happy while
+    skipping LLM's client setup and per-config instance cache.
+    """
+
+    def __new__(cls):
+        return object.__new__(cls)
+
+    def __init__(self):
+        self.ask = AsyncMock()
+        self.ask_tool = AsyncMock()
+
+
 class PromptRegressionTest:
     """
     Chapter 37: Prompt Regression Testing
@@ -34,52 +50,66 @@ class PromptRegressionTest:
             "id": "task_001",
             "prompt": "List files in current directory",
             "expected_tool": "shell",
-            "expected_args_contain": "ls"
+            "expected_args_contain": "ls",
+            # Tool call the mocked LLM proposes for this case
+            "mock_tool_call": ("shell", '{"command": "ls -la"}'),
         },
         {
             "id": "task_002",
             "prompt": "Search for 'Manus Agent'",
             "expected_tool": "search_tool",
-            "expected_args_contain": "Manus Agent"
+            "expected_args_contain": "Manus Agent",
+            "mock_tool_call": ("search_tool", '{"query": "Manus Agent"}'),
         }
     ]
 
+    # Cases run concurrently, at most this many at a time to respect LLM rate limits
+    MAX_CONCURRENT = 4
+
     def __init__(self):
-        # We use a real LLM or a sophisticated Mock for regression
-        # Here we mock for demonstration
-        self.llm = MagicMock(spec=LLM)
-        self.agent = ToolCallAgent(llm=self.llm)
+        self._semaphore = asyncio.Semaphore(self.MAX_CONCURRENT)
+        # Mock responses are built once per case, keyed by case id, instead of
+        # matching prompt substrings on every run
+        self._responses = {case["id"]: self._build_response(case) for case in self.GOLDEN_SET}
+
+    @staticmethod
+    def _build_response(case):
+        mock_response = MagicMock()
+        mock_response.content = "I will use the tool."
+        mock_response.tool_calls = []
+        if "mock_tool_call" in case:
+            name, arguments = case["mock_tool_call"]
+            mock_tool_call = MagicMock()
+            mock_tool_call.function.name = name
+            mock_tool_call.function.arguments = arguments
+            mock_response.tool_calls = [mock_tool_call]
+        return mock_response
 
     async def run_test(self, case):
         print(f"🧪 Testing Case {case['id']}: {case['prompt']}")
 
+        # We use a real LLM or a sophisticated Mock for regression
+        # Here we mock for demonstration. Each case gets its own LLM and agent
+        # so concurrent cases don't share state.
+        llm = _FakeLLM()
+        agent = ToolCallAgent(llm=llm)
+
         # Simulate LLM response based on prompt
         # In a real regression test, this would call the actual LLM with the prompt
-        mock_response = MagicMock()
-        mock_response.content = "I will use the tool."
-
-        if "List files" in case['prompt']:
-            mock_tool_call = MagicMock()
-            mock_tool_call.function.name = "shell"
-            mock_tool_call.function.arguments = '{"command": "ls -la"}'
-            mock_response.tool_calls = [mock_tool_call]
-        elif "Search" in case['prompt']:
-            mock_tool_call = MagicMock()
-            mock_tool_call.function.name = "search_tool"
-            mock_tool_call.function.arguments = '{"query": "Manus Agent"}'
-            mock_response.tool_calls = [mock_tool_call]
+        mock_response = self._responses[case['id']]
 
-        self.llm.ask_tool.return_value = mock_response
+        llm.ask_tool.return_value = mock_response
 
         # Inject prompt
-        await self.agent.run(case['prompt'])
+        async with self._semaphore:
+            await agent.run(case['prompt'])
 
         # Verify
         # This logic is simplified; in real Agent, run() executes tools.
         # We check if the expected tool was selected.
         # Since we mocked execution, we check tool_calls in agent state or LLM call.
 
-        last_call = self.llm.ask_tool.call_args
+        last_call = llm.ask_tool.call_args
         if not last_call:
             print(f"❌ Failed: LLM was not called")
             return False
@@ -107,10 +137,13 @@ class PromptRegressionTest:
         return True
 
     async def run_all(self):
-        passed = 0
-        for case in self.GOLDEN_SET:
-            if await self.run_test(case):
-                passed += 1
+        results = await asyncio.gather(
+            *(self.run_test(case) for case in self.GOLDEN_SET), return_exceptions=True
+        )
+        for case, result in zip(self.GOLDEN_SET, results):
+            if isinstance(result, Exception):
+                print(f"❌ Case {case['id']} raised: {result}")
+        passed = sum(1 for result in results if result is True)
 
         print(f"\n📊 Result: {passed}/{len(self.GOLDEN_SET)} passed.")
         return passed == len(self.GOLDEN_SET)
@@ -0,0 +1,152 @@
+"""Tests for SandboxShell and DockerSandbox.exec_stdin, run against local processes instead of a container."""
+
+import shlex
+import socket
+import struct
+import subprocess
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.sandbox.docker import DockerSandbox, SandboxShell
+
+
+class LocalExecAPI:
+    """Stands in for docker's APIClient exec calls.
+
+    Each exec runs as a local process whose stdout/stderr are sent over a
+    socket in docker's multiplexed frame format.
+    """
+
+    def __init__(self):
+        self.execs = {}
+
+    def exec_create(self, container_id, cmd, stdin=False, workdir=None):
+        proc = subprocess.Popen(
+            cmd, cwd=workdir, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        ours, theirs = socket.socketpair()
+        send_lock = threading.Lock()
+
+        def pump_in():
+            while data := theirs.recv(65536):
+                try:
+                    proc.stdin.write(data)
+                    proc.stdin.flush()
+                except (BrokenPipeError, ValueError):
+                    return
+            # The client half-closed or hung up: the process sees EOF
+            try:
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+
+        def pump_out(pipe, stream):
+            while data := pipe.read1(65536):
+                with send_lock:
+                    theirs.sendall(struct.pack(">BxxxL", stream, len(data)) + data)
+
+        readers = [
+            threading.Thread(target=pump_out, args=(proc.stdout, 1), daemon=True),
+            threading.Thread(target=pump_out, args=(proc.stderr, 2), daemon=True),
+        ]
+        for t in readers:
+            t.start()
+        threading.Thread(target=pump_in, daemon=True).start()
+
+        def close_when_done():
+            for t in readers:
+                t.join()
+            theirs.shutdown(socket.SHUT_WR)
+
+        threading.Thread(target=close_when_done, daemon=True).start()
+        exec_id = str(len(self.execs))
+        self.execs[exec_id] = (proc, ours)
+        return {"Id": exec_id}
+
+    def exec_start(self, exec_id, socket=False):
+        return self.execs[exec_id][1]
+
+    def exec_inspect(self, exec_id):
+        return {"ExitCode": self.execs[exec_id][0].wait()}
+
+
+class LocalSandbox:
+    def __init__(self, working_dir):
+        self.client = SimpleNamespace(api=LocalExecAPI())
+        self.container = SimpleNamespace(id="local")
+        self.working_dir = working_dir
+
+    def exec_run(self, cmd, workdir=None, timeout=None):
+        result = subprocess.run(shlex.split(cmd), capture_output=True, text=True)
+        return result.returncode, result.stdout
+
+
+class LocalDockerSandbox(LocalSandbox, DockerSandbox):
+    """DockerSandbox with its exec calls served by LocalExecAPI."""
+
+
+@pytest.fixture
+def shell(tmp_path):
+    shell = SandboxShell(LocalSandbox(str(tmp_path)), str(tmp_path))
+    yield shell
+    shell.close()
+
+
+def test_run_returns_output_and_exit_code(shell, tmp_path):
+    assert shell.pid is not None
+    assert shell.run("echo hello; printf 'no newline'") == (0, "hello\nno newline")
+    assert shell.run("echo oops >&2; exit_code() { return 3; }; exit_code") == (3, "\nSTDERR: oops\n")
+    assert shell.run("pwd", workdir=str(tmp_path)) == (0, f"{tmp_path}\n")
+
+
+def test_state_persists_between_commands(shell):
+    shell.run("export GREETING=hi")
+    assert shell.run("echo $GREETING") == (0, "hi\n")
+
+
+def test_malformed_command_does_not_hang(shell):
+    exit_code, output = shell.run("echo 'unterminated", timeout=5)
+    assert exit_code != 0
+    assert shell.run("echo still alive", timeout=5) == (0, "still alive\n")
+
+
+def test_large_output(shell):
+    exit_code, output = shell.run("head -c 3000000 /dev/zero | tr '\\0' x", timeout=10)
+    assert exit_code == 0
+    assert output == "x" * 3_000_000
+
+
+def test_timeout_then_close_kills_command(shell):
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        shell.run("sleep 30", timeout=0.5)
+    assert time.monotonic() - start < 5
+    proc, _ = shell._api.execs[shell._exec_id]
+    shell.close()
+    assert not shell.alive
+    # The whole process group is killed, so the shell exits even mid-command
+    assert proc.wait(timeout=5) == -9
+
+
+def test_exit_closes_shell(shell):
+    exit_code, _ = shell.run("exit 4", timeout=5)
+    assert exit_code == 4
+    assert not shell.alive
+
+
+def test_exec_stdin_streams_input(tmp_path):
+    sandbox = LocalDockerSandbox(str(tmp_path))
+    assert sandbox.exec_stdin("sh -", "cat; echo oops >&2; exit 2", timeout=5) == (2, "\nSTDERR: oops\n")
+    assert sandbox.exec_stdin("python3 -", "print(6 * 7)", timeout=5) == (0, "42\n")
+
+
+def test_exec_stdin_timeout_kills_command(tmp_path):
+    sandbox = LocalDockerSandbox(str(tmp_path))
+    start = time.monotonic()
+    assert sandbox.exec_stdin("python3 -", "while True: pass", timeout=0.5) == (-1, "Timeout after 0.5s")
+    assert time.monotonic() - start < 5
+    proc, _ = sandbox.client.api.execs["0"]
+    assert proc.wait(timeout=5) == -9
@@ -6,10 +6,9 @@ from app.agent.toolcall import ToolCallAgent
 from app.agent.swarm import SwarmOrchestrator
 from app.tool.delegate_tool import DelegateTool
 
-def test_feedback_collector():
-    collector = FeedbackCollector(storage_path="test_feedback.jsonl")
-    if os.path.exists("test_feedback.jsonl"):
-        os.remove("test_feedback.jsonl")
+def test_feedback_collector(tmp_path):
+    path = str(tmp_path / "feedback.jsonl")
+    collector = FeedbackCollector(storage_path=path)
 
     feedback = collector.collect(
         session_id="123",
@@ -20,13 +19,27 @@ def test_feedback_collector():
     )
 
     assert feedback.rating == 5
-    assert os.path.exists("test_feedback.jsonl")
+    assert os.path.exists(path)
 
     stats = collector.get_stats()
     assert stats["count"] == 1
     assert stats["avg_rating"] == 5.0
 
-    os.remove("test_feedback.jsonl")
+def test_feedback_stats_follow_the_file(tmp_path):
+    path = str(tmp_path / "feedback.jsonl")
+    collector = FeedbackCollector(storage_path=path)
+    collector.collect("s1", "t1", "in", "out", rating=5)
+    collector.collect("s1", "t2", "in", "out", rating=2)
+    assert collector.get_stats() == {"count": 2, "avg_rating": 3.5}
+
+    # Lines appended by another collector are picked up on the next call
+    FeedbackCollector(storage_path=path).collect("s2", "t3", "in", "out", rating=2)
+    assert collector.get_stats() == {"count": 3, "avg_rating": 3.0}
+
+    os.remove(path)
+    assert collector.get_stats() == {"count": 0, "avg_rating": 0.0}
+    collector.collect("s1", "t4", "in", "out", rating=4)
+    assert collector.get_stats() == {"count": 1, "avg_rating": 4.0}
 
 def test_digital_immunity_system():
     immunity = DigitalImmunitySystem()
@@ -15,8 +15,14 @@ from app.api.models import TaskEvent, TaskType
 
 class TestAPIServer(unittest.TestCase):
 
-    def setUp(self):
-        self.client = TestClient(app)
+    @classmethod
+    def setUpClass(cls):
+        # One client for the whole class; app setup is shared across tests
+        tasks.clear()
+        event_queues.clear()
+        cls.client = TestClient(app)
+        cls.addClassCleanup(tasks.clear)
+        cls.addClassCleanup(event_queues.clear)
 
     def test_create_task(self):
         response = self.client.post("/v1/tasks", json={
@@ -0,0 +1,24 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.tool._async_loop import AsyncLoopThread
+
+
+async def _current_thread_name():
+    return threading.current_thread().name
+
+
+class TestAsyncLoopThread:
+    def test_singleton(self):
+        assert AsyncLoopThread.get() is AsyncLoopThread.get()
+
+    def test_run_sync(self):
+        assert AsyncLoopThread.get().run_sync(_current_thread_name()) == "async-loop-thread"
+
+    @pytest.mark.asyncio
+    async def test_run_from_other_loop(self):
+        loop_thread = AsyncLoopThread.get()
+        names = await asyncio.gather(*[loop_thread.run(_current_thread_name()) for _ in range(3)])
+        assert names == ["async-loop-thread"] * 3
@@ -1,21 +1,23 @@
 import unittest
 import os
 import json
+import tempfile
 import uuid
 import time
 from app.utils.audit import AuditLogger
 
 class TestAuditLogger(unittest.TestCase):
     def setUp(self):
-        self.test_log_file = "test_audit.log"
+        # A private directory per test, so parallel workers never share a log file
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.test_log_file = os.path.join(tmp_dir.name, "audit.log")
         self.logger = AuditLogger(log_path=self.test_log_file)
-        # Clear existing file
-        if os.path.exists(self.test_log_file):
-            os.remove(self.test_log_file)
+        # Start from an empty log
+        os.remove(self.test_log_file)
 
     def tearDown(self):
-        if os.path.exists(self.test_log_file):
-            os.remove(self.test_log_file)
+        self.logger.close()
 
     def test_log_event(self):
         task_id = str(uuid.uuid4())
@@ -23,6 +25,7 @@ class TestAuditLogger(unittest.TestCase):
         tool_name = "test_tool"
 
         self.logger.log_tool_call(task_id, user_id, tool_name, {"arg": "val"})
+        self.logger.flush()
 
         # Verify file content
         with open(self.test_log_file, "r") as f:
@@ -37,11 +40,84 @@ class TestAuditLogger(unittest.TestCase):
     def test_log_result(self):
         # Simulate result
         self.logger.log_tool_result("t1", "u1", "tool_x", "success", 100.0, "Output OK")
+        self.logger.flush()
 
         with open(self.test_log_file, "r") as f:
             entry = json.loads(f.read().strip())
             self.assertEqual(entry["result_status"], "success")
             self.assertEqual(entry["duration_ms"], 100.0)
 
+    def test_timestamp_format(self):
+        from datetime import datetime, timezone
+
+        before = datetime.now(timezone.utc)
+        ts = self.logger._timestamp()
+        self.assertRegex(ts, r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{6}Z$")
+        parsed = datetime.strptime(ts, "%Y-%m-%dT%H:%M:%S.%fZ").replace(tzinfo=timezone.utc)
+        self.assertLess(abs((parsed - before).total_seconds()), 2)
+
+    def test_default_ids(self):
+        self.logger.log_event("tick")
+        self.logger.log_event("tick", task_id="given")
+        self.logger.flush()
+
+        with open(self.test_log_file, "r") as f:
+            first, second = (json.loads(line) for line in f)
+        self.assertRegex(first["task_id"], r"^[0-9a-f]{32}$")
+        self.assertRegex(first["trace_id"], r"^[0-9a-f]{32}$")
+        self.assertNotEqual(first["task_id"], first["trace_id"])
+        self.assertEqual(second["task_id"], "given")
+
+    def test_close_writes_and_stops_writer(self):
+        self.logger.log_event("first")
+        writer = self.logger._writer
+        self.logger.close()
+
+        self.assertFalse(writer.is_alive())
+        self.assertIsNone(self.logger._fh)
+        with open(self.test_log_file, "r") as f:
+            self.assertEqual(json.loads(f.read())["event_type"], "first")
+
+        # A closed logger reopens the file on the next event
+        self.logger.log_event("second")
+        self.logger.flush()
+        with open(self.test_log_file, "r") as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+    def test_flush_without_writer_starts_none(self):
+        # The atexit hook flushes loggers that may already be closed, when
+        # Python 3.12+ no longer allows starting threads
+        self.logger.log_event("first")
+        self.logger.close()
+        self.logger.flush()
+        self.assertIsNone(self.logger._writer)
+
+    def test_file_opened_once(self):
+        from unittest import mock
+
+        with mock.patch("app.utils.audit.open", create=True, side_effect=open) as opened:
+            for i in range(3):
+                self.logger.log_event("tick")
+                self.logger.flush()
+        self.assertEqual(opened.call_count, 1)
+
+    def test_concurrent_events_are_batched(self):
+        import threading
+
+        def worker(n):
+            for i in range(50):
+                self.logger.log_event("tick", task_id=f"{n}-{i}")
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.logger.flush()
+
+        with open(self.test_log_file, "r") as f:
+            task_ids = {json.loads(line)["task_id"] for line in f}
+        self.assertEqual(len(task_ids), 200)
+
 if __name__ == "__main__":
     unittest.main()
@@ -50,6 +50,21 @@ class TestBudgetManager:
         with pytest.raises(BudgetExceededError):
             manager.record_cost("user1", 60.0)
 
+    def test_record_costs_bulk(self):
+        manager = BudgetManager({"user1": 100.0, "user2": 10.0})
+        manager.record_cost("user1", 20.0)
+        manager.record_costs_bulk(["user1", "user2", "user1", "user3"], [10.0, 5.0, 30.0, 1000.0])
+        assert manager.usage == {"user1": 60.0, "user2": 5.0, "user3": 1000.0}
+
+        # Every cost is recorded before the error, which names each user over budget
+        with pytest.raises(BudgetExceededError) as excinfo:
+            manager.record_costs_bulk(["user2", "user1", "user2"], [5.0, 50.0, 1.0])
+        assert "user1" in str(excinfo.value) and "user2" in str(excinfo.value)
+        assert manager.usage["user1"] == 110.0
+        assert manager.usage["user2"] == 11.0
+
+        manager.record_costs_bulk([], [])
+
     def test_negative_cost(self):
         # Budget manager doesn't explicitly forbid negative cost (refunds?)
         # Let's verify behavior
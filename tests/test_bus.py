@@ -65,6 +65,24 @@ class TestMessageBus:
 
         assert len(received_messages) == 1
 
+    @pytest.mark.asyncio
+    async def test_async_callbacks_run_concurrently(self):
+        bus = MessageBus()
+        ready = asyncio.Event()
+
+        # Would deadlock if the callbacks were awaited one after another
+        async def waiter(m):
+            await ready.wait()
+
+        async def setter(m):
+            ready.set()
+
+        bus.subscribe("agent1", waiter)
+        bus.subscribe("agent2", setter)
+
+        msg = AgentMessage(sender="agent3", recipient="all", content="go")
+        await asyncio.wait_for(bus.publish(msg), timeout=1)
+
     @pytest.mark.asyncio
     async def test_multiple_subscribers_same_id(self):
         bus = MessageBus()
@@ -94,3 +112,14 @@ class TestMessageBus:
         assert len(history) == 2
         assert history[0] == msg1
         assert history[1] == msg2
+
+    @pytest.mark.asyncio
+    async def test_history_is_bounded(self):
+        bus = MessageBus(history_max=3)
+        for i in range(5):
+            await bus.publish(AgentMessage(sender="a", recipient="b", content=str(i)))
+
+        assert [m.content for m in bus.get_history()] == ["2", "3", "4"]
+        assert [m.content for m in bus.get_history(limit=2)] == ["3", "4"]
+        assert len(bus.get_history(limit=10)) == 3
+        assert bus.get_history(limit=0) == []
@@ -0,0 +1,45 @@
+import os
+
+from app import config as config_module
+from app.config import MCPSettings, _load_toml
+
+
+class TestLoadToml:
+    def test_parsed_once_per_version(self, tmp_path, monkeypatch):
+        path = tmp_path / "config.toml"
+        path.write_text('[llm]\nmodel = "a"\n')
+        mtime = path.stat().st_mtime_ns
+
+        parses = []
+        real_load = config_module.tomllib.load
+        monkeypatch.setattr(config_module.tomllib, "load", lambda f: parses.append(1) or real_load(f))
+
+        first = _load_toml(str(path), mtime)
+        assert first == {"llm": {"model": "a"}}
+        assert _load_toml(str(path), mtime) is first
+        assert len(parses) == 1
+
+        # An edit changes the mtime, so the next load re-parses
+        path.write_text('[llm]\nmodel = "b"\n')
+        os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+        assert _load_toml(str(path), path.stat().st_mtime_ns) == {"llm": {"model": "b"}}
+        assert len(parses) == 2
+
+
+class TestMCPServerConfig:
+    def test_parsed_once_per_version(self, tmp_path, monkeypatch):
+        (tmp_path / "config").mkdir()
+        path = tmp_path / "config" / "mcp.json"
+        path.write_text('{"mcpServers": {"local": {"type": "stdio", "command": "server"}}}')
+        monkeypatch.setattr(config_module, "PROJECT_ROOT", tmp_path)
+        config_module._load_mcp_servers.cache_clear()
+
+        first = MCPSettings.load_server_config()
+        assert first["local"].command == "server"
+        # Callers get their own dict, so changing it does not leak into the cache
+        first.pop("local")
+        assert MCPSettings.load_server_config()["local"].command == "server"
+        assert config_module._load_mcp_servers.cache_info().misses == 1
+
+        path.unlink()
+        assert MCPSettings.load_server_config() == {}
@@ -63,6 +63,26 @@ async def test_refine_plan():
     assert pool.current_plan.phases[1].description == "Code with detail"
     assert pool.current_plan.phases[0].title == "Phase 1" # Unchanged
 
+def test_plan_phase_index():
+    plan = Plan(
+        goal="Build App",
+        phases=[PlanStep(id=i, title=f"Phase {i}", description="") for i in (3, 5, 8)],
+    )
+    assert plan.get_phase(5).title == "Phase 5"
+    assert plan.get_phase(99) is None
+
+    plan.advance()
+    plan.advance()
+    assert plan.current_phase_id == 5
+    assert [p.status for p in plan.phases] == ["completed", "in_progress", "pending"]
+
+    # The index follows changes to the phases list
+    plan.phases.append(PlanStep(id=13, title="Phase 13", description=""))
+    assert plan.get_phase(13).title == "Phase 13"
+    plan.phases = [PlanStep(id=21, title="Phase 21", description="")]
+    assert plan.get_phase(5) is None
+    assert plan.phase_position(21) == 0
+
 @pytest.mark.asyncio
 async def test_belief_summarization():
     llm = MockLLM()
@@ -90,3 +110,21 @@ async def test_belief_summarization():
     assert beliefs.facts[1].content == "Fact 3"
     assert beliefs.facts[2].content == "Fact 4"
     assert llm.ask.call_count == 1
+
+@pytest.mark.asyncio
+async def test_belief_summarization_failure_keeps_recent_facts():
+    llm = MockLLM()
+    llm.ask.side_effect = RuntimeError("LLM down")
+    beliefs = BeliefSet(max_facts=3)
+
+    for i in range(1, 6):
+        await beliefs.add_fact(f"Fact {i}", llm)
+
+    # Falls back to plain trimming, oldest first
+    assert [f.content for f in beliefs.facts] == ["Fact 3", "Fact 4", "Fact 5"]
+
+    # Facts are stored in a deque but still saved and restored as a JSON list
+    dumped = json.loads(json.dumps(beliefs.model_dump(), default=str))
+    assert isinstance(dumped["facts"], list)
+    restored = BeliefSet(**dumped)
+    assert [f.content for f in restored.facts] == ["Fact 3", "Fact 4", "Fact 5"]
@@ -1,5 +1,6 @@
 import pytest
 import hashlib
+from app.utils import distributed
 from app.utils.distributed import Cache, Consensus
 
 class TestCache:
@@ -9,13 +10,39 @@ class TestCache:
         assert cache.get("key1") == "value1"
         assert cache.get("nonexistent") is None
 
+    def test_instances_do_not_share_entries(self):
+        Cache().set("key1", "value1")
+        assert Cache().get("key1") is None
+
+    def test_ttl_expires(self, monkeypatch):
+        import time
+        cache = Cache()
+        now = time.monotonic()
+        cache.set("key1", "value1", ttl=10)
+        monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+        assert cache.get("key1") is None
+        assert "key1" not in cache._store
+
+    def test_lru_eviction(self):
+        cache = Cache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
     def test_semantic_search(self):
         cache = Cache()
         query = "What is the capital of France?"
         response = "Paris"
 
         # Expected hash key logic from the implementation
-        key = hashlib.md5(query.encode()).hexdigest()
+        if distributed.xxhash is not None:
+            key = distributed.xxhash.xxh3_128_hexdigest(query.encode())
+        else:
+            key = hashlib.blake2b(query.encode(), digest_size=16).hexdigest()
 
         cache.semantic_set(query, response)
 
@@ -0,0 +1,185 @@
+import sys
+
+import pytest
+
+from app.tool import document_processor as document_processor_module
+from app.tool.document_processor import DocumentProcessor
+
+# Some test modules replace pdfminer in sys.modules with a MagicMock when they
+# are collected; keep the real modules so the PDF tests can put them back
+try:
+    import pdfminer.high_level
+    import pdfminer.layout
+
+    _PDFMINER = {name: sys.modules[name] for name in ("pdfminer", "pdfminer.high_level", "pdfminer.layout")}
+except ImportError:
+    _PDFMINER = None
+
+
+def write_pdf(path, pages):
+    """Write a minimal PDF with one line of Helvetica text per page."""
+    count = len(pages)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [%s] /Count %d >>"
+        % (b" ".join(b"%d 0 R" % (4 + 2 * i) for i in range(count)), count),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(pages):
+        stream = b"BT /F1 12 Tf 72 720 Td (%s) Tj ET" % text.encode("latin-1")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (5 + 2 * i)
+        )
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+
+
+@pytest.fixture
+def real_pdfminer(monkeypatch):
+    if _PDFMINER is None:
+        pytest.skip("pdfminer.six is not installed")
+    for name, module in _PDFMINER.items():
+        monkeypatch.setitem(sys.modules, name, module)
+
+
+@pytest.fixture
+def processor():
+    yield DocumentProcessor(llm=None)
+    document_processor_module._CACHE.clear()
+    document_processor_module._cache_size = 0
+
+
+async def collect(processor, path):
+    return [chunk async for chunk in processor.stream_text(str(path))]
+
+
+class TestStreamText:
+    @pytest.mark.asyncio
+    async def test_pdf_is_streamed_per_page(self, processor, real_pdfminer, tmp_path):
+        path = tmp_path / "doc.pdf"
+        write_pdf(path, ["First page", "Second page"])
+
+        chunks = await collect(processor, path)
+        assert len(chunks) == 2
+        assert "First page" in chunks[0] and chunks[0].endswith("\f")
+        assert "Second page" in chunks[1] and chunks[1].endswith("\f")
+
+    @pytest.mark.asyncio
+    async def test_html_is_converted_then_chunked(self, processor, tmp_path, monkeypatch):
+        monkeypatch.setattr(document_processor_module, "STREAM_CHUNK_SIZE", 8)
+        path = tmp_path / "page.html"
+        path.write_text('<h1>Title</h1><p>See <a href="https://example.com">docs</a></p>')
+
+        chunks = await collect(processor, path)
+        assert all(len(chunk) <= 8 for chunk in chunks)
+        text = "".join(chunks)
+        assert "# Title" in text
+        assert "[docs](https://example.com)" in text
+
+    @pytest.mark.asyncio
+    async def test_text_is_chunked_on_line_boundaries(self, processor, tmp_path, monkeypatch):
+        monkeypatch.setattr(document_processor_module, "STREAM_CHUNK_SIZE", 10)
+        path = tmp_path / "notes.txt"
+        path.write_text("alpha\nbeta\ngamma\ndelta\n")
+
+        assert await collect(processor, path) == ["alpha\nbeta\n", "gamma\ndelta\n"]
+
+
+class TestExtractText:
+    @pytest.mark.asyncio
+    async def test_joins_the_stream(self, processor, real_pdfminer, tmp_path):
+        path = tmp_path / "doc.pdf"
+        write_pdf(path, ["First page", "Second page"])
+
+        result = await processor.execute(action="extract_text", path=str(path))
+        assert result.error is None
+        assert result.output == "".join(await collect(processor, path))
+        assert result.output.count("\f") == 2
+
+    @pytest.mark.asyncio
+    async def test_error_messages(self, processor, real_pdfminer, tmp_path):
+        unsupported = tmp_path / "data.xyz"
+        unsupported.write_text("?")
+        result = await processor.execute(action="extract_text", path=str(unsupported))
+        assert result.error == "Unsupported file type for extraction: .xyz"
+
+        broken = tmp_path / "broken.pdf"
+        broken.write_bytes(b"not a pdf")
+        result = await processor.execute(action="extract_text", path=str(broken))
+        assert result.error.startswith("Extraction failed: ")
+
+        result = await processor.execute(action="extract_text", path=str(tmp_path / "missing.txt"))
+        assert result.error == f"File not found: {tmp_path / 'missing.txt'}"
+
+
+class TestExtractionCache:
+    @pytest.fixture
+    def parses(self, processor, monkeypatch):
+        """Paths actually parsed, as opposed to served from the cache."""
+        parsed = []
+        iter_text = DocumentProcessor._iter_text_sync
+
+        def recording_iter(self, path, ext):
+            parsed.append(path)
+            return iter_text(self, path, ext)
+
+        monkeypatch.setattr(DocumentProcessor, "_iter_text_sync", recording_iter)
+        return parsed
+
+    @pytest.mark.asyncio
+    async def test_repeat_extraction_is_cached(self, processor, parses, tmp_path):
+        path = tmp_path / "notes.txt"
+        path.write_text("hello\n")
+
+        first = await processor.execute(action="extract_text", path=str(path))
+        second = await processor.execute(action="convert_to_markdown", path=str(path))
+        assert first.output == second.output == "hello\n"
+        assert parses == [str(path)]
+
+    @pytest.mark.asyncio
+    async def test_changed_file_is_extracted_again(self, processor, parses, tmp_path):
+        path = tmp_path / "notes.txt"
+        path.write_text("hello\n")
+        await processor.execute(action="extract_text", path=str(path))
+
+        path.write_text("hello again\n")
+        result = await processor.execute(action="extract_text", path=str(path))
+        assert result.output == "hello again\n"
+        assert len(parses) == 2
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_is_evicted_past_the_cap(self, processor, parses, tmp_path, monkeypatch):
+        monkeypatch.setattr(document_processor_module, "CACHE_MAX_CHARS", 10)
+        a, b, c = (tmp_path / f"{name}.txt" for name in "abc")
+        for path in (a, b, c):
+            path.write_text(path.stem * 4)
+
+        for path in (a, b, a, c):
+            await processor.execute(action="extract_text", path=str(path))
+        # a was used after b, so adding c pushed b out
+        assert parses == [str(a), str(b), str(c)]
+        assert document_processor_module._cache_size == 8
+        await processor.execute(action="extract_text", path=str(a))
+        await processor.execute(action="extract_text", path=str(b))
+        assert parses == [str(a), str(b), str(c), str(b)]
+
+    @pytest.mark.asyncio
+    async def test_text_larger_than_the_cap_is_not_cached(self, processor, parses, tmp_path, monkeypatch):
+        monkeypatch.setattr(document_processor_module, "CACHE_MAX_CHARS", 4)
+        path = tmp_path / "big.txt"
+        path.write_text("too long")
+        await processor.execute(action="extract_text", path=str(path))
+        await processor.execute(action="extract_text", path=str(path))
+        assert len(parses) == 2
+        assert not document_processor_module._CACHE
@@ -0,0 +1,61 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.exceptions import ToolError
+from app.tool.base import ToolResult
+from app.tool.enhanced_browser_tool import EnhancedBrowserUseTool
+
+
+class FakePage:
+    async def content(self):
+        return '<h1>Title</h1><p>Body with a <a href="https://example.com/x">link</a></p>'
+
+
+class FakeContext:
+    async def get_current_page(self):
+        return FakePage()
+
+
+@pytest.fixture
+def browser(monkeypatch):
+    """The tool with browser actions recorded instead of driving a real browser."""
+    actions = []
+
+    async def execute(self, action, **kwargs):
+        actions.append(action)
+        if action == "go_to_url" and kwargs["url"] == "https://down.example":
+            return ToolResult(error="net::ERR_NAME_NOT_RESOLVED")
+        if action == "extract_content":
+            return ToolResult(output=f"Extracted for {kwargs['goal']}")
+        return ToolResult(output="ok")
+
+    monkeypatch.setattr(EnhancedBrowserUseTool, "execute", execute)
+    monkeypatch.setattr(
+        EnhancedBrowserUseTool, "_ensure_browser_initialized", AsyncMock(return_value=FakeContext())
+    )
+    return EnhancedBrowserUseTool(llm=None), actions
+
+
+class TestNavigate:
+    @pytest.mark.asyncio
+    async def test_without_focus_converts_page_html(self, browser):
+        tool, actions = browser
+        page = await tool.navigate("https://example.com")
+        assert actions == ["go_to_url"]
+        assert "# Title" in page.content
+        assert "[link](https://example.com/x)" in page.content
+
+    @pytest.mark.asyncio
+    async def test_with_focus_extracts_content(self, browser):
+        tool, actions = browser
+        page = await tool.navigate("https://example.com", focus="pricing")
+        assert actions == ["go_to_url", "extract_content"]
+        assert page.content == "Extracted for pricing"
+
+    @pytest.mark.asyncio
+    async def test_navigation_error_raises_tool_error(self, browser):
+        tool, actions = browser
+        with pytest.raises(ToolError, match="ERR_NAME_NOT_RESOLVED"):
+            await tool.navigate("https://down.example")
+        assert actions == ["go_to_url"]
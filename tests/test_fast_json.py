@@ -0,0 +1,26 @@
+import pytest
+
+from app.utils import fast_json
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(fast_json, "orjson", None)
+    elif fast_json.orjson is None:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
+class TestFastJson:
+    def test_round_trip(self, backend):
+        data = {"name": "tâche", "values": [1, 2.5, None, True]}
+        assert fast_json.loads(fast_json.dumps(data)) == data
+        assert fast_json.loads(fast_json.dumps(data, indent=True).decode()) == data
+
+    def test_indent(self, backend):
+        assert fast_json.dumps({"a": 1}, indent=True) == b'{\n  "a": 1\n}'
+
+    def test_invalid(self, backend):
+        with pytest.raises(fast_json.JSONDecodeError):
+            fast_json.loads("{not json")
@@ -32,6 +32,33 @@ class TestFileTool(unittest.TestCase):
             content = await self.tool.read("test.txt")
             self.assertEqual(content, "Updated")
 
+    def test_read_line_range(self):
+        async def run():
+            await self.tool.write("lines.txt", "\n".join(f"line {i}" for i in range(1, 101)))
+            content = await self.tool.read("lines.txt", start_line=50, end_line=51)
+            self.assertEqual(content, "  50 | line 50\n  51 | line 51")
+
+            content = await self.tool.read("lines.txt", start_line=100)
+            self.assertEqual(content, " 100 | line 100")
+
+        asyncio.run(run())
+
+    def test_large_write(self):
+        async def run():
+            content = "x" * (2 << 20) + "\u00e9"
+            await self.tool.write("large.txt", content)
+            self.assertEqual(await self.tool.read("large.txt"), content)
+
+        asyncio.run(run())
+
+    def test_non_durable_write(self):
+        async def run():
+            res = await self.tool.execute(action="write", path="scratch.txt", content="Scratch", durable=False)
+            self.assertIsNone(res.error)
+            self.assertEqual(await self.tool.read("scratch.txt"), "Scratch")
+
+        asyncio.run(run())
+
     def test_execute_interface(self):
         async def run():
             # Test the BaseTool execute interface
@@ -0,0 +1,54 @@
+import subprocess
+
+import pytest
+
+from app.tool.git_tool import GitTool
+
+
+def git(*args, cwd):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    for var in ("GIT_AUTHOR", "GIT_COMMITTER"):
+        monkeypatch.setenv(f"{var}_NAME", "Test")
+        monkeypatch.setenv(f"{var}_EMAIL", "test@example.com")
+    origin = tmp_path / "origin.git"
+    work = tmp_path / "work"
+    git("init", "--bare", "-b", "main", str(origin), cwd=tmp_path)
+    git("clone", str(origin), str(work), cwd=tmp_path)
+    git("checkout", "-b", "main", cwd=work)
+    monkeypatch.chdir(work)
+    return work, origin
+
+
+class TestCommitPush:
+    @pytest.mark.asyncio
+    async def test_message_is_passed_verbatim(self, repo):
+        work, origin = repo
+        (work / "a.txt").write_text("a")
+        message = """fix: handle "quotes", it's $(not run) && `ls`; echo"""
+
+        result = await GitTool().execute(action="commit_push", message=message, branch="main")
+        assert result.error is None
+        assert git("log", "-1", "--format=%B", "main", cwd=origin).strip() == message
+
+    @pytest.mark.asyncio
+    async def test_rejects_non_conventional_message(self, repo):
+        work, origin = repo
+        (work / "a.txt").write_text("a")
+
+        result = await GitTool().execute(action="commit_push", message="update stuff")
+        assert "Conventional Commits" in result.error
+        # Nothing was staged or committed
+        assert git("status", "--porcelain", cwd=work) == "?? a.txt\n"
+
+    @pytest.mark.asyncio
+    async def test_failure_names_the_step(self, repo):
+        result = await GitTool().execute(action="commit_push", message="fix: nothing to commit")
+        assert result.error.startswith("git commit failed:")
+
+        (repo[0] / "a.txt").write_text("a")
+        result = await GitTool().execute(action="commit_push", message="feat: a", branch="missing/remote")
+        assert result.error.startswith("git push failed:")
@@ -46,6 +46,17 @@ class TestDigitalImmunitySystem:
         # 4th time should trigger loop detection
         assert immunity_system.monitor_tool_call(tool, args) is False
 
+    def test_call_history_is_bounded(self, immunity_system):
+        for i in range(100):
+            assert immunity_system.monitor_tool_call("tool", {"i": i}) is True
+        assert len(immunity_system.call_history) == 4
+
+        # A loop is still caught after the history has wrapped: with earlier
+        # calls on record, the third identical call in a row is blocked
+        for _ in range(2):
+            assert immunity_system.monitor_tool_call("tool", {"i": 0}) is True
+        assert immunity_system.monitor_tool_call("tool", {"i": 0}) is False
+
     def test_record_failure_and_blocking(self, immunity_system):
         tool = "flaky_tool"
         for _ in range(5):
@@ -0,0 +1,72 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.agent import manus as manus_module
+from app.agent.manus import Manus
+
+
+class FakeSandbox:
+    def __init__(self):
+        self.container = None
+        self.starts = 0
+
+    def start(self):
+        self.starts += 1
+        self.container = object()
+
+    def stop(self):
+        self.container = None
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    monkeypatch.setattr(manus_module, "DockerSandbox", FakeSandbox)
+    return Manus()
+
+
+@pytest.mark.asyncio
+async def test_reused_agent_starts_without_plan(agent):
+    planning = agent.available_tools.tool_map["planning"]
+    await planning.execute(command="create", plan_id="old", title="Old task", steps=["step"])
+    assert agent.planning_tool.get_active_plan_data() is not None
+    agent._immunity.monitor_tool_call("shell", {"command": "ls"})
+    agent._immunity.record_failure("shell")
+
+    await agent.reset()
+
+    assert agent.planning_tool.get_active_plan_data() is None
+    assert planning.plans == {}
+    assert len(agent._immunity.call_history) == 0
+    assert not agent._immunity.failure_counts
+
+
+@pytest.mark.asyncio
+async def test_reused_agent_starts_without_shell_sessions(agent):
+    shell = agent.available_tools.tool_map["shell"]
+    session = shell.sessions[await shell.create_session()]
+    session.current_dir = "/workspace/old-task"
+    session.recent_dirs["/workspace/old-task"] = None
+    closed = []
+    session.shell = type("Shell", (), {"close": lambda self: closed.append(1)})()
+
+    await agent.reset()
+
+    assert shell.sessions == {}
+    assert closed == [1]
+
+
+@pytest.mark.asyncio
+async def test_sandbox_restarts_on_next_run_not_on_reset(agent, monkeypatch):
+    monkeypatch.setattr(Manus, "initialize_mcp_servers", AsyncMock())
+    monkeypatch.setattr(manus_module.AgentCore, "think", AsyncMock(return_value=False))
+    # As after a finished run: create() started the sandbox and cleanup() stopped it
+    agent.sandbox.start()
+    agent.sandbox.stop()
+
+    await agent.reset()
+    assert agent.sandbox.container is None
+
+    await agent.think()
+    assert agent.sandbox.starts == 2
+    assert agent.sandbox.container is not None
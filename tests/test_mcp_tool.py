@@ -0,0 +1,117 @@
+import asyncio
+import json
+
+import pytest
+
+from app.tool.base import BaseTool, ToolResult
+from app.tool.mcp import MCPClients
+from app.tool.mcp_tool import MCPTool
+
+
+class EchoTool(BaseTool):
+    name: str = "mcp_demo_echo"
+    description: str = "Echo back the text."
+    original_name: str = "echo"
+
+    async def execute(self, text: str = "", delay: float = 0, **kwargs) -> ToolResult:
+        await asyncio.sleep(delay)
+        if text == "fail":
+            return ToolResult(error="echo failed")
+        return ToolResult(output=text)
+
+
+@pytest.fixture
+def mcp_tool():
+    tool = MCPTool()
+    clients = MCPClients()
+    echo = EchoTool()
+    clients.tool_map = {echo.name: echo}
+    clients._rebuild_alias_map()
+    tool._sessions["demo"] = clients
+    return tool
+
+
+class TestMCPTool:
+    @pytest.mark.asyncio
+    async def test_call_tool_by_original_name(self, mcp_tool):
+        result = await mcp_tool.execute(action="call_tool", tool_name="echo", args='{"text": "hi"}')
+        assert result.output == "hi"
+
+    @pytest.mark.asyncio
+    async def test_batch_execute(self, mcp_tool):
+        result = await mcp_tool.execute(
+            action="batch_execute",
+            operations=[
+                {"tool_name": "echo", "args": {"text": "a"}},
+                {"tool_name": "mcp_demo_echo", "args": {"text": "b"}},
+            ],
+        )
+        assert result.error is None
+        assert [r["output"] for r in json.loads(result.output)] == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_batch_execute_stop_on_error(self, mcp_tool):
+        result = await mcp_tool.execute(
+            action="batch_execute",
+            operations=[
+                {"tool_name": "echo", "args": {"text": "fail"}},
+                {"tool_name": "echo", "args": {"text": "slow", "delay": 5}},
+            ],
+            stop_on_error=True,
+        )
+        assert result.error
+        assert [r["error"] for r in json.loads(result.output)] == ["echo failed", "Cancelled"]
+
+    @pytest.mark.asyncio
+    async def test_batch_execute_unknown_tool(self, mcp_tool):
+        result = await mcp_tool.execute(action="batch_execute", operations=[{"tool_name": "missing"}])
+        assert "not found" in result.error
+
+    @pytest.mark.asyncio
+    async def test_unknown_action(self, mcp_tool):
+        result = await mcp_tool.execute(action="bogus")
+        assert result.error == "Unknown action: bogus"
+
+
+class TestConnect:
+    @pytest.fixture
+    def opened(self, monkeypatch):
+        """Exit stacks of connections opened by a fake SSE connect; url "fail" fails after opening."""
+        from contextlib import AsyncExitStack
+
+        stacks = []
+
+        async def connect_sse(self, server_url, server_id=""):
+            stack = self.exit_stacks[server_id] = AsyncExitStack()
+            closed = []
+            stack.callback(closed.append, True)
+            stacks.append(closed)
+            await asyncio.sleep(0.05)
+            if server_url == "http://fail":
+                raise ConnectionError("handshake failed")
+            self.sessions[server_id] = object()
+
+        monkeypatch.setattr(MCPClients, "connect_sse", connect_sse)
+        return stacks
+
+    @pytest.mark.asyncio
+    async def test_concurrent_connects_open_one_connection(self, opened):
+        tool = MCPTool()
+        results = await asyncio.gather(*(
+            tool.execute(action="connect_server", server_name="demo", server_url="http://demo")
+            for _ in range(3)
+        ))
+        assert len(opened) == 1
+        assert sorted(r.output for r in results) == [
+            "Already connected to MCP server 'demo'",
+            "Already connected to MCP server 'demo'",
+            "Connected to MCP server 'demo'",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_failed_connect_is_closed(self, opened):
+        tool = MCPTool()
+        result = await tool.execute(action="connect_server", server_name="demo", server_url="http://fail")
+        assert result.error == "handshake failed"
+        assert opened == [[True]]
+        assert "demo" not in tool._sessions
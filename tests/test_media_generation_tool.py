@@ -0,0 +1,25 @@
+import pytest
+
+from app.tool.media_generation_tool import MediaGenerationTool
+
+
+@pytest.fixture
+def tool(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return MediaGenerationTool(llm=None)
+
+
+class TestMediaGenerationTool:
+    @pytest.mark.asyncio
+    async def test_only_the_parameter_an_action_reads_is_validated(self, tool):
+        result = await tool.execute(action="generate_audio", text="hello", mode="pdf", style=None)
+        assert result.error is None
+        assert "Audio generated" in result.output
+
+    @pytest.mark.asyncio
+    async def test_invalid_value_is_rejected(self, tool):
+        result = await tool.execute(action="generate_audio", text="hello", voice_profile="ROBOT")
+        assert result.error == "Invalid voice_profile: ROBOT"
+
+        result = await tool.execute(action="generate_slides", content_path="deck.md", mode="pdf")
+        assert result.error == "Invalid mode: pdf"
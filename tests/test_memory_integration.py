@@ -34,6 +34,22 @@ def test_semantic_memory():
     assert len(results) > 0
     assert "blue" in results[0]['content']
 
+def test_semantic_memory_bulk_index():
+    mem = SemanticMemory(collection_name="test_semantic_bulk", persist_directory=f"{TEST_DIR}/db")
+
+    result = mem.index_documents(
+        ["The sky is blue.", "Apples are red.", "x" * 1500],
+        [{"category": "nature"}, {"category": "fruit"}, None],
+        source="bulk",
+    )
+    # The long document is split into two chunks
+    assert result == "Indexed 4 chunks."
+
+    results = mem.search("color of sky")
+    assert "blue" in results[0]['content']
+    assert results[0]['metadata']["category"] == "nature"
+    assert results[0]['metadata']["source"] == "bulk"
+
 def test_episodic_store():
     store = EpisodicStore(collection_name="test_episodes", persist_directory=f"{TEST_DIR}/db")
 
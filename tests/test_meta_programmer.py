@@ -5,17 +5,20 @@ import asyncio
 import sys
 from types import SimpleNamespace
 
-# Create mocks for app modules if they don't exist in environment
-sys.modules['app.agent.core'] = SimpleNamespace(AgentCore=MagicMock)
-sys.modules['app.agent.toolcall'] = SimpleNamespace(ToolCallAgent=MagicMock)
-sys.modules['app.logger'] = SimpleNamespace(logger=MagicMock())
-sys.modules['app.tool.file_tool'] = SimpleNamespace(FileTool=MagicMock)
-sys.modules['app.tool.shell_tool'] = SimpleNamespace(ShellTool=MagicMock)
-sys.modules['app.tool.python_execute'] = SimpleNamespace(PythonExecute=MagicMock)
-sys.modules['app.metrics.performance'] = SimpleNamespace(PerformanceMonitor=MagicMock)
-
-# Now import the class under test
-from app.agent.specialized.meta import MetaProgrammerAgent, ImprovementHypothesis, CodePatch, TestResult
+# Create mocks for app modules if they don't exist in environment. They are only
+# installed while the module under test is imported, so test modules collected
+# later still get the real ones.
+with patch.dict(sys.modules, {
+    'app.agent.core': SimpleNamespace(AgentCore=MagicMock),
+    'app.agent.toolcall': SimpleNamespace(ToolCallAgent=MagicMock),
+    'app.logger': SimpleNamespace(logger=MagicMock()),
+    'app.tool.file_tool': SimpleNamespace(FileTool=MagicMock),
+    'app.tool.shell_tool': SimpleNamespace(ShellTool=MagicMock),
+    'app.tool.python_execute': SimpleNamespace(PythonExecute=MagicMock),
+    'app.metrics.performance': SimpleNamespace(PerformanceMonitor=MagicMock),
+}):
+    # Now import the class under test
+    from app.agent.specialized.meta import MetaProgrammerAgent, ImprovementHypothesis, CodePatch, TestResult
 
 class TestMetaProgrammer(unittest.IsolatedAsyncioTestCase):
     async def asyncSetUp(self):
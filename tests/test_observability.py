@@ -18,6 +18,7 @@ sys.modules["daytona"] = MagicMock()
 import unittest
 import json
 import os
+import tempfile
 from app.utils.audit import AuditLogger
 from app.agent.toolcall import ToolCallAgent
 from app.llm import LLM
@@ -33,16 +34,13 @@ class MockLLM(LLM):
 
 class TestObservability(unittest.TestCase):
     def setUp(self):
-        self.audit_file = "test_audit.log"
-        if os.path.exists(self.audit_file):
-            os.remove(self.audit_file)
-
-    def tearDown(self):
-        if os.path.exists(self.audit_file):
-            os.remove(self.audit_file)
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.audit_file = os.path.join(tmp_dir.name, "audit.log")
 
     def test_audit_logger_schema(self):
         logger = AuditLogger(log_path=self.audit_file)
+        self.addCleanup(logger.close)
         logger.log_event(
             event_type="test_event",
             task_id="task_1",
@@ -50,6 +48,7 @@ class TestObservability(unittest.TestCase):
             user_id="user_1",
             payload={"foo": "bar"}
         )
+        logger.flush()
 
         with open(self.audit_file, "r") as f:
             line = f.readline()
@@ -59,6 +59,16 @@ class TestPlanningTool:
         assert tool.plans["plan1"]["title"] == "Updated Title"
         assert len(tool.plans["plan1"]["steps"]) == 2
 
+    @pytest.mark.asyncio
+    async def test_update_plan_preserves_step_status(self, tool):
+        await tool.execute(command="create", plan_id="plan1", steps=["a", "b", "c"])
+        await tool.execute(command="mark_step", plan_id="plan1", step_index=1, step_status="completed", step_notes="done")
+
+        await tool.execute(command="update", plan_id="plan1", steps=["b", "new", "a"])
+        plan = tool.plans["plan1"]
+        assert plan["step_statuses"] == ["completed", "not_started", "not_started"]
+        assert plan["step_notes"] == ["done", "", ""]
+
     @pytest.mark.asyncio
     async def test_mark_step(self, tool):
         await tool.execute(command="create", plan_id="plan1", steps=["step1", "step2"])
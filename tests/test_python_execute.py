@@ -0,0 +1,111 @@
+import pytest
+
+import app.tool.python_execute as python_execute_module
+from app.tool.python_execute import PythonExecute
+
+
+@pytest.fixture
+def tool():
+    tool = PythonExecute()
+    yield tool
+    tool._stop_worker()
+
+
+class TestPythonExecuteLocal:
+    @pytest.mark.asyncio
+    async def test_output(self, tool):
+        result = await tool.execute(code="print(6 * 7)")
+        assert result == {"observation": "42\n", "success": True}
+
+    @pytest.mark.asyncio
+    async def test_error(self, tool):
+        result = await tool.execute(code="print('before')\nraise ValueError('boom')")
+        assert not result["success"]
+        assert "before" in result["observation"]
+        assert "boom" in result["observation"]
+
+    @pytest.mark.asyncio
+    async def test_large_output(self, tool):
+        result = await tool.execute(code="print('x' * 1_000_000)", timeout=10)
+        assert result["success"]
+        assert len(result["observation"]) == 1_000_001
+
+    @pytest.mark.asyncio
+    async def test_timeout(self, tool):
+        result = await tool.execute(code="import time\ntime.sleep(5)", timeout=1)
+        assert result == {"observation": "Timeout after 1s", "success": False}
+
+        # The killed worker is replaced on the next call
+        result = await tool.execute(code="print('recovered')")
+        assert result == {"observation": "recovered\n", "success": True}
+
+    @pytest.mark.asyncio
+    async def test_worker_is_reused_with_fresh_globals(self, tool):
+        await tool.execute(code="x = 1")
+        pid = tool._worker.pid
+        result = await tool.execute(code="print('x' in globals())")
+        assert result["observation"] == "False\n"
+        assert tool._worker.pid == pid
+
+    @pytest.mark.asyncio
+    async def test_cwd_is_restored_between_calls(self, tool, tmp_path):
+        before = await tool.execute(code="import os\nprint(os.getcwd())")
+        await tool.execute(code=f"import os\nos.chdir({str(tmp_path)!r})")
+        after = await tool.execute(code="import os\nprint(os.getcwd())")
+        assert after == before
+
+
+class TestCompileCache:
+    def test_reuses_code_object(self):
+        code = "value = 40 + 2"
+        first = python_execute_module._compile_cached(code)
+        assert python_execute_module._compile_cached(code) is first
+
+    def test_cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(python_execute_module, "CODE_CACHE_SIZE", 2)
+        monkeypatch.setattr(python_execute_module, "_CODE_CACHE", python_execute_module.OrderedDict())
+        for i in range(3):
+            python_execute_module._compile_cached(f"x = {i}")
+        assert len(python_execute_module._CODE_CACHE) == 2
+
+    def test_syntax_error_is_reported(self):
+        result = PythonExecute._run_code_local("def broken(:", {})
+        assert result["success"] is False
+        assert "Error" in result["observation"]
+
+
+class FakeSandbox:
+    def __init__(self):
+        self.calls = []
+
+    def exec_stdin(self, cmd, data, workdir=None, timeout=None):
+        self.calls.append((cmd, data, timeout))
+        return 0, "ok\n"
+
+    def write_file(self, filepath, content):
+        raise AssertionError("code should not be staged as a file")
+
+
+class TestPythonExecuteSandbox:
+    @pytest.mark.asyncio
+    async def test_code_is_streamed_to_stdin(self):
+        sandbox = FakeSandbox()
+        tool = PythonExecute(sandbox=sandbox)
+        result = await tool.execute(code="print('ok')", timeout=5)
+        assert result == {"observation": "ok\n", "success": True}
+        assert sandbox.calls == [("python3 -", "print('ok')", 5)]
+
+
+class TestWorkerGlobals:
+    @pytest.mark.asyncio
+    async def test_imports_work_with_shared_builtins(self, tool):
+        result = await tool.execute(code="import math\nprint(math.floor(2.5))")
+        assert result == {"observation": "2\n", "success": True}
+        result = await tool.execute(code="print(len('abc'))")
+        assert result == {"observation": "3\n", "success": True}
+
+    @pytest.mark.asyncio
+    async def test_builtins_changes_do_not_leak(self, tool):
+        await tool.execute(code="__builtins__['len'] = lambda x: 42")
+        result = await tool.execute(code="print(len('abc'))")
+        assert result == {"observation": "3\n", "success": True}
@@ -1,4 +1,6 @@
+import re
 import unittest
+from app.utils import sanitizer as sanitizer_module
 from app.utils.sanitizer import Sanitizer
 
 class TestSanitizer(unittest.TestCase):
@@ -34,6 +36,31 @@ class TestSanitizer(unittest.TestCase):
         self.assertIn("[EMAIL_REDACTED]", sanitized["email"])
         self.assertIn("[OPENAI_KEY_REDACTED]", sanitized["key"])
 
+    def test_sanitize_mixed_text(self):
+        # Every pattern in one string is redacted in a single pass
+        text = "Mail a@b.io, card 1234 5678 9012 3456, token ghp_" + "x" * 36
+        sanitized = Sanitizer.sanitize(text)
+        self.assertEqual(
+            sanitized,
+            "Mail [REDACTED_EMAIL], card [REDACTED_CREDIT_CARD], token [REDACTED_API_KEY]",
+        )
+
+    def test_prefilter(self):
+        self.assertFalse(sanitizer_module._may_contain_pii("plain log line, step 3 of 5"))
+        self.assertTrue(sanitizer_module._may_contain_pii("reach me: a@b.io"))
+        self.assertTrue(sanitizer_module._may_contain_pii("token sk-abc"))
+        self.assertTrue(sanitizer_module._may_contain_pii("tel (555)123-4567"))
+        self.assertEqual(Sanitizer.sanitize("tel (555)123-4567"), "tel [REDACTED_PHONE]")
+
+    @unittest.skipIf(sanitizer_module.re2 is None, "google-re2 not installed")
+    def test_re2_matches_re(self):
+        stdlib = re.compile(sanitizer_module._PII_REGEX.pattern)
+        text = "x@y.org +55-123-456-7890 123.456.789-00 1234-5678-9012-3456 sk-" + "k" * 32
+        self.assertEqual(
+            sanitizer_module._PII_REGEX.sub(sanitizer_module._redact, text),
+            stdlib.sub(sanitizer_module._redact, text),
+        )
+
     def test_pseudonymize(self):
         # Hash check
         val = "user_123"
@@ -0,0 +1,129 @@
+import json
+import os
+import time
+
+import pytest
+
+from app.tool import schedule_tool as schedule_tool_module
+from app.tool.schedule_tool import ScheduleTool
+
+
+@pytest.fixture
+def schedule_tool(tmp_path):
+    tool = ScheduleTool()
+    tool._schedule_file = str(tmp_path / "schedule.json")
+    return tool
+
+
+class TestScheduleTool:
+    @pytest.mark.asyncio
+    async def test_schedule_list_cancel(self, schedule_tool):
+        result = await schedule_tool.execute(
+            action="schedule_interval", name="ping", interval_seconds=60, prompt="ping"
+        )
+        assert result.error is None
+        task_id = result.output.rsplit(" ", 1)[-1]
+
+        tasks = json.loads((await schedule_tool.execute(action="list_tasks")).output)
+        assert tasks[task_id]["interval"] == 60
+
+        result = await schedule_tool.execute(action="cancel_task", task_id=task_id)
+        assert result.error is None
+        assert json.loads((await schedule_tool.execute(action="list_tasks")).output) == {}
+
+    @pytest.mark.asyncio
+    async def test_tasks_persist_across_instances(self, schedule_tool):
+        await schedule_tool.execute(
+            action="schedule_cron", name="daily", cron_expression="0 0 * * *", prompt="report"
+        )
+        other = ScheduleTool()
+        other._schedule_file = schedule_tool._schedule_file
+        tasks = other._load_tasks()
+        assert [t["name"] for t in tasks.values()] == ["daily"]
+
+    def test_load_reuses_cache_until_file_changes(self, schedule_tool):
+        schedule_tool._save_tasks({"a": {"name": "first"}})
+        tasks = schedule_tool._load_tasks()
+        assert schedule_tool._load_tasks() is tasks
+
+        with open(schedule_tool._schedule_file, "w") as f:
+            json.dump({"b": {"name": "external edit"}}, f)
+        assert list(schedule_tool._load_tasks()) == ["b"]
+
+    @pytest.mark.asyncio
+    async def test_failed_write_is_not_cached(self, schedule_tool, monkeypatch):
+        result = await schedule_tool.execute(
+            action="schedule_interval", name="kept", interval_seconds=60, prompt="kept"
+        )
+        task_id = result.output.rsplit(" ", 1)[-1]
+
+        def failing_open(path, mode="r", *args, **kwargs):
+            if "a" in mode:
+                raise OSError("No space left on device")
+            return open(path, mode, *args, **kwargs)
+
+        monkeypatch.setattr(schedule_tool_module, "open", failing_open, raising=False)
+        result = await schedule_tool.execute(
+            action="schedule_interval", name="lost", interval_seconds=60, prompt="lost"
+        )
+        assert "No space left" in result.error
+        result = await schedule_tool.execute(action="cancel_task", task_id=task_id)
+        assert "No space left" in result.error
+
+        # Neither the phantom add nor the phantom cancel is visible afterwards
+        monkeypatch.undo()
+        tasks = json.loads((await schedule_tool.execute(action="list_tasks")).output)
+        assert [t["name"] for t in tasks.values()] == ["kept"]
+
+    @pytest.mark.asyncio
+    async def test_changes_are_logged_then_compacted(self, schedule_tool, monkeypatch):
+        await schedule_tool.execute(action="schedule_interval", name="a", interval_seconds=5, prompt="a")
+        assert os.path.exists(schedule_tool._log_file)
+        assert not os.path.exists(schedule_tool._schedule_file)
+
+        other = ScheduleTool()
+        other._schedule_file = schedule_tool._schedule_file
+        assert [t["name"] for t in other._load_tasks().values()] == ["a"]
+
+        monkeypatch.setattr(schedule_tool_module, "LOG_COMPACT_BYTES", 0)
+        await schedule_tool.execute(action="schedule_interval", name="b", interval_seconds=5, prompt="b")
+        assert not os.path.exists(schedule_tool._log_file)
+        with open(schedule_tool._schedule_file) as f:
+            assert sorted(t["name"] for t in json.load(f).values()) == ["a", "b"]
+
+    def test_writes_keep_changes_from_other_processes(self, schedule_tool, monkeypatch):
+        other = ScheduleTool()
+        other._schedule_file = schedule_tool._schedule_file
+
+        def add_racing_other(name, other_name):
+            # Another process appends between our load and our write
+            tasks = schedule_tool._load_tasks()
+            other._append_log(dict(other._load_tasks(), **{other_name: {"name": other_name}}), "add", other_name)
+            tasks[name] = {"name": name}
+            schedule_tool._append_log(tasks, "add", name)
+
+        add_racing_other("a", "b")
+        assert sorted(schedule_tool._load_tasks()) == ["a", "b"]
+
+        # Compaction folds in what is on disk, not the writer's view of it
+        monkeypatch.setattr(schedule_tool_module, "LOG_COMPACT_BYTES", 0)
+        add_racing_other("c", "d")
+        assert not os.path.exists(schedule_tool._log_file)
+        with open(schedule_tool._schedule_file) as f:
+            assert sorted(json.load(f)) == ["a", "b", "c", "d"]
+
+    @pytest.mark.asyncio
+    async def test_cron_validated_at_schedule_time(self, schedule_tool):
+        pytest.importorskip("croniter")
+        result = await schedule_tool.execute(
+            action="schedule_cron", name="bad", cron_expression="61 * * *", prompt="x"
+        )
+        assert result.error and "Invalid cron expression" in result.error
+        assert schedule_tool._load_tasks() == {}
+
+        result = await schedule_tool.execute(
+            action="schedule_cron", name="hourly", cron_expression="0 * * * *", prompt="x"
+        )
+        task = schedule_tool._load_tasks()[result.output.rsplit(" ", 1)[-1]]
+        assert task["next_fire"] > time.time()
+        assert task["next_fire"] - time.time() <= 3600
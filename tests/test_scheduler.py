@@ -0,0 +1,117 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from app.utils import scheduler as scheduler_module
+from app.utils.scheduler import SchedulerService
+
+
+class FakeManus:
+    created = 0
+
+    def __init__(self):
+        self.prompts = []
+        self.resets = 0
+
+    @classmethod
+    async def create(cls):
+        cls.created += 1
+        return cls()
+
+    async def run(self, prompt):
+        self.prompts.append(prompt)
+        await asyncio.sleep(0.01)
+
+    async def reset(self):
+        self.resets += 1
+
+    async def cleanup(self):
+        pass
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    FakeManus.created = 0
+    monkeypatch.setattr(scheduler_module, "Manus", FakeManus)
+    return SchedulerService(schedule_file=str(tmp_path / "schedule.json"))
+
+
+def interval_task(name, interval, **extra):
+    return {"type": "interval", "name": name, "interval": interval, "prompt": name,
+            "repeat": True, "status": "active", **extra}
+
+
+class TestSchedulerService:
+    @pytest.mark.asyncio
+    async def test_runs_only_due_tasks(self, service):
+        now = time.time()
+        service._tool._save_tasks({
+            "due": interval_task("due", 60),
+            "later": interval_task("later", 60, last_run=now),
+            "once": interval_task("once", 1, repeat=False),
+        })
+
+        await service.check_and_run_tasks()
+        await asyncio.gather(*service._runs)
+        assert FakeManus.created == 2
+        tasks = service._tool._load_tasks()
+        assert tasks["once"]["status"] == "completed"
+        assert tasks["due"]["last_run"] >= now
+        # Nothing else is due, so the loop can sleep until "later" fires (capped)
+        assert sorted(task_id for _, task_id in service._heap) == ["due", "later"]
+        assert 0 < service._sleep_interval() <= scheduler_module.POLL_INTERVAL_SECONDS
+
+        await service.check_and_run_tasks()
+        await asyncio.gather(*service._runs)
+        assert FakeManus.created == 2
+
+    @pytest.mark.asyncio
+    async def test_picks_up_tasks_added_by_other_processes(self, service):
+        await service.check_and_run_tasks()
+        assert service._heap == []
+
+        other = SchedulerService(schedule_file=service.schedule_file)
+        other._tool._save_tasks({"new": interval_task("new", 60)})
+
+        await service.check_and_run_tasks()
+        await asyncio.gather(*service._runs)
+        assert FakeManus.created == 1
+
+    @pytest.mark.asyncio
+    async def test_runs_are_logged_as_patches(self, service):
+        service._tool._save_tasks({"due": interval_task("due", 60)})
+        await service.check_and_run_tasks()
+
+        # Only the changed fields are appended; the snapshot is untouched until compaction
+        with open(service._tool._log_file, "rb") as f:
+            assert f.read().count(b"\n") == 1
+        other = SchedulerService(schedule_file=service.schedule_file)
+        assert "last_run" in other._tool._load_tasks()["due"]
+
+        service._tool.compact()
+        assert not os.path.exists(service._tool._log_file)
+        assert "last_run" in other._tool._load_tasks()["due"]
+
+    @pytest.mark.asyncio
+    async def test_stop_wakes_the_loop(self, service):
+        runner = asyncio.create_task(service.start())
+        await asyncio.sleep(0.05)
+        service.stop()
+        await asyncio.wait_for(runner, timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_agents_are_pooled_and_reset(self, service, monkeypatch):
+        monkeypatch.setattr(scheduler_module, "POOL_MAX_AGENTS", 2)
+        await service._warm_pool()
+        assert FakeManus.created == 1
+
+        # Three concurrent runs share at most two agents
+        await asyncio.gather(*(service._run_agent_task(f"p{i}") for i in range(3)))
+        assert FakeManus.created == 2
+        assert service._pool.qsize() == 2
+
+        agents = [service._pool.get_nowait() for _ in range(2)]
+        assert sorted(p for a in agents for p in a.prompts) == ["p0", "p1", "p2"]
+        assert sum(a.resets for a in agents) == 3
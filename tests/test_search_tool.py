@@ -0,0 +1,213 @@
+import asyncio
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.tool import search_tool as search_tool_module
+from app.tool.search_tool import SearchTool
+from app.utils.distributed import cache
+
+
+class FakeLLM:
+    def __init__(self, response: str):
+        self.response = response
+        self.calls = 0
+
+    async def ask(self, messages, **kwargs):
+        self.calls += 1
+        return self.response
+
+
+class FakeWebSearch:
+    """Returns canned results per query and records peak concurrency."""
+
+    def __init__(self, results):
+        self.results = results
+        self.active = 0
+        self.peak = 0
+
+    async def execute(self, query: str, num_results: int = 3, **kwargs):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.01)
+            if query == "boom":
+                raise RuntimeError("backend down")
+            items = [
+                SimpleNamespace(title=url, description=f"about {url}", url=url)
+                for url in self.results.get(query, [])
+            ]
+            return SimpleNamespace(error=None, results=items)
+        finally:
+            self.active -= 1
+
+
+@pytest_asyncio.fixture
+async def search_tool(tmp_path):
+    tool = SearchTool(llm=None)
+    tool._expand_cache_file = str(tmp_path / "expand.json")
+    tool.llm = FakeLLM("rust async runtime\nrust tokio news\n")
+    yield tool
+    await tool.cleanup()
+    cache._store.clear()
+
+
+class TestSearchTool:
+    @pytest.mark.asyncio
+    async def test_expand_query_is_cached(self, search_tool):
+        first = await search_tool.execute(action="expand_query", query="Rust  async")
+        second = await search_tool.execute(action="expand_query", query="rust async")
+        assert json.loads(first.output) == ["rust async runtime", "rust tokio news"]
+        assert second.output == first.output
+        assert search_tool.llm.calls == 1
+        assert search_tool._stats == {"expand_misses": 1, "expand_hits": 1}
+
+    @pytest.mark.asyncio
+    async def test_download_image(self, search_tool, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        payload = bytes(range(256)) * 1024
+
+        async def image(request):
+            return web.Response(body=payload, content_type="image/png")
+
+        app = web.Application()
+        app.router.add_get("/img/{name}", image)
+        async with TestServer(app) as server, search_tool:
+            result = await search_tool.execute(action="download_image", url=str(server.make_url("/img/cat.png")))
+            assert result.error is None
+            assert (tmp_path / "downloads" / "cat.png").read_bytes() == payload
+
+            result = await search_tool.execute(action="download_image", url=str(server.make_url("/img/c%20a!t.png")))
+            assert result.error is None
+            assert (tmp_path / "downloads" / "c20at.png").read_bytes() == payload
+
+            result = await search_tool.execute(action="download_image", url=str(server.make_url("/missing.png")))
+            assert result.error == "Failed to download image: 404"
+        assert search_tool_module._shared_http.session is None
+
+    @pytest.mark.asyncio
+    async def test_download_session_is_shared(self):
+        first, second = SearchTool(llm=None), SearchTool(llm=None)
+        session = await first._get_http_session()
+        assert await second._get_http_session() is session
+
+        await first.cleanup()
+        assert not session.closed
+        await second.cleanup()
+        assert session.closed
+
+    def test_session_from_a_finished_loop_is_closed(self):
+        tool = SearchTool(llm=None)
+        first = asyncio.run(tool._get_http_session())
+
+        async def second_run():
+            session = await tool._get_http_session()
+            assert first.closed
+            await tool.cleanup()
+            return session
+
+        assert asyncio.run(second_run()).closed
+
+    @pytest.mark.asyncio
+    async def test_session_from_a_running_loop_is_closed_on_it(self):
+        from app.tool._async_loop import AsyncLoopThread
+
+        first, second = SearchTool(llm=None), SearchTool(llm=None)
+        loop_thread = AsyncLoopThread.get()
+        other = loop_thread.run_sync(first._get_http_session(), timeout=5)
+        session = await second._get_http_session()
+        assert session is not other
+
+        async def wait_closed():
+            while not other.closed:
+                await asyncio.sleep(0.01)
+
+        loop_thread.run_sync(wait_closed(), timeout=5)
+
+        loop_thread.run_sync(first.cleanup(), timeout=5)
+        await second.cleanup()
+        assert session.closed
+
+    @pytest.mark.asyncio
+    async def test_search_bounds_concurrency(self, search_tool, monkeypatch):
+        monkeypatch.setattr(search_tool_module, "SEARCH_CONCURRENCY", 2)
+        fake = FakeWebSearch({f"q{i}": [f"https://example.com/{i}"] for i in range(6)})
+        search_tool._web_search = fake
+        result = await search_tool.execute(action="search", queries=[f"q{i}" for i in range(6)] + ["boom"])
+        assert result.error is None
+        assert fake.peak == 2
+        assert all(f"https://example.com/{i}" in result.output for i in range(6))
+
+    @pytest.mark.asyncio
+    async def test_search_deduplicates_urls(self, search_tool):
+        search_tool._web_search = FakeWebSearch({
+            "a": ["https://example.com/1", "https://example.com/2"],
+            "b": ["https://example.com/2", "https://example.com/3"],
+        })
+        result = await search_tool.execute(action="search", queries=["a", "b"])
+        assert [r["url"] for r in json.loads(result.output)] == [
+            "https://example.com/1", "https://example.com/2", "https://example.com/3",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_search_does_not_prefetch_by_default(self, search_tool):
+        search_tool._web_search = FakeWebSearch({})
+        await search_tool.execute(action="search", queries=["rust async"])
+        assert not search_tool._prefetch_tasks
+        assert search_tool.llm.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_search_prefetches_expansions(self, search_tool):
+        search_tool.prefetch_expansions = True
+        search_tool._web_search = FakeWebSearch({})
+        await search_tool.execute(action="search", queries=["rust async", "go generics"])
+        await asyncio.gather(*search_tool._prefetch_tasks)
+        assert search_tool.llm.calls == 2
+
+        result = await search_tool.execute(action="expand_query", query="go generics")
+        assert result.error is None
+        assert search_tool.llm.calls == 2
+        assert search_tool._stats["expand_prefetched"] == 2
+        assert search_tool._stats["expand_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_expansions_persist_across_instances(self, search_tool, monkeypatch):
+        monkeypatch.setattr(search_tool_module, "EXPAND_SAVE_INTERVAL", 0)
+        await search_tool.execute(action="expand_query", query="rust async")
+        await search_tool._save_task
+        cache._store.clear()
+
+        other = SearchTool(llm=None)
+        other._expand_cache_file = search_tool._expand_cache_file
+        other.llm = FakeLLM("unused")
+        result = await other.execute(action="expand_query", query="rust async")
+        assert json.loads(result.output) == ["rust async runtime", "rust tokio news"]
+        assert other.llm.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_expansion_file_is_read_once_off_the_loop(self, search_tool, monkeypatch):
+        readers = []
+        read = SearchTool._read_expand_cache
+
+        def recording_read(self):
+            readers.append(threading.get_ident())
+            return read(self)
+
+        monkeypatch.setattr(SearchTool, "_read_expand_cache", recording_read)
+        await asyncio.gather(*(
+            search_tool.execute(action="expand_query", query=q) for q in ("rust async", "go generics")
+        ))
+        assert len(readers) == 1
+        assert readers[0] != threading.get_ident()
+
+    @pytest.mark.asyncio
+    async def test_cleanup_flushes_pending_save(self, search_tool):
+        await search_tool.execute(action="expand_query", query="rust async")
+        await search_tool.cleanup()
+        with open(search_tool._expand_cache_file) as f:
+            assert len(json.load(f)) == 1
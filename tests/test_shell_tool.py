@@ -0,0 +1,186 @@
+import time
+
+import pytest
+
+from app.tool import shell_tool as shell_tool_module
+from app.tool.shell_tool import ShellTool
+
+
+class FakeShell:
+    def __init__(self, workdir):
+        self.workdir = workdir
+        self.alive = True
+        self.commands = []
+
+    def run(self, command, workdir=None, timeout=None):
+        self.commands.append((command, workdir))
+        if command == "hang":
+            raise TimeoutError("Command timed out")
+        if command.startswith("sleep "):
+            time.sleep(float(command.split()[1]))
+        return 0, f"ran {command}"
+
+    def close(self):
+        self.alive = False
+
+
+class FakeSandbox:
+    def __init__(self):
+        self.shells = []
+
+    def open_shell(self, workdir=None):
+        self.shells.append(FakeShell(workdir))
+        return self.shells[-1]
+
+
+@pytest.fixture
+def shell_tool():
+    return ShellTool()
+
+
+class TestShellTool:
+    @pytest.mark.asyncio
+    async def test_exec(self, shell_tool):
+        result = await shell_tool.execute(command="echo hello")
+        assert result.error is None
+        assert result.output == "hello"
+
+    @pytest.mark.asyncio
+    async def test_cd(self, shell_tool, tmp_path):
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "file.txt").write_text("x")
+        session_id = await shell_tool.create_session()
+
+        result = await shell_tool.execute(command=f"cd {tmp_path}/sub", session_id=session_id)
+        assert result.error is None
+        assert shell_tool.sessions[session_id].current_dir == f"{tmp_path}/sub"
+
+        result = await shell_tool.execute(command="pwd", session_id=session_id)
+        assert result.output == f"{tmp_path}/sub"
+
+        for target in (f"{tmp_path}/missing", f"{tmp_path}/file.txt"):
+            result = await shell_tool.execute(command=f"cd {target}", session_id=session_id)
+            assert result.error == f"Directory not found: {target}"
+
+    @pytest.mark.asyncio
+    async def test_blacklisted_command(self, shell_tool):
+        result = await shell_tool.execute(command="sudo ls")
+        assert result.error == "Command 'sudo' is blacklisted."
+
+        result = await shell_tool.execute(command="  rm  -rf / ")
+        assert result.error == "Command 'rm  -rf /' is blacklisted."
+
+    @pytest.mark.asyncio
+    async def test_blacklist_matches_whole_words(self, shell_tool):
+        result = await shell_tool.execute(command="echo sudo; mountpoint -q / || true")
+        assert result.error is None
+        assert result.output.startswith("sudo")
+
+    @pytest.mark.asyncio
+    async def test_large_output_keeps_head_and_tail(self, shell_tool, monkeypatch):
+        monkeypatch.setattr(shell_tool_module, "OUTPUT_HEAD_BYTES", 1024)
+        monkeypatch.setattr(shell_tool_module, "OUTPUT_TAIL_BYTES", 1024)
+        result = await shell_tool.execute(command="echo start; head -c 500000 /dev/zero | tr '\\0' x; echo; echo end")
+        assert result.error is None
+        assert result.output.startswith("start")
+        assert result.output.endswith("end")
+        assert "bytes truncated" in result.output
+        assert len(result.output) < 200000
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_process_group(self, shell_tool):
+        start = time.monotonic()
+        result = await shell_tool.execute(command="sleep 30", timeout=1)
+        assert result.error == "Command timed out."
+        assert time.monotonic() - start < 10
+
+    @pytest.mark.asyncio
+    async def test_invalid_utf8_output_is_replaced(self, shell_tool):
+        result = await shell_tool.execute(command="printf 'ok\\377\\n'")
+        assert result.error is None
+        assert result.output == "ok�"
+
+    @pytest.mark.asyncio
+    async def test_new_sessions_start_in_cached_cwd(self, shell_tool, monkeypatch):
+        calls = []
+        real_getcwd = shell_tool_module.os.getcwd
+        monkeypatch.setattr(shell_tool_module.os, "getcwd", lambda: calls.append(1) or real_getcwd())
+        first = await shell_tool.create_session()
+        second = await shell_tool.create_session()
+        assert shell_tool.sessions[first].current_dir == shell_tool.sessions[second].current_dir == real_getcwd()
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_cd_normalizes_and_caches_targets(self, shell_tool, tmp_path, monkeypatch):
+        (tmp_path / "a" / "b").mkdir(parents=True)
+        session_id = await shell_tool.create_session()
+        await shell_tool.execute(command=f"cd {tmp_path}/a/b", session_id=session_id)
+
+        result = await shell_tool.execute(command="cd ../.", session_id=session_id)
+        assert result.output == f"Changed directory to {tmp_path}/a"
+
+        stat_calls = []
+        real_stat = shell_tool_module.os.stat
+        monkeypatch.setattr(shell_tool_module.os, "stat", lambda p, *a, **k: stat_calls.append(p) or real_stat(p, *a, **k))
+        result = await shell_tool.execute(command="cd b/", session_id=session_id)
+        assert result.output == f"Changed directory to {tmp_path}/a/b"
+        assert stat_calls == []
+
+    @pytest.mark.asyncio
+    async def test_sandbox_commands_reuse_session_shell(self):
+        sandbox = FakeSandbox()
+        tool = ShellTool(sandbox=sandbox)
+        session_id = await tool.create_session()
+
+        assert (await tool.execute(command="echo a", session_id=session_id)).output == "ran echo a"
+        assert (await tool.execute(command="echo b", session_id=session_id)).output == "ran echo b"
+        assert len(sandbox.shells) == 1
+        assert sandbox.shells[0].commands == [("echo a", "/workspace"), ("echo b", "/workspace")]
+
+        # A timed out shell is closed and replaced on the next command
+        result = await tool.execute(command="hang", session_id=session_id)
+        assert result.error == "Command timed out."
+        assert not sandbox.shells[0].alive
+        await tool.execute(command="echo c", session_id=session_id)
+        assert len(sandbox.shells) == 2
+
+        await tool.cleanup()
+        assert not sandbox.shells[1].alive
+
+    @pytest.mark.asyncio
+    async def test_sandbox_sessions_run_in_parallel(self):
+        import asyncio
+
+        tool = ShellTool(sandbox=FakeSandbox())
+        sessions = [await tool.create_session() for _ in range(4)]
+        start = time.monotonic()
+        results = await asyncio.gather(
+            *(tool.execute(command="sleep 0.3", session_id=s) for s in sessions)
+        )
+        assert all(r.error is None for r in results)
+        # Blocking sandbox calls run off the event loop, so the sessions overlap
+        assert time.monotonic() - start < 1.0
+
+    @pytest.mark.asyncio
+    async def test_sandbox_calls_without_session_close_their_shell(self):
+        sandbox = FakeSandbox()
+        tool = ShellTool(sandbox=sandbox)
+        for _ in range(5):
+            assert (await tool.execute(command="echo a")).output == "ran echo a"
+        assert len(sandbox.shells) == 5
+        assert not any(shell.alive for shell in sandbox.shells)
+
+    @pytest.mark.asyncio
+    async def test_sessions_are_bounded(self, monkeypatch):
+        monkeypatch.setattr(shell_tool_module, "MAX_SESSIONS", 3)
+        sandbox = FakeSandbox()
+        tool = ShellTool(sandbox=sandbox)
+        first = await tool.create_session()
+        await tool.execute(command="echo a", session_id=first)
+        for _ in range(3):
+            await tool.create_session()
+
+        # The oldest session is dropped and its shell closed
+        assert len(tool.sessions) == 3
+        assert first not in tool.sessions
+        assert not sandbox.shells[0].alive
@@ -0,0 +1,67 @@
+import asyncio
+import os
+
+import pytest
+
+from app.tool import web_dev_tool as web_dev_tool_module
+from app.tool.web_dev_tool import WebDevTool
+
+
+class TestWebDevTool:
+    @pytest.mark.asyncio
+    async def test_failed_init_discards_project(self, tmp_path, monkeypatch):
+        async def broken_shell(cmd, **kwargs):
+            os.makedirs(os.path.join(kwargs["cwd"], "node_modules", "pkg"))
+            raise OSError("npm not found")
+
+        monkeypatch.setattr(web_dev_tool_module.asyncio, "create_subprocess_shell", broken_shell)
+        target = tmp_path / "app"
+
+        result = await WebDevTool().execute(action="init_project", scaffold="web-static", path=str(target))
+        assert "Init failed" in result.error
+        # The path is free as soon as the call returns; the tree is deleted in the background
+        assert not target.exists()
+
+        await asyncio.gather(*web_dev_tool_module._trash_tasks)
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_templates_are_written_while_commands_run(self, tmp_path, monkeypatch):
+        started = []
+        release = asyncio.Event()
+
+        class FakeProcess:
+            def __init__(self, cmd):
+                self.cmd = cmd
+
+            async def communicate(self):
+                if self.cmd.startswith("npm create"):
+                    await release.wait()
+                return b"", b""
+
+        async def fake_shell(cmd, **kwargs):
+            started.append(cmd)
+            return FakeProcess(cmd)
+
+        monkeypatch.setattr(web_dev_tool_module.asyncio, "create_subprocess_shell", fake_shell)
+        monkeypatch.setitem(
+            web_dev_tool_module._SCAFFOLDS, "web-db-user",
+            (("npm create app", "npm install"), {"server.js": "// server"}),
+        )
+        target = tmp_path / "app"
+
+        init = asyncio.create_task(
+            WebDevTool().execute(action="init_project", scaffold="web-db-user", path=str(target))
+        )
+        for _ in range(100):
+            if (target / "server.js").exists():
+                break
+            await asyncio.sleep(0.01)
+        # The template is on disk before the first command finishes, and install waits for create
+        assert (target / "server.js").read_text() == "// server"
+        assert started == ["npm create app"]
+
+        release.set()
+        result = await init
+        assert result.error is None
+        assert started == ["npm create app", "npm install"]